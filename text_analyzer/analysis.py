@@ -3,41 +3,72 @@ Analysis functions for the Text Analyzer application.
 These functions take processed text data and derive higher-level insights.
 """
 
-import re
+import string
+import time
 from collections import Counter, defaultdict
-from typing import Optional, List, Dict, Tuple, Any, Set, Iterable # Added Set and Iterable
+from collections.abc import Mapping, MutableMapping
+from typing import Optional, List, Dict, Tuple, Any, Set, Iterable, Iterator, Sequence
 
 from . import config as cfg
 from . import text_processing as tp 
+from .keywords import get_rake_tables, rank_keywords
+from .ngrams import count_top_ngrams
+from .pattern_engine import match_patterns, match_user_patterns
+from .pipeline import StageRegistry, memory_tracing, run_stage_batch, run_stages
+from .readability import count_readability, readability_indices
+from .result_cache import ResultCache, analysis_key, text_entry_key
+from .sentence_index import SentenceTable, cached_sentence_index, get_sentence_index, text_digest
+from .sketches import SpaceSavingCounter
+from .tfidf import TfidfCorpus
+from .token_store import TokenStore
 
+import numpy as np
 import spacy
-import textstat
-from rake_nltk import Rake
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
 # =============================================================================
 # GLOBAL MODEL INITIALIZATIONS
 # =============================================================================
-_nlp_model = None
+_nlp_model = None # The 'full' profile
+_nlp_profile_models: Dict[str, Any] = {} # The other profiles of cfg.SPACY_MODEL_PROFILES
 SPACY_MODEL_NAME = 'en_core_web_sm'
 
-def _get_nlp_model():
-    """Loads and caches the spaCy model."""
+def _get_nlp_model(profile: str = 'full'):
+    """
+    Loads and caches the spaCy model for `profile`, a key of `cfg.SPACY_MODEL_PROFILES`
+    naming the pipeline components to leave out (e.g. 'pos' loads no parser or NER).
+    """
     global _nlp_model
-    if _nlp_model is None:
-        try:
-            _nlp_model = spacy.load(SPACY_MODEL_NAME)
-        except OSError:
-            print(f"spaCy '{SPACY_MODEL_NAME}' model not found. Please download it by running:")
-            print(f"    python -m spacy download {SPACY_MODEL_NAME}")
-            print("Part-of-Speech (POS) tagging and Named Entity Recognition (NER) will be unavailable.")
-            # Return None to indicate failure, error handled in analysis functions
-            return None
-        except Exception as e:
-            print(f"An unexpected error occurred while loading the spaCy model: {e}")
-            # Return None to indicate failure, error handled in analysis functions
-            return None
-    return _nlp_model
+    cached = _nlp_model if profile == 'full' else _nlp_profile_models.get(profile)
+    if cached is not None:
+        return cached
+    try:
+        model = spacy.load(SPACY_MODEL_NAME, exclude=cfg.SPACY_MODEL_PROFILES[profile])
+    except OSError:
+        print(f"spaCy '{SPACY_MODEL_NAME}' model not found. Please download it by running:")
+        print(f"    python -m spacy download {SPACY_MODEL_NAME}")
+        print("Part-of-Speech (POS) tagging and Named Entity Recognition (NER) will be unavailable.")
+        # Return None to indicate failure, error handled in analysis functions
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred while loading the spaCy model: {e}")
+        # Return None to indicate failure, error handled in analysis functions
+        return None
+    if profile == 'full':
+        _nlp_model = model
+    else:
+        _nlp_profile_models[profile] = model
+    return model
+
+def select_spacy_profile(stage_names: Iterable[str]) -> str:
+    """The cheapest spaCy model profile serving the POS/NER stages among `stage_names`."""
+    stage_names = set(stage_names)
+    uses_pos, uses_ner = 'pos' in stage_names, 'ner' in stage_names
+    if uses_pos and uses_ner:
+        return 'pos_ner'
+    if uses_pos:
+        return 'pos'
+    return 'ner' if uses_ner else 'full'
 
 try:
     _vader_analyzer = SentimentIntensityAnalyzer()
@@ -45,11 +76,219 @@ except LookupError:
     print("VADER lexicon not found. Please download it using: python -m nltk.downloader vader_lexicon")
     _vader_analyzer = None
 
+# =============================================================================
+# SHARED ANALYSIS CONTEXT
+# =============================================================================
+
+# Registry of the pipeline stages used by analyze_text_complete (stages are defined further below).
+STAGES = StageRegistry()
+
+# Parameters every AnalysisContext starts with, so any stage can be resolved on a bare context.
+_DEFAULT_CONTEXT_PARAMS: Dict[str, Any] = {
+    'active_stop_words': None,
+    'num_common_words_to_display': cfg.DEFAULT_TOP_WORDS_DISPLAY,
+    'user_patterns': None,
+    'top_k_capacity': None,
+    'spacy_profile': 'full',
+    'sentiment_mode': cfg.DEFAULT_SENTIMENT_MODE,
+}
+
+class AnalysisContext:
+    """
+    Per-text state shared by the stages of one analysis run.
+
+    Holds the input text, the run parameters and every value produced by a stage.
+    A value is computed on first request (running whatever stages it depends on)
+    and reused afterwards, so e.g. POS tagging and NER share a single `nlp(...)` pass.
+    """
+
+    def __init__(self, text: str, **params: Any) -> None:
+        self.values: Dict[str, Any] = {**_DEFAULT_CONTEXT_PARAMS, **params, 'text': text}
+
+    @property
+    def text(self) -> str:
+        return self.values['text']
+
+    def get(self, name: str) -> Any:
+        """Returns the value `name`, running the stages that produce it if it is not available yet."""
+        if name not in self.values:
+            self.run([name])
+        return self.values[name]
+
+    def run(
+        self,
+        targets: Iterable[str],
+        diagnostics: Optional[Dict[str, Dict[str, Any]]] = None,
+        trace_memory: bool = False,
+        executor: str = 'sequential',
+        max_workers: Optional[int] = None,
+        release: Iterable[str] = ()
+    ) -> List[str]:
+        """
+        Runs every stage still needed to produce `targets`; returns the names of the stages run.
+        Per-stage timings (and memory peaks) are recorded in `diagnostics` if it is given.
+        `executor`/`max_workers`/`release` are passed on to `pipeline.run_stages`.
+        """
+        plan = STAGES.resolve(targets, provided=self.values)
+        run_stages(plan, self.values, diagnostics=diagnostics, trace_memory=trace_memory, executor=executor, max_workers=max_workers, release=release)
+        return [stage.name for stage in plan]
+
+    @property
+    def sentence_text(self) -> str:
+        """Text lightly cleaned for sentence-level analysis (see `preprocess_text_for_sentence_analysis`)."""
+        return self.get('sentence_text')
+
+    @property
+    def spacy_doc(self) -> Optional[Any]:
+        """
+        The spaCy Doc for `sentence_text`, parsed once.
+        None if the model is unavailable, the text is empty or parsing failed (see `spacy_error`).
+        """
+        return self.get('spacy_doc')
+
+    @property
+    def spacy_error(self) -> Optional[str]:
+        return self.values.get('spacy_error')
+
+
+class AnalysisResult(MutableMapping):
+    """
+    Result of `analyze_text_complete(..., lazy=True)`: a mapping with the keys of the eager
+    result dict whose analysis sections are computed on first access (running only the stages
+    they need, values shared through the AnalysisContext) and cached. Sections nobody reads
+    are never computed.
+
+    A section that fails keeps its empty default and sets 'error', which therefore only
+    appears once that section has been read. `to_dict()` computes every remaining section.
+    """
+
+    def __init__(self, context: AnalysisContext, sections: List[str], executor: str = 'sequential', max_workers: Optional[int] = None) -> None:
+        self._context: AnalysisContext = context
+        self._executor: str = executor
+        self._max_workers: Optional[int] = max_workers
+        self._data: Dict[str, Any] = _empty_results() # Computed values, and the defaults of pending keys
+        self._pending: Dict[str, str] = {section: section for section in sections} # Key -> context value it is read from
+        stage_names: Set[str] = {stage.name for stage in STAGES.resolve(sections, provided=context.values)}
+        self._data['processed_tokens'] = []
+        if 'tokens' in stage_names:
+            self._pending['processed_tokens'] = 'processed_tokens'
+        self._data['original_text'] = context.text
+        if context.values['top_k_capacity'] and 'ngram_frequencies' in sections:
+            self._data['_approximation'] = {'ngram_frequencies': None}
+            self._pending['_approximation'] = 'ngram_approximation'
+
+    def __getitem__(self, key: str) -> Any:
+        value_name = self._pending.pop(key, None)
+        if value_name is not None:
+            try:
+                self._context.run([value_name], executor=self._executor, max_workers=self._max_workers)
+                value = self._context.values[value_name]
+                self._data[key] = {'ngram_frequencies': value} if key == '_approximation' else value
+            except Exception as e:
+                self._data.setdefault('error', f'Analysis failed: {type(e).__name__} - {str(e)}')
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._pending.pop(key, None)
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self._pending.pop(key, None)
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"AnalysisResult(computed={[key for key in self._data if key not in self._pending]}, pending={list(self._pending)})"
+
+    @property
+    def pending(self) -> List[str]:
+        """Keys whose values have not been computed yet."""
+        return list(self._pending)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A plain dict of every key, computing the sections still pending (like the eager result)."""
+        for key in list(self._data):
+            self[key]
+        return dict(self._data)
+
+class CompactAnalysisResult(Mapping):
+    """
+    Slim result of `analyze_text_complete(..., compact=True)`.
+
+    Holds the analysis sections, and the whole-document members of `cfg.HEAVY_RESULT_MEMBERS`
+    (the text, the processed tokens, the full word Counter) only when they were asked for
+    with `keep=`; kept members are references to the run's objects, never copies. The text
+    is identified by `text_key` instead, which also finds its cached sentence index (see
+    `get_sentences_for_text_key`). Reads like the result dict: `results.get('pos_analysis')`,
+    `results['word_analysis']`; members that were left out are simply missing keys.
+    """
+    __slots__ = ('sections', 'text_key', 'original_text', 'processed_tokens', 'full_word_counts')
+
+    def __init__(self, sections: Dict[str, Any], text_key: str, original_text: Optional[str] = None,
+                 processed_tokens: Optional[Sequence[str]] = None, full_word_counts: Optional[Counter] = None) -> None:
+        self.sections: Dict[str, Any] = sections # Every other key of the result dict
+        self.text_key: str = text_key
+        self.original_text: Optional[str] = original_text
+        self.processed_tokens: Optional[Sequence[str]] = processed_tokens
+        self.full_word_counts: Optional[Counter] = full_word_counts
+
+    @classmethod
+    def from_sections(cls, sections: Dict[str, Any], text: str, keep: Iterable[str] = (),
+                      processed_tokens: Optional[Sequence[str]] = None) -> 'CompactAnalysisResult':
+        """
+        A compact result of `text` holding `sections` (the result dict without its heavy members,
+        taken over, not copied), with the heavy members named in `keep`.
+        """
+        keep = set(keep)
+        word_analysis: Dict[str, Any] = sections.get('word_analysis') or {}
+        full_word_counts = word_analysis.get('full_word_counts_obj')
+        if 'full_word_counts_obj' in word_analysis and 'full_word_counts_obj' not in keep:
+            sections['word_analysis'] = {key: value for key, value in word_analysis.items() if key != 'full_word_counts_obj'}
+            full_word_counts = None
+        return cls(sections, text_digest(text).hex(),
+                   original_text=text if 'original_text' in keep else None,
+                   processed_tokens=processed_tokens if 'processed_tokens' in keep else None,
+                   full_word_counts=full_word_counts)
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Any], text: str, keep: Iterable[str] = ()) -> 'CompactAnalysisResult':
+        """Moves the sections of an analyze_text_complete result dict into a compact result, dropping unkept heavy members."""
+        sections: Dict[str, Any] = dict(results)
+        sections.pop('original_text', None)
+        return cls.from_sections(sections, text, keep, processed_tokens=sections.pop('processed_tokens', None))
+
+    def _members(self) -> Dict[str, Any]:
+        members: Dict[str, Any] = {}
+        if self.processed_tokens is not None: members['processed_tokens'] = self.processed_tokens
+        if self.original_text is not None: members['original_text'] = self.original_text
+        return members
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.sections:
+            return self.sections[key]
+        return self._members()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.sections
+        yield from self._members()
+
+    def __len__(self) -> int:
+        return len(self.sections) + len(self._members())
+
+    def __repr__(self) -> str:
+        return f"CompactAnalysisResult(text_key={self.text_key!r}, keys={list(self)})"
+
 # =============================================================================
 # ANALYSIS FUNCTIONS
 # =============================================================================
 
 # Illustrative example for processing text chunks for word counts
+# (see streaming.analyze_text_stream for the full chunked analysis)
 def _process_chunks_for_word_counts_example(text_chunk_iterator: Iterable[str],
                                             active_stop_words: Optional[Set[str]] = None) -> Counter[str]:
     """
@@ -106,56 +345,110 @@ def _process_chunks_for_word_counts_example(text_chunk_iterator: Iterable[str],
 #   print(f"Example error: {e}")
 
 
-def get_word_count_stats(word_counts: Counter[str]) -> Dict[str, Any]:
+def get_word_count_stats(word_counts: Counter[str], total_words: Optional[int] = None, unique_words: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Word count statistics. `total_words` / `unique_words` override the values derived from
+    `word_counts`, for when it only holds the most frequent words (approximate counting)
+    and the totals come from elsewhere (an exact running total, a HyperLogLog estimate).
+    """
     if not word_counts:
         return {'total_words': 0, 'unique_words': 0, 'most_common': [], 'average_frequency': 0.0}
-    total_words: int = sum(word_counts.values())
-    unique_words: int = len(word_counts)
+    total_words = sum(word_counts.values()) if total_words is None else total_words
+    unique_words = len(word_counts) if unique_words is None else unique_words
     most_common: List[Tuple[str, int]] = word_counts.most_common(cfg.DEFAULT_SUMMARY_MOST_COMMON_WORDS_COUNT)
     average_frequency: float = total_words / unique_words if unique_words else 0.0
     return {'total_words': total_words, 'unique_words': unique_words, 'most_common': most_common, 'average_frequency': round(average_frequency, 2)}
 
-def count_sentences(text: Optional[str]) -> int:
+def count_sentences(text: Optional[str], sentence_table: Optional[SentenceTable] = None) -> int:
+    if sentence_table is not None: return len(sentence_table)
     if not text: return 0
-    sentences: List[str] = re.split(r'[.!?]+', text)
-    return len([s.strip() for s in sentences if s.strip()])
+    return len(SentenceTable(text))
 
-def analyze_sentences(text: Optional[str]) -> Dict[str, Any]:
+def analyze_sentences(text: Optional[str], sentence_table: Optional[SentenceTable] = None) -> Dict[str, Any]:
+    """
+    Sentence count, average words per sentence and the (first) longest/shortest sentence.
+    If `sentence_table` is given (e.g. the 'sentence_table' stage value), it is used instead of segmenting `text` again.
+    """
     default_return = {'sentence_count': 0, 'average_words_per_sentence': 0.0, 'longest_sentence': '', 'shortest_sentence': ''}
-    if not text: return default_return
-    raw_sentences: List[str] = re.split(r'[.!?]+', text)
-    sentences: List[str] = [s.strip() for s in raw_sentences if s.strip()]
-    if not sentences: return default_return
-    sentence_word_counts: List[int] = []
-    for sentence_str in sentences:
-        words_in_sentence: List[str] = tp.clean_text_for_word_tokenization(sentence_str, advanced=False).split()
-        sentence_word_counts.append(len([word for word in words_in_sentence if word]))
-    average_words: float = sum(sentence_word_counts) / len(sentence_word_counts) if sentence_word_counts else 0.0
-    longest_idx: int = sentence_word_counts.index(max(sentence_word_counts)) if sentence_word_counts else -1
-    shortest_idx: int = sentence_word_counts.index(min(sentence_word_counts)) if sentence_word_counts else -1
+    if sentence_table is None:
+        if not text: return default_return
+        sentence_table = SentenceTable(text)
+    if not sentence_table: return default_return
+    sentence_word_counts = sentence_table.word_counts
+    average_words: float = sum(sentence_word_counts) / len(sentence_word_counts)
+    longest_idx: int = sentence_word_counts.index(max(sentence_word_counts))
+    shortest_idx: int = sentence_word_counts.index(min(sentence_word_counts))
     return {
-        'sentence_count': len(sentences), 
+        'sentence_count': len(sentence_table), 
         'average_words_per_sentence': round(average_words, 1),
-        'longest_sentence': sentences[longest_idx].strip() if longest_idx != -1 else "",
-        'shortest_sentence': sentences[shortest_idx].strip() if shortest_idx != -1 else ""
+        'longest_sentence': sentence_table.sentence(longest_idx),
+        'shortest_sentence': sentence_table.sentence(shortest_idx)
     }
 
-def extract_keywords_rake(text: str, num_keywords: int = cfg.DEFAULT_NUM_KEYWORDS) -> List[Tuple[str, float]]:
+def extract_keywords_rake(text: str, num_keywords: int = cfg.DEFAULT_NUM_KEYWORDS,
+                          sentence_table: Optional[SentenceTable] = None,
+                          active_stop_words: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+    """
+    Top `num_keywords` RAKE phrases of `text` as (phrase, score).
+    Phrases break at `active_stop_words` plus cfg.RAKE_STOP_WORDS and at punctuation between words;
+    `sentence_table` (e.g. the 'sentence_table' stage value) must segment `text`.
+    """
     if not text or not text.strip(): return []
     try:
-        r = Rake()
-        r.extract_keywords_from_text(text)
-        ranked_phrases_with_scores = r.get_ranked_phrases_with_scores()
-        return [(phrase, score) for score, phrase in ranked_phrases_with_scores[:num_keywords]]
+        return rank_keywords(get_rake_tables(text, sentence_table, active_stop_words), num_keywords)
     except Exception as e:
         print(f"❌ Error during RAKE keyword extraction: {type(e).__name__} - {e}")
         return []
 
+def _empty_results() -> Dict[str, Any]:
+    """Fresh result dict with every section present but empty (used for errors and unselected analyses)."""
+    return {
+        'word_analysis': {}, 'processed_tokens': [], 'word_length_counts_obj': Counter(),
+        'sentence_analysis': {}, 'general_stats': {},
+        'readability_stats': {'avg_word_length': 0.0, 'complexity_score': 0.0, 'readability_level': 'Unknown', 'flesch_reading_ease': 'N/A', 'flesch_kincaid_grade': 'N/A', 'gunning_fog': 'N/A', 'smog_index': 'N/A', 'coleman_liau_index': 'N/A', 'dale_chall_readability_score': 'N/A', 'automated_readability_index': 'N/A', 'error': None},
+        'interesting_patterns': {}, 'ngram_frequencies': {}, 'sentiment_analysis': {},
+        'pos_analysis': {'pos_counts': Counter(), 'most_common_pos': [], 'total_pos_tags': 0, 'lexical_density': 0.0, 'error': None},
+        'ner_analysis': {'entity_counts_by_type': Counter(), 'entities_by_type': defaultdict(list), 'total_entities': 0, 'most_common_entity_types': [], 'error': None},
+        'keyword_analysis': [],
+    }
+
+def resolve_analyses(analyses: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Validates an `analyses=` selection and returns the result sections it covers.
+    None selects every analysis in `cfg.ANALYSIS_SECTIONS`.
+
+    Raises:
+        ValueError: If an unknown analysis name is given.
+    """
+    if analyses is None:
+        return list(cfg.ANALYSIS_SECTIONS.values())
+    if isinstance(analyses, str):
+        analyses = [analyses]
+    unknown = [name for name in analyses if name not in cfg.ANALYSIS_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown analysis: {', '.join(unknown)}. Available: {', '.join(cfg.ANALYSIS_SECTIONS)}")
+    return [section for name, section in cfg.ANALYSIS_SECTIONS.items() if name in analyses]
+
+def plan_analysis(analyses: Optional[Iterable[str]] = None) -> List[str]:
+    """Names of the pipeline stages analyze_text_complete would run for `analyses`, in execution order."""
+    return [stage.name for stage in STAGES.resolve(resolve_analyses(analyses), provided=['text', *_DEFAULT_CONTEXT_PARAMS])]
+
 def analyze_text_complete(
     text: Optional[str], 
     active_stop_words: Optional[Set[str]] = None,
     num_common_words_to_display: int = cfg.DEFAULT_TOP_WORDS_DISPLAY,
-    user_patterns: Optional[List[Dict[str, str]]] = None # Added user_patterns parameter
+    user_patterns: Optional[List[Dict[str, str]]] = None, # Added user_patterns parameter
+    analyses: Optional[Iterable[str]] = None,
+    diagnostics: bool = False,
+    trace_memory: bool = False,
+    executor: str = cfg.DEFAULT_ANALYSIS_EXECUTOR,
+    max_workers: Optional[int] = cfg.DEFAULT_ANALYSIS_MAX_WORKERS,
+    top_k_capacity: Optional[int] = None,
+    sentiment_mode: str = cfg.DEFAULT_SENTIMENT_MODE,
+    lazy: bool = False,
+    compact: bool = False,
+    keep: Iterable[str] = (),
+    cache: Optional[ResultCache] = None
 ) -> Dict[str, Any]:
     """
     Complete text analysis pipeline.
@@ -166,7 +459,7 @@ def analyze_text_complete(
     - Word frequency analysis.
     - N-gram frequency analysis (bigrams, trigrams).
     - Sentence structure analysis (longest/shortest sentences, average words per sentence).
-    - Readability assessment (custom score and standard indices via textstat).
+    - Readability assessment (custom score and the standard textstat indices, computed in one pass).
     - Sentiment analysis (VADER).
     - Part-of-Speech (POS) tagging and Lexical Density (spaCy).
     - Named Entity Recognition (NER) (spaCy).
@@ -174,105 +467,395 @@ def analyze_text_complete(
     - Keyword extraction (RAKE).
     Stop words are removed if an active_stop_words set is provided and is not empty.
 
+    `analyses` restricts the run to a subset of the names in `cfg.ANALYSIS_SECTIONS`
+    (e.g. ['word_frequencies'] or ['readability']). Only the stages those analyses depend
+    on are executed; the other result sections keep their empty defaults. None runs everything.
+
+    With `diagnostics=True` the result gains a `_diagnostics` section holding per-stage
+    wall-clock timings (`time.perf_counter`); `trace_memory=True` additionally records each
+    stage's peak allocated memory via `tracemalloc` (slower, implies `diagnostics`).
+
+    `executor` chooses how stages are run: 'sequential', or 'thread'/'process' to run
+    independent stages (VADER, textstat, RAKE, n-grams, the spaCy pass, ...) concurrently
+    on up to `max_workers` workers. Results are identical in every mode. Memory peaks are
+    only recorded in sequential mode.
+
+    `top_k_capacity` switches n-gram counting to bounded-memory Space-Saving summaries of
+    that many entries per n (see `sketches.SpaceSavingCounter`); the result then gains an
+    `_approximation` section with their error bounds. Word counts stay exact here since the
+    token list is in memory anyway; `streaming.analyze_text_stream` approximates both.
+
+    `sentiment_mode='sentence'` scores every sentence with VADER instead of the whole text at
+    once and aggregates them (see `analyze_sentiment_by_sentence`), adding sentence-level scores
+    and a positional timeline to 'sentiment_analysis'.
+
+    `lazy=True` returns an `AnalysisResult` instead of a dict: nothing is analyzed up front and
+    each section is computed when first read (e.g. `display_summary` only pays for
+    'general_stats' and 'word_analysis'). Ignored with `diagnostics`, which times a full run.
+
+    `compact=True` returns a `CompactAnalysisResult`, which leaves out the whole-document
+    members (`cfg.HEAVY_RESULT_MEMBERS`: 'original_text', 'processed_tokens' and
+    'word_analysis.full_word_counts_obj') except those named in `keep`. The run frees every
+    intermediate value (token lists, the spaCy Doc, the cleaned texts) as soon as the last
+    stage reading it is done instead of holding it until the end, and only the compact result
+    is cached. Takes precedence over `lazy`.
+
+    With a `cache` (e.g. `result_cache.get_default_cache()`), a run with the same text and
+    arguments as an earlier one returns a copy of its stored result instead of analyzing again.
+    Runs with `diagnostics` or `lazy` bypass it, and results with an 'error' are not stored.
+    A compact run also stores the text itself there under its `text_key`, so
+    `get_sentences_for_text_key` finds it later, in other processes too if the cache has a
+    disk tier.
+
     Note: Term Frequency (TF) for the current document is available via 'word_analysis.full_word_counts_obj'.
     For TF-IDF (Term Frequency-Inverse Document Frequency), which measures word importance across a
-    collection of documents (corpus), see the placeholder function `calculate_tfidf_scores_corpus`
-    for a conceptual overview. TF-IDF is not calculated for single-document analysis.
-    """
-    default_pos_analysis_structure = {'pos_counts': Counter(), 'most_common_pos': [], 'total_pos_tags': 0, 'lexical_density': 0.0, 'error': None}
-    default_ner_analysis_structure = {'entity_counts_by_type': Counter(), 'entities_by_type': defaultdict(list), 'total_entities': 0, 'most_common_entity_types': [], 'error': None}
-    default_readability_stats_structure = {'avg_word_length': 0.0, 'complexity_score': 0.0, 'readability_level': 'Unknown', 'flesch_reading_ease': 'N/A', 'flesch_kincaid_grade': 'N/A', 'gunning_fog': 'N/A', 'smog_index': 'N/A', 'coleman_liau_index': 'N/A', 'dale_chall_readability_score': 'N/A', 'automated_readability_index': 'N/A', 'error': None}
-    
-    error_response_base: Dict[str, Any] = {
-        'word_analysis': {}, 'sentence_analysis': {}, 'general_stats': {}, 
-        'processed_tokens': [], 'readability_stats': default_readability_stats_structure.copy(), 
-        'interesting_patterns': {}, 'ngram_frequencies': {}, 'sentiment_analysis': {},
-        'pos_analysis': default_pos_analysis_structure.copy(),
-        'ner_analysis': default_ner_analysis_structure.copy(),
-        'keyword_analysis': [], 
-    }
+    collection of documents (corpus), see `calculate_tfidf_scores_corpus` / `tfidf.TfidfCorpus`.
+    TF-IDF is not calculated for single-document analysis.
+    """
+    keep = tuple(keep)
+    if compact:
+        unknown = [member for member in keep if member not in cfg.HEAVY_RESULT_MEMBERS]
+        if unknown:
+            return CompactAnalysisResult.from_results({**_empty_results(), 'error': f"Unknown result member: {', '.join(unknown)}. Available: {', '.join(cfg.HEAVY_RESULT_MEMBERS)}"}, text or '')
+        if text and cache is not None:
+            remember_text(text, cache)
 
     if not text:
-        return {**error_response_base, 'error': 'No text provided for analysis'}
-    
-    removed_stop_words_count: int = 0
+        results = {**_empty_results(), 'error': 'No text provided for analysis'}
+        return CompactAnalysisResult.from_results(results, '') if compact else results
+
     try:
-        text_for_sentence_structure: str = tp.preprocess_text_for_sentence_analysis(text)
-        sentence_stats: Dict[str, Any] = analyze_sentences(text_for_sentence_structure)
-        sentiment_scores: Dict[str, float] = analyze_sentiment_vader(text_for_sentence_structure)
-        pos_analysis_results: Dict[str, Any] = analyze_pos_tags_spacy(text_for_sentence_structure, top_n_tags=cfg.DEFAULT_POS_DISPLAY_COUNT)
-        if not pos_analysis_results.get('error'):
-            pos_analysis_results['lexical_density'] = calculate_lexical_density(pos_analysis_results.get('pos_counts', Counter()), pos_analysis_results.get('total_pos_tags', 0))
-        else:
-            pos_analysis_results['lexical_density'] = 0.0
-        ner_analysis_results: Dict[str, Any] = analyze_ner_spacy(text_for_sentence_structure, top_n_entity_types=cfg.DEFAULT_NER_DISPLAY_COUNT)
-        keyword_analysis_results: List[Tuple[str, float]] = extract_keywords_rake(text_for_sentence_structure, num_keywords=cfg.DEFAULT_NUM_KEYWORDS)
-
-        text_for_word_tokenization: str = tp.clean_text_for_word_tokenization(text, advanced=True)
-        tokens_after_cleaning: List[str] = tp.tokenize_text(text_for_word_tokenization)
-        
-        processed_tokens: List[str]
-        if active_stop_words: # MODIFIED: Check active_stop_words set
-            processed_tokens, removed_stop_words_count = tp.remove_stop_words(tokens_after_cleaning, active_stop_words)
-        else:
-            processed_tokens = tokens_after_cleaning
-        
-        final_word_counts: Counter[str] = Counter(processed_tokens)
-        word_stats: Dict[str, Any] = get_word_count_stats(final_word_counts)
-        unique_words_list: List[str] = sorted(final_word_counts.keys()) if final_word_counts else []
-            
-        char_count: int = len(text)
-        char_count_no_spaces: int = len(text.replace(' ', ''))
-            
-        general_stats: Dict[str, Any] = {'character_count': char_count, 'character_count_no_spaces': char_count_no_spaces, 'word_count': word_stats['total_words'], 'sentence_count': sentence_stats['sentence_count'], 'paragraph_count': len([p for p in text.split('\n\n') if p.strip()])}
-            
-        num_to_display = max(0, num_common_words_to_display)
-        readability_stats_result: Dict[str, Any] = default_readability_stats_structure.copy()
-        interesting_patterns_result: Dict[str, Any] = {}
-        
-        if final_word_counts:
-             readability_stats_result = calculate_readability_stats(text_for_sentence_structure, final_word_counts, sentence_stats)
-             interesting_patterns_result = find_interesting_patterns(final_word_counts, text, user_patterns=user_patterns)
-        elif text_for_sentence_structure:
-            readability_stats_result = calculate_readability_stats(text_for_sentence_structure, final_word_counts, sentence_stats)
-        
-        word_length_counts_obj: Counter[int] = analyze_word_lengths(processed_tokens)
-        ngram_results: Dict[str, List[Tuple[str, int]]] = {}
-        if processed_tokens:
-            raw_ngrams: Dict[int, List[Tuple[str, ...]]] = tp.generate_ngrams(processed_tokens, cfg.DEFAULT_NGRAM_N_VALUES)
-            ngram_freq_counters: Dict[str, Counter[str]] = calculate_ngram_frequencies(raw_ngrams)
-            for name, counter_obj in ngram_freq_counters.items():
-                ngram_results[name] = counter_obj.most_common(cfg.DEFAULT_NGRAM_DISPLAY_COUNT)
-        else:
-            for n_val in cfg.DEFAULT_NGRAM_N_VALUES:
-                name = calculate_ngram_frequencies({n_val: []}).get(n_val, f"{n_val}-grams")
-                if n_val == 2: 
-                    name = "bigrams"
-                elif n_val == 3: 
-                    name = "trigrams"
-                ngram_results[name] = []
-
-        return {
-            'word_analysis': {'word_frequencies': dict(final_word_counts.most_common(num_to_display)), 'statistics': word_stats, 'unique_words_sample': unique_words_list[:cfg.DEFAULT_UNIQUE_WORDS_SAMPLE_DISPLAY_LIMIT], 'full_word_counts_obj': final_word_counts, 'removed_stop_words_count': removed_stop_words_count},
-            'processed_tokens': processed_tokens, 'word_length_counts_obj': word_length_counts_obj,
-            'sentence_analysis': sentence_stats, 'general_stats': general_stats,
-            'original_text': text, 'readability_stats': readability_stats_result,
-            'interesting_patterns': interesting_patterns_result, 'ngram_frequencies': ngram_results, 
-            'sentiment_analysis': sentiment_scores, 'pos_analysis': pos_analysis_results,
-            'ner_analysis': ner_analysis_results, 'keyword_analysis': keyword_analysis_results
+        sections: List[str] = resolve_analyses(analyses)
+    except ValueError as e:
+        results = {**_empty_results(), 'error': str(e)}
+        return CompactAnalysisResult.from_results(results, text) if compact else results
+
+    diagnostics = diagnostics or trace_memory
+    lazy = lazy and not compact
+    cache_key: Optional[str] = None
+    if cache is not None and not diagnostics and not lazy:
+        cache_key = analysis_key(text, sections, active_stop_words, num_common_words_to_display, user_patterns, top_k_capacity, sentiment_mode,
+                                 method=compact_method('complete', keep) if compact else 'complete')
+        cached_results: Optional[Mapping[str, Any]] = cache.get(cache_key)
+        if cached_results is not None:
+            if compact:
+                cached_results.original_text = text if 'original_text' in keep else None
+            else:
+                cached_results['original_text'] = text
+            return cached_results
+    stage_diagnostics: Optional[Dict[str, Dict[str, Any]]] = {} if diagnostics else None
+    start_time: float = time.perf_counter()
+    try:
+        context = AnalysisContext(
+            text,
+            active_stop_words=active_stop_words,
+            num_common_words_to_display=max(0, num_common_words_to_display),
+            user_patterns=user_patterns,
+            top_k_capacity=top_k_capacity,
+            spacy_profile=select_spacy_profile(stage.name for stage in STAGES.resolve(sections, provided=['text', *_DEFAULT_CONTEXT_PARAMS])),
+            sentiment_mode=sentiment_mode
+        )
+        if lazy and not diagnostics:
+            return AnalysisResult(context, sections, executor=executor, max_workers=max_workers)
+        trace_memory = trace_memory and executor == 'sequential'
+        # A compact run keeps nothing but the sections (and kept members) after the stages are done
+        release: List[str] = [name for stage in STAGES.resolve(sections, provided=context.values) for name in stage.outputs
+                              if name not in sections and name not in keep and name != 'ngram_approximation'] if compact else []
+        with memory_tracing(trace_memory):
+            context.run(sections, diagnostics=stage_diagnostics, trace_memory=trace_memory, executor=executor, max_workers=max_workers, release=release)
+
+        results = _collect_results(context, sections, keep if compact else None)
+        if cache_key is not None:
+            cache.put(cache_key, _without_text(results)) # The text is the key
+    except Exception as e:
+        results = {**_empty_results(), 'error': f'Analysis failed: {type(e).__name__} - {str(e)}'}
+        if compact:
+            results = CompactAnalysisResult.from_results(results, text)
+    if stage_diagnostics is not None:
+        diagnostics_section: Dict[str, Any] = {
+            'stages': stage_diagnostics,
+            'total_seconds': round(time.perf_counter() - start_time, 6),
+            'memory_traced': trace_memory,
         }
+        if compact:
+            results.sections['_diagnostics'] = diagnostics_section
+        else:
+            results['_diagnostics'] = diagnostics_section
+    return results
+
+def _collect_results(context: AnalysisContext, sections: List[str], keep: Optional[Iterable[str]] = None) -> Mapping[str, Any]:
+    """
+    Builds the result of a finished run from the values in `context`: the result dict, or with
+    `keep` (compact runs) a CompactAnalysisResult holding only the heavy members in `keep`.
+    """
+    results: Dict[str, Any] = _empty_results()
+    for section in sections:
+        results[section] = context.values[section]
+    processed_tokens: Sequence[str] = context.values.get('processed_tokens', [])
+    if keep is None:
+        results['processed_tokens'] = processed_tokens
+        results['original_text'] = context.text
+    else:
+        del results['processed_tokens']
+    if context.values['top_k_capacity'] and 'ngram_frequencies' in sections:
+        results['_approximation'] = {'ngram_frequencies': context.values['ngram_approximation']}
+    if keep is not None:
+        return CompactAnalysisResult.from_sections(results, context.text, keep, processed_tokens=processed_tokens)
+    return results
+
+def _without_text(results: Mapping[str, Any]) -> Any:
+    """`results` as stored in the result cache: without the text, which is part of the key."""
+    if isinstance(results, CompactAnalysisResult):
+        return CompactAnalysisResult(results.sections, results.text_key, None, results.processed_tokens, results.full_word_counts)
+    return {key: value for key, value in results.items() if key != 'original_text'}
+
+def compact_method(method: str, keep: Iterable[str]) -> str:
+    """The result cache `method` of compact runs of `method` keeping `keep` (see result_cache.analysis_key)."""
+    return ':'.join([f'{method}-compact', *sorted(set(keep))])
+
+def remember_text(text: str, cache: ResultCache) -> str:
+    """Stores `text` in `cache` under its text key (unless it is there already); returns the key."""
+    text_key: str = text_digest(text).hex()
+    entry_key: str = text_entry_key(text_key)
+    if entry_key not in cache:
+        cache.put(entry_key, text)
+    return text_key
+
+def analyze_texts_batch(
+    texts: Iterable[Optional[str]],
+    active_stop_words: Optional[Set[str]] = None,
+    num_common_words_to_display: int = cfg.DEFAULT_TOP_WORDS_DISPLAY,
+    user_patterns: Optional[List[Dict[str, str]]] = None,
+    analyses: Optional[Iterable[str]] = None,
+    batch_size: int = cfg.DEFAULT_BATCH_SIZE,
+    n_process: int = cfg.DEFAULT_BATCH_N_PROCESS,
+    top_k_capacity: Optional[int] = None,
+    sentiment_mode: str = cfg.DEFAULT_SENTIMENT_MODE,
+    cache: Optional[ResultCache] = None
+) -> List[Dict[str, Any]]:
+    """
+    Analyzes many (typically short) documents, returning one analyze_text_complete result per text, in order.
+
+    Instead of running the whole pipeline per document, every stage is run over all documents
+    before the next one: the spaCy pass goes through `nlp.pipe` (`batch_size` documents per batch,
+    `n_process` processes) and, with `n_process` > 1, the other process-safe stages (VADER, textstat,
+    RAKE, ...) are sent to a process pool `batch_size` documents at a time.
+    A document whose analysis fails gets an 'error' result; the others are unaffected.
+    With a `cache`, documents analyzed before (see analyze_text_complete) are not analyzed again.
+    """
+    texts = list(texts)
+    try:
+        sections: List[str] = resolve_analyses(analyses)
+    except ValueError as e:
+        return [{**_empty_results(), 'error': str(e)} for _ in texts]
+
+    plan = STAGES.resolve(sections, provided=['text', *_DEFAULT_CONTEXT_PARAMS])
+    spacy_profile: str = select_spacy_profile(stage.name for stage in plan)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    contexts: Dict[int, AnalysisContext] = {}
+    cache_keys: Dict[int, str] = {}
+    for i, text in enumerate(texts):
+        if not text:
+            results[i] = {**_empty_results(), 'error': 'No text provided for analysis'}
+            continue
+        if cache is not None:
+            cache_keys[i] = analysis_key(text, sections, active_stop_words, num_common_words_to_display, user_patterns, top_k_capacity, sentiment_mode)
+            results[i] = cache.get(cache_keys[i])
+            if results[i] is not None:
+                results[i]['original_text'] = text
+                continue
+        contexts[i] = AnalysisContext(
+            text,
+            active_stop_words=active_stop_words,
+            num_common_words_to_display=max(0, num_common_words_to_display),
+            user_patterns=user_patterns,
+            top_k_capacity=top_k_capacity,
+            spacy_profile=spacy_profile,
+            sentiment_mode=sentiment_mode
+        )
+
+    for stage in plan:
+        pending: List[int] = [i for i in contexts if results[i] is None]
+        if stage.name == 'spacy_doc':
+            _pipe_spacy_docs([contexts[i] for i in pending], spacy_profile, batch_size, n_process)
+            continue
+        outcomes = run_stage_batch(
+            stage,
+            [{name: contexts[i].values[name] for name in stage.inputs} for i in pending],
+            use_processes=n_process > 1,
+            max_workers=n_process,
+            chunksize=batch_size
+        )
+        for i, (produced, error) in zip(pending, outcomes):
+            if error is None:
+                contexts[i].values.update(produced)
+            else:
+                results[i] = {**_empty_results(), 'error': f'Analysis failed: {error}'}
+
+    for i, context in contexts.items():
+        if results[i] is None:
+            results[i] = _collect_results(context, sections)
+            if i in cache_keys:
+                cache.put(cache_keys[i], {key: value for key, value in results[i].items() if key != 'original_text'})
+    return results
+
+def _pipe_spacy_docs(contexts: List[AnalysisContext], spacy_profile: str, batch_size: int, n_process: int) -> None:
+    """Fills in the spacy_doc/spacy_error values of `contexts` with a single `nlp.pipe` run (see `_stage_spacy_doc`)."""
+    nlp = _get_nlp_model(spacy_profile)
+    to_parse: List[AnalysisContext] = []
+    for context in contexts:
+        context.values['spacy_doc'], context.values['spacy_error'] = None, None
+        if nlp is not None and context.values['sentence_text'].strip():
+            to_parse.append(context)
+    if not to_parse:
+        return
+    try:
+        docs = nlp.pipe((context.values['sentence_text'] for context in to_parse), batch_size=max(1, batch_size), n_process=max(1, n_process))
+        for context, doc in zip(to_parse, docs):
+            context.values['spacy_doc'] = doc
+    except Exception:
+        for context in to_parse: # Parse one by one so only the documents spaCy fails on report an error
+            context.values.update(_stage_spacy_doc(context.values['sentence_text'], spacy_profile))
+
+# =============================================================================
+# ANALYSIS STAGES (registered in STAGES, scheduled by analyze_text_complete)
+# =============================================================================
+
+@STAGES.register('sentence_text', inputs=('text',), outputs=('sentence_text',))
+def _stage_sentence_text(text: str) -> Dict[str, Any]:
+    return {'sentence_text': tp.preprocess_text_for_sentence_analysis(text)}
+
+@STAGES.register('spacy_doc', inputs=('sentence_text', 'spacy_profile'), outputs=('spacy_doc', 'spacy_error'), process_safe=False)
+def _stage_spacy_doc(sentence_text: str, spacy_profile: str) -> Dict[str, Any]:
+    nlp = _get_nlp_model(spacy_profile)
+    if nlp is None or not sentence_text.strip():
+        return {'spacy_doc': None, 'spacy_error': None} # The POS/NER stages report these cases themselves
+    try:
+        return {'spacy_doc': nlp(sentence_text), 'spacy_error': None}
     except Exception as e:
-        return {**error_response_base, 'error': f'Analysis failed: {type(e).__name__} - {str(e)}'}
+        return {'spacy_doc': None, 'spacy_error': f"spaCy processing failed: {type(e).__name__} - {str(e)}"}
+
+@STAGES.register('sentence_table', inputs=('sentence_text',), outputs=('sentence_table',))
+def _stage_sentence_table(sentence_text: str) -> Dict[str, Any]:
+    return {'sentence_table': SentenceTable(sentence_text)}
+
+@STAGES.register('sentences', inputs=('sentence_text', 'sentence_table'), outputs=('sentence_analysis',))
+def _stage_sentences(sentence_text: str, sentence_table: SentenceTable) -> Dict[str, Any]:
+    return {'sentence_analysis': analyze_sentences(sentence_text, sentence_table=sentence_table)}
+
+@STAGES.register('sentiment', inputs=('sentence_text', 'sentence_table', 'sentiment_mode'), outputs=('sentiment_analysis',))
+def _stage_sentiment(sentence_text: str, sentence_table: SentenceTable, sentiment_mode: str) -> Dict[str, Any]:
+    if sentiment_mode not in cfg.SENTIMENT_MODES:
+        raise ValueError(f"Unknown sentiment mode '{sentiment_mode}'. Use one of: {', '.join(cfg.SENTIMENT_MODES)}")
+    if sentiment_mode == 'sentence':
+        return {'sentiment_analysis': analyze_sentiment_by_sentence(sentence_text, sentence_table=sentence_table)}
+    return {'sentiment_analysis': analyze_sentiment_vader(sentence_text)}
+
+@STAGES.register('pos', inputs=('sentence_text', 'spacy_doc', 'spacy_error'), outputs=('pos_analysis',), process_safe=False)
+def _stage_pos(sentence_text: str, spacy_doc: Optional[Any], spacy_error: Optional[str]) -> Dict[str, Any]:
+    if spacy_error:
+        return {'pos_analysis': {**_empty_results()['pos_analysis'], 'error': spacy_error}}
+    pos_analysis_results: Dict[str, Any] = analyze_pos_tags_spacy(sentence_text, top_n_tags=cfg.DEFAULT_POS_DISPLAY_COUNT, doc=spacy_doc)
+    if not pos_analysis_results.get('error'):
+        pos_analysis_results['lexical_density'] = calculate_lexical_density(pos_analysis_results.get('pos_counts', Counter()), pos_analysis_results.get('total_pos_tags', 0))
+    else:
+        pos_analysis_results['lexical_density'] = 0.0
+    return {'pos_analysis': pos_analysis_results}
+
+@STAGES.register('ner', inputs=('sentence_text', 'spacy_doc', 'spacy_error'), outputs=('ner_analysis',), process_safe=False)
+def _stage_ner(sentence_text: str, spacy_doc: Optional[Any], spacy_error: Optional[str]) -> Dict[str, Any]:
+    if spacy_error:
+        return {'ner_analysis': {**_empty_results()['ner_analysis'], 'error': spacy_error}}
+    return {'ner_analysis': analyze_ner_spacy(sentence_text, top_n_entity_types=cfg.DEFAULT_NER_DISPLAY_COUNT, doc=spacy_doc)}
+
+@STAGES.register('keywords', inputs=('sentence_text', 'sentence_table', 'active_stop_words'), outputs=('keyword_analysis',))
+def _stage_keywords(sentence_text: str, sentence_table: SentenceTable, active_stop_words: Optional[Set[str]]) -> Dict[str, Any]:
+    return {'keyword_analysis': extract_keywords_rake(sentence_text, num_keywords=cfg.DEFAULT_NUM_KEYWORDS,
+                                                      sentence_table=sentence_table, active_stop_words=active_stop_words)}
+
+@STAGES.register('tokens', inputs=('text', 'active_stop_words'), outputs=('processed_tokens', 'removed_stop_words_count'))
+def _stage_tokens(text: str, active_stop_words: Optional[Set[str]]) -> Dict[str, Any]:
+    text_for_word_tokenization: str = tp.clean_text_for_word_tokenization(text, advanced=True)
+    token_store = TokenStore.from_tokens(tp.tokenize_text(text_for_word_tokenization), active_stop_words)
+    removed_stop_words_count: int = 0
+    if active_stop_words: # MODIFIED: Check active_stop_words set
+        token_store, removed_stop_words_count = token_store.without_stop_words()
+    return {'processed_tokens': token_store, 'removed_stop_words_count': removed_stop_words_count}
 
-def analyze_ner_spacy(text: str, top_n_entity_types: int = 5) -> Dict[str, Any]:
+@STAGES.register('word_counts', inputs=('processed_tokens',), outputs=('word_counts', 'word_stats'))
+def _stage_word_counts(processed_tokens: TokenStore) -> Dict[str, Any]:
+    final_word_counts: Counter[str] = processed_tokens.word_counts()
+    return {'word_counts': final_word_counts, 'word_stats': get_word_count_stats(final_word_counts)}
+
+@STAGES.register('word_frequencies', inputs=('word_counts', 'word_stats', 'removed_stop_words_count', 'num_common_words_to_display'), outputs=('word_analysis',))
+def _stage_word_frequencies(word_counts: Counter[str], word_stats: Dict[str, Any], removed_stop_words_count: int, num_common_words_to_display: int) -> Dict[str, Any]:
+    unique_words_list: List[str] = sorted(word_counts.keys()) if word_counts else []
+    return {'word_analysis': {'word_frequencies': dict(word_counts.most_common(num_common_words_to_display)), 'statistics': word_stats, 'unique_words_sample': unique_words_list[:cfg.DEFAULT_UNIQUE_WORDS_SAMPLE_DISPLAY_LIMIT], 'full_word_counts_obj': word_counts, 'removed_stop_words_count': removed_stop_words_count}}
+
+@STAGES.register('general_stats', inputs=('text', 'word_stats', 'sentence_analysis'), outputs=('general_stats',))
+def _stage_general_stats(text: str, word_stats: Dict[str, Any], sentence_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    char_count: int = len(text)
+    char_count_no_spaces: int = len(text.replace(' ', ''))
+    return {'general_stats': {'character_count': char_count, 'character_count_no_spaces': char_count_no_spaces, 'word_count': word_stats['total_words'], 'sentence_count': sentence_analysis['sentence_count'], 'paragraph_count': len([p for p in text.split('\n\n') if p.strip()])}}
+
+@STAGES.register('readability', inputs=('sentence_text', 'word_counts', 'sentence_analysis'), outputs=('readability_stats',))
+def _stage_readability(sentence_text: str, word_counts: Counter[str], sentence_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    if not word_counts and not sentence_text:
+        return {'readability_stats': _empty_results()['readability_stats']}
+    return {'readability_stats': calculate_readability_stats(sentence_text, word_counts, sentence_analysis)}
+
+@STAGES.register('patterns', inputs=('text', 'word_counts', 'user_patterns'), outputs=('interesting_patterns',))
+def _stage_patterns(text: str, word_counts: Counter[str], user_patterns: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+    if not word_counts:
+        return {'interesting_patterns': {}}
+    return {'interesting_patterns': find_interesting_patterns(word_counts, text, user_patterns=user_patterns)}
+
+@STAGES.register('word_lengths', inputs=('processed_tokens',), outputs=('word_length_counts_obj',))
+def _stage_word_lengths(processed_tokens: TokenStore) -> Dict[str, Any]:
+    return {'word_length_counts_obj': analyze_word_lengths(processed_tokens)}
+
+@STAGES.register('ngrams', inputs=('processed_tokens', 'top_k_capacity'), outputs=('ngram_frequencies', 'ngram_approximation'))
+def _stage_ngrams(processed_tokens: TokenStore, top_k_capacity: Optional[int]) -> Dict[str, Any]:
+    if top_k_capacity:
+        summaries: Dict[str, SpaceSavingCounter] = count_ngrams_approximately(processed_tokens, cfg.DEFAULT_NGRAM_N_VALUES, top_k_capacity)
+        return {'ngram_frequencies': format_ngram_frequencies(summaries), 'ngram_approximation': {name: summary.error_report() for name, summary in summaries.items()}}
+    top_ngrams: Dict[int, List[Tuple[str, int]]] = count_top_ngrams(processed_tokens, cfg.DEFAULT_NGRAM_N_VALUES, cfg.DEFAULT_NGRAM_DISPLAY_COUNT)
+    if not top_ngrams:
+        return {'ngram_frequencies': format_ngram_frequencies({}), 'ngram_approximation': None}
+    return {'ngram_frequencies': {ngram_name(n_value): ngrams for n_value, ngrams in top_ngrams.items()}, 'ngram_approximation': None}
+
+def format_ngram_frequencies(ngram_freq_counters: Dict[str, Counter[str]]) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Top DEFAULT_NGRAM_DISPLAY_COUNT n-grams per counter (the 'ngram_frequencies' result section).
+    Without any counters (no tokens) every configured n gets an empty list.
+    """
+    ngram_results: Dict[str, List[Tuple[str, int]]] = {}
+    if ngram_freq_counters:
+        for name, counter_obj in ngram_freq_counters.items():
+            ngram_results[name] = counter_obj.most_common(cfg.DEFAULT_NGRAM_DISPLAY_COUNT)
+    else:
+        for n_val in cfg.DEFAULT_NGRAM_N_VALUES:
+            name = calculate_ngram_frequencies({n_val: []}).get(n_val, f"{n_val}-grams")
+            if n_val == 2: 
+                name = "bigrams"
+            elif n_val == 3: 
+                name = "trigrams"
+            ngram_results[name] = []
+    return ngram_results
+
+def analyze_ner_spacy(text: str, top_n_entity_types: int = 5, doc: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Named Entity Recognition with spaCy.
+    If `doc` is given (e.g. `AnalysisContext.spacy_doc`), it is used as-is instead of running the model on `text` again.
+    """
     default_return = {'entity_counts_by_type': Counter(), 'entities_by_type': defaultdict(list), 'total_entities': 0, 'most_common_entity_types': [], 'error': None}
-    nlp = _get_nlp_model()
-    if nlp is None:
+    nlp = _get_nlp_model('ner') if doc is None else None
+    if doc is None and nlp is None:
         default_return['error'] = f"spaCy model '{SPACY_MODEL_NAME}' not available. NER unavailable."
         return default_return
     if not text or not text.strip(): default_return['error'] = "Input text is empty. NER cannot be performed."; return default_return
     try:
-        doc = nlp(text)
+        if doc is None: doc = nlp(text)
         if not doc.ents: return default_return 
         entities_by_type_dd = defaultdict(list)
         for ent in doc.ents: entities_by_type_dd[ent.label_].append(ent.text)
@@ -286,15 +869,19 @@ def calculate_lexical_density(pos_counts: Counter[str], total_pos_tags: int) ->
     content_word_count: int = sum(pos_counts[tag] for tag in cfg.CONTENT_POS_TAGS if tag in pos_counts)
     return round((content_word_count / total_pos_tags) * 100, 2)
 
-def analyze_pos_tags_spacy(text: str, top_n_tags: int = 10) -> Dict[str, Any]:
+def analyze_pos_tags_spacy(text: str, top_n_tags: int = 10, doc: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Part-of-Speech tag counts with spaCy.
+    If `doc` is given (e.g. `AnalysisContext.spacy_doc`), it is used as-is instead of running the model on `text` again.
+    """
     default_return = {'pos_counts': Counter(), 'most_common_pos': [], 'total_pos_tags': 0, 'lexical_density': 0.0, 'error': None}
-    nlp = _get_nlp_model()
-    if nlp is None:
+    nlp = _get_nlp_model('pos') if doc is None else None
+    if doc is None and nlp is None:
         default_return['error'] = f"spaCy model '{SPACY_MODEL_NAME}' not available. POS tagging unavailable."
         return default_return
     if not text or not text.strip(): default_return['error'] = "Input text is empty. POS tagging cannot be performed."; return default_return
     try:
-        doc = nlp(text)
+        if doc is None: doc = nlp(text)
         pos_tags: List[str] = [token.pos_ for token in doc if not token.is_punct and not token.is_space]
         if not pos_tags: default_return['error'] = "No valid tokens for POS tagging after filtering punctuation/spaces."; return default_return
         pos_counts: Counter[str] = Counter(pos_tags)
@@ -306,8 +893,100 @@ def analyze_sentiment_vader(text: str) -> Dict[str, float]:
     try: return _vader_analyzer.polarity_scores(text)
     except Exception as e: return {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0, 'error': f'VADER analysis failed: {str(e)}'}
 
-def analyze_word_lengths(tokens: List[str]) -> Counter[int]:
+def score_sentences_vader(sentences: List[str]) -> np.ndarray:
+    """
+    VADER scores of each sentence as an (n, 4) array of neg, neu, pos, compound.
+    Lexicon membership is looked up once per unique whitespace token: sentences without any
+    lexicon word cannot score anything but neutral, so VADER only runs on the others
+    (and only once per distinct sentence).
+    """
+    scores: np.ndarray = np.zeros((len(sentences), 4))
+    lexicon: Dict[str, float] = _vader_analyzer.lexicon
+    token_hits: Dict[str, bool] = {}
+    sentence_scores: Dict[str, Tuple[float, float, float, float]] = {}
+    for i, sentence in enumerate(sentences):
+        cached = sentence_scores.get(sentence)
+        if cached is None:
+            has_lexicon_word: bool = False
+            has_word: bool = False # VADER ignores single-character tokens
+            for token in sentence.split():
+                hit = token_hits.get(token)
+                if hit is None:
+                    lowered: str = token.lower()
+                    hit = token_hits[token] = lowered in lexicon or lowered.strip(string.punctuation) in lexicon
+                if hit:
+                    has_lexicon_word = True
+                    break
+                has_word = has_word or len(token) > 1
+            if has_lexicon_word:
+                polarity = _vader_analyzer.polarity_scores(sentence)
+                cached = (polarity['neg'], polarity['neu'], polarity['pos'], polarity['compound'])
+            else:
+                cached = (0.0, 1.0 if has_word else 0.0, 0.0, 0.0)
+            sentence_scores[sentence] = cached
+        scores[i] = cached
+    return scores
+
+def analyze_sentiment_by_sentence(
+    text: str,
+    sentence_table: Optional[SentenceTable] = None,
+    timeline_points: int = cfg.SENTIMENT_TIMELINE_POINTS
+) -> Dict[str, Any]:
+    """
+    Sentence-level VADER sentiment.
+
+    Each sentence (with its terminating punctuation, which VADER uses for emphasis) is scored
+    separately. Document scores are the word-count weighted means of the sentence scores; the
+    timeline gives the weighted mean compound score in `timeline_points` equal slices of the text
+    (None where a slice holds no sentence start). Sentence-level scores are returned as lists.
+    """
+    default_return = {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0, 'mode': 'sentence', 'sentence_count': 0,
+                      'sentence_scores': {'starts': [], 'neg': [], 'neu': [], 'pos': [], 'compound': []},
+                      'timeline': {'positions': [], 'compound': []}}
+    if not text or _vader_analyzer is None: return {**default_return, 'error': 'VADER analyzer not available or empty text'}
+    if sentence_table is None: sentence_table = SentenceTable(text)
+    if not sentence_table: return {**default_return, 'error': 'No sentences to score'}
+    try: scores: np.ndarray = score_table_sentences(text, sentence_table)
+    except Exception as e: return {**default_return, 'error': f'VADER analysis failed: {str(e)}'}
+    return summarize_sentence_sentiment(np.asarray(sentence_table.starts, dtype=np.int64), scores,
+                                        np.asarray(sentence_table.word_counts, dtype=float), len(text), timeline_points)
+
+def score_table_sentences(text: str, sentence_table: SentenceTable) -> np.ndarray:
+    """VADER scores (see score_sentences_vader) of the sentences of `sentence_table`, each with its terminating punctuation."""
+    stops: List[int] = [*sentence_table.starts[1:], len(text)]
+    return score_sentences_vader([text[start:stop].rstrip() for start, stop in zip(sentence_table.starts, stops)])
+
+def summarize_sentence_sentiment(
+    starts: np.ndarray,
+    scores: np.ndarray,
+    weights: np.ndarray,
+    text_length: int,
+    timeline_points: int = cfg.SENTIMENT_TIMELINE_POINTS
+) -> Dict[str, Any]:
+    """
+    The 'sentence' mode sentiment section from the start offsets, (n, 4) VADER scores and word
+    counts of the (at least one) sentences of a text of `text_length` characters.
+    """
+    if not weights.any(): weights = np.ones(len(weights))
+    neg, neu, pos, compound = np.average(scores, axis=0, weights=weights)
+
+    bin_count: int = max(1, min(timeline_points, len(starts)))
+    bins: np.ndarray = np.minimum(starts * bin_count // max(text_length, 1), bin_count - 1)
+    bin_weights: np.ndarray = np.bincount(bins, weights=weights, minlength=bin_count)
+    bin_compound: np.ndarray = np.bincount(bins, weights=scores[:, 3] * weights, minlength=bin_count)
+    timeline_values: List[Optional[float]] = [round(float(total / weight), 4) if weight else None for total, weight in zip(bin_compound, bin_weights)]
+
+    return {
+        'neg': round(float(neg), 3), 'neu': round(float(neu), 3), 'pos': round(float(pos), 3), 'compound': round(float(compound), 4),
+        'mode': 'sentence',
+        'sentence_count': len(starts),
+        'sentence_scores': {'starts': starts.tolist(), 'neg': scores[:, 0].tolist(), 'neu': scores[:, 1].tolist(), 'pos': scores[:, 2].tolist(), 'compound': scores[:, 3].tolist()},
+        'timeline': {'positions': [round((i + 0.5) * 100 / bin_count, 1) for i in range(bin_count)], 'compound': timeline_values},
+    }
+
+def analyze_word_lengths(tokens: Sequence[str]) -> Counter[int]:
     if not tokens: return Counter()
+    if isinstance(tokens, TokenStore): return tokens.length_counts()
     return Counter(len(word) for word in tokens)
 
 def calculate_readability_stats(text_for_textstat: str, word_counts: Counter[str], sentence_analysis: Dict[str, Any]) -> Dict[str, Any]:
@@ -326,13 +1005,26 @@ def calculate_readability_stats(text_for_textstat: str, word_counts: Counter[str
         else: stats['readability_level'] = 'Very Difficult'
     else: stats['avg_word_length'] = 0.0; stats['complexity_score'] = 0.0; stats['readability_level'] = 'N/A (Not enough data)'
     if not text_for_textstat or not text_for_textstat.strip(): stats['error'] = "Input text for textstat is empty or too short."; return stats
-    textstat_functions = {'flesch_reading_ease': textstat.flesch_reading_ease, 'flesch_kincaid_grade': textstat.flesch_kincaid_grade, 'gunning_fog': textstat.gunning_fog, 'smog_index': textstat.smog_index, 'coleman_liau_index': textstat.coleman_liau_index, 'dale_chall_readability_score': textstat.dale_chall_readability_score, 'automated_readability_index': textstat.automated_readability_index}
-    for key, func in textstat_functions.items():
-        try: stats[key] = round(func(text_for_textstat), 2)
-        except (ZeroDivisionError, Exception) as e: stats[key] = 'N/A'; stats['error'] = stats.get('error') or f"Error calculating {key}: {type(e).__name__}"
+    # All indices come from one counting pass (same values as the textstat functions, see readability.py)
+    try: indices: Dict[str, float] = readability_indices(count_readability(text_for_textstat))
+    except Exception as e: stats['error'] = f"Error calculating readability indices: {type(e).__name__}"; return stats
+    for key, value in indices.items(): stats[key] = round(value, 2)
     return stats
 
-def find_interesting_patterns(word_counts: Counter[str], text: str, user_patterns: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+def find_interesting_patterns(
+    word_counts: Counter[str],
+    text: str,
+    user_patterns: Optional[List[Dict[str, str]]] = None,
+    total_words: Optional[int] = None,
+    unique_words: Optional[int] = None,
+    count_matches: bool = False
+) -> Dict[str, Any]:
+    """
+    Repeated/long/short words, word variety (type/token ratio, %) and regex pattern matches.
+    `total_words` / `unique_words` override the counts behind word variety (see get_word_count_stats).
+    With `count_matches`, 'pattern_match_counts' also holds the total number of matches of every
+    valid pattern (the match lists stay capped at DEFAULT_PATTERN_MATCH_LIMIT).
+    """
     patterns: Dict[str, Any] = {
         'repeated_words': [],
         'long_words': [],
@@ -376,43 +1068,101 @@ def find_interesting_patterns(word_counts: Counter[str], text: str, user_pattern
         patterns['short_words'] = sorted(short_word_candidates)[:cfg.DEFAULT_PATTERNS_SHORT_WORDS_SAMPLE_SIZE]
 
         # Word Variety: calculation is efficient.
-        total_words: int = sum(word_counts.values())
-        unique_words_count: int = len(word_counts) # Number of unique words
+        total_words = sum(word_counts.values()) if total_words is None else total_words
+        unique_words_count: int = len(word_counts) if unique_words is None else unique_words # Number of unique words
         patterns['word_variety'] = round(unique_words_count / total_words * 100, 1) if total_words else 0.0
 
-    # Regex pattern matching (remains unchanged as it operates on 'text', not 'word_counts')
+    # Regex pattern matching: each pattern is compiled once per process and scanned only up to the match limit
+    pattern_match_counts: Dict[str, Dict[str, int]] = {'common_patterns': {}, 'user_defined_pattern_results': {}}
     if text:
-        for pattern_name, regex_str in cfg.COMMON_PATTERNS.items():
-            try: patterns['common_patterns'][pattern_name] = re.compile(regex_str).findall(text)[:cfg.DEFAULT_PATTERN_MATCH_LIMIT]
-            except re.error as e: patterns['common_patterns'][pattern_name] = {'error': f"Invalid regex: {str(e)}"}
+        patterns['common_patterns'], pattern_match_counts['common_patterns'] = match_patterns(text, cfg.COMMON_PATTERNS.items(), count_matches=count_matches)
     if text and user_patterns:
-        for user_pattern_dict in user_patterns:
-            pattern_name = user_pattern_dict.get('name'); regex_str = user_pattern_dict.get('regex')
-            if not pattern_name or not regex_str: patterns['user_defined_pattern_results'][f"UnnamedPattern_{len(patterns['user_defined_pattern_results'])}"] = {'error': 'Pattern name or regex string missing.'}; continue
-            try: patterns['user_defined_pattern_results'][pattern_name] = re.compile(regex_str).findall(text)[:cfg.DEFAULT_PATTERN_MATCH_LIMIT]
-            except re.error as e: patterns['user_defined_pattern_results'][pattern_name] = {'error': f"Invalid regex: {str(e)}"}
-            except Exception as e: patterns['user_defined_pattern_results'][pattern_name] = {'error': f"Unexpected error processing pattern: {str(e)}"}
+        patterns['user_defined_pattern_results'], pattern_match_counts['user_defined_pattern_results'] = find_user_defined_patterns(text, user_patterns, count_matches=count_matches)
+    if count_matches:
+        patterns['pattern_match_counts'] = pattern_match_counts
     return patterns
 
-def get_sentences_for_word(text_content: str, word: str) -> List[str]:
+def find_user_defined_patterns(text: str, user_patterns: List[Dict[str, str]], count_matches: bool = False) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    The 'user_defined_pattern_results' of find_interesting_patterns and, with `count_matches`, the
+    total match count of each valid pattern. A pattern without a name or regex gets an error entry.
+    """
+    # User regexes run time-bounded in a worker process; result slots are reserved in input order first
+    user_defined_pattern_results: Dict[str, Any] = {}
+    named_user_patterns: List[Tuple[str, str]] = []
+    for user_pattern_dict in user_patterns:
+        pattern_name = user_pattern_dict.get('name'); regex_str = user_pattern_dict.get('regex')
+        if not pattern_name or not regex_str: user_defined_pattern_results[f"UnnamedPattern_{len(user_defined_pattern_results)}"] = {'error': 'Pattern name or regex string missing.'}; continue
+        user_defined_pattern_results[pattern_name] = None
+        named_user_patterns.append((pattern_name, regex_str))
+    user_results, match_counts = match_user_patterns(text, named_user_patterns, count_matches=count_matches)
+    user_defined_pattern_results.update(user_results)
+    return user_defined_pattern_results, match_counts
+
+def get_sentences_for_word(text_content: str, word: str, sentence_table: Optional[SentenceTable] = None) -> List[str]:
+    """
+    Sentences of `text_content` containing `word` as a whole word (ignoring case).
+    Served from the text's cached sentence index, so repeated lookups do not rescan the text.
+    A `sentence_table` of `text_content` is indexed as is instead of segmenting the text again.
+    """
     if not text_content or not word: return []
-    sentences: List[str] = [s.strip() for s in re.split(r'[.!?]+', text_content) if s.strip()]
-    found_sentences: List[str] = []
-    try: word_regex = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
-    except re.error: return [] 
-    for sentence in sentences:
-        if word_regex.search(sentence): found_sentences.append(sentence + '.')
-    return found_sentences
+    return get_sentence_index(text_content, sentence_table=sentence_table).sentences_for_word(word)
+
+def get_sentences_for_text_key(text_key: str, word: str, cache: Optional[ResultCache] = None) -> Optional[List[str]]:
+    """
+    Like get_sentences_for_word for the text a CompactAnalysisResult's `text_key` identifies.
+    Without a cached sentence index the text is looked up in `cache` (where compact runs store
+    it, see `remember_text`) and indexed. None if it is not there (any more), e.g. after eviction.
+    """
+    try: digest = bytes.fromhex(text_key)
+    except (TypeError, ValueError): return None
+    index = cached_sentence_index(digest)
+    if index is None and cache is not None:
+        text = cache.get(text_entry_key(text_key))
+        if isinstance(text, str) and text_digest(text) == digest:
+            index = get_sentence_index(text)
+    if index is None: return None
+    return index.sentences_for_word(word) if word else []
+
+NGRAM_NAMES: Dict[int, str] = {1: "unigrams", 2: "bigrams", 3: "trigrams", 4: "quadgrams", 5: "pentagrams"}
+
+def ngram_name(n_value: int) -> str:
+    return NGRAM_NAMES.get(n_value, f"{n_value}-grams")
 
 def calculate_ngram_frequencies(ngrams_data: Dict[int, List[Tuple[str, ...]]]) -> Dict[str, Counter[str]]:
     ngram_frequencies: Dict[str, Counter[str]] = {}
-    n_value_to_name_map: Dict[int, str] = {1: "unigrams", 2: "bigrams", 3: "trigrams", 4: "quadgrams", 5: "pentagrams"}
     for n_value, ngram_list in ngrams_data.items():
         if not ngram_list: continue
         string_ngrams: List[str] = [" ".join(ngram_tuple) for ngram_tuple in ngram_list]
-        descriptive_name: str = n_value_to_name_map.get(n_value, f"{n_value}-grams")
-        ngram_frequencies[descriptive_name] = Counter(string_ngrams)
+        ngram_frequencies[ngram_name(n_value)] = Counter(string_ngrams)
     return ngram_frequencies
 
-def calculate_tfidf_scores_corpus(corpus_texts: List[str]) -> None:
-    raise NotImplementedError("This function is a placeholder for corpus-level TF-IDF analysis.")
+def count_ngrams_approximately(tokens: List[str], n_values: List[int], capacity: int) -> Dict[str, SpaceSavingCounter]:
+    """
+    Approximate n-gram frequencies in bounded memory: n-grams are generated and counted in
+    batches of APPROXIMATE_COUNT_BATCH_SIZE, so neither the full n-gram list nor a Counter
+    of every distinct n-gram is built. Keys match calculate_ngram_frequencies.
+    """
+    summaries: Dict[str, SpaceSavingCounter] = {}
+    for n_value in n_values:
+        ngram_count: int = len(tokens) - n_value + 1
+        if n_value <= 0 or ngram_count <= 0: continue
+        summary = SpaceSavingCounter(capacity)
+        for batch_start in range(0, ngram_count, cfg.APPROXIMATE_COUNT_BATCH_SIZE):
+            batch_stop: int = min(batch_start + cfg.APPROXIMATE_COUNT_BATCH_SIZE, ngram_count)
+            summary.update(" ".join(tokens[i:i + n_value]) for i in range(batch_start, batch_stop))
+        summaries[ngram_name(n_value)] = summary
+    return summaries
+
+def calculate_tfidf_scores_corpus(
+    corpus_texts: Iterable[str],
+    active_stop_words: Optional[Set[str]] = None,
+    top_n: int = cfg.DEFAULT_TFIDF_TOP_TERMS
+) -> List[List[Tuple[str, float]]]:
+    """
+    Corpus-level TF-IDF: the `top_n` highest scoring terms of each document, in corpus order.
+    For corpora that grow over time, keep a `tfidf.TfidfCorpus` and add documents to it instead.
+    """
+    corpus = TfidfCorpus(active_stop_words=active_stop_words)
+    doc_indices: List[int] = corpus.add_documents(corpus_texts)
+    return [corpus.top_terms(doc_index, top_n) for doc_index in doc_indices]
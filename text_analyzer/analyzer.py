@@ -7,11 +7,9 @@ Modules 3A-3E: Complete Integration. Enhanced with Module 4B features.
 
 import os
 import re
-import string
 from pathlib import Path
-from collections import Counter
 import time 
-from typing import Optional, List, Dict, Tuple, Set, Any, Union
+from typing import AbstractSet, Optional, List, Dict, Tuple, Any
 
 # Import configuration
 from . import config as cfg
@@ -21,6 +19,10 @@ from . import file_io
 from . import text_processing as tp
 # Import analysis functions
 from . import analysis
+from . import result_cache
+from . import sharded
+from . import stop_words
+from . import streaming
 # Import display functions
 from . import display
 from nltk.corpus import stopwords # For NLTK language stop words
@@ -30,63 +32,76 @@ from nltk.corpus import stopwords # For NLTK language stop words
 # =============================================================================
 
 def time_function(func: callable, *args: Any, **kwargs: Any) -> Tuple[Any, float]:
-    start_time: float = time.time()
+    start_time: float = time.perf_counter()
     result: Any = func(*args, **kwargs)
-    end_time: float = time.time()
+    end_time: float = time.perf_counter()
     duration: float = end_time - start_time
     return result, duration
 
 # =============================================================================
 # INTERNAL HELPER FOR ANALYSIS AND DISPLAY
 # =============================================================================
-def _perform_analysis_and_display(file_content: str, source_filename_hint: str) -> None:
-    num_common_words_cfg, stop_word_config, user_defined_patterns = get_user_input_config()
-
-    active_stop_words_set: Optional[Set[str]] = set() # Default to empty set (no removal)
-    stop_word_message: str = "ℹ️ Stop word removal is OFF (no option selected or error)."
-
+def _perform_analysis_and_display(file_content: Optional[str], source_filename_hint: str, stream_filepath: Optional[Path] = None) -> None:
+    """
+    Prompts for the analysis configuration, analyzes `file_content` and offers display, save and plot options.
+    With `stream_filepath` the file is instead streamed in chunks (streaming.analyze_text_stream, for large files).
+    """
+    num_common_words_cfg, stop_word_config, user_defined_patterns, diagnostics_mode = get_user_input_config()
+
+    # Lists come from the process-wide registry (loaded once, frozen)
+    stop_word_type: str = stop_word_config["type"]
+    if stop_word_type == "default":
+        stop_word_list, err_msg = stop_words.get_stop_words(stop_words.DEFAULT_ID)
+    elif stop_word_type == "nltk_lang":
+        stop_word_list, err_msg = stop_words.nltk_stop_words(stop_word_config["language"])
+    elif stop_word_type == "custom":
+        stop_word_list, err_msg = stop_words.custom_stop_words(stop_word_config["path"])
+    else:
+        stop_word_list, err_msg = stop_words.get_stop_words(stop_words.NONE_ID)
 
-    if stop_word_config["type"] == "default":
-        active_stop_words_set = cfg.STOP_WORDS
-        stop_word_message = f"ℹ️ Using default English stop words ({len(active_stop_words_set or [])} words)."
-    elif stop_word_config["type"] == "nltk_lang":
-        lang = stop_word_config["language"]
-        try:
-            active_stop_words_set = set(stopwords.words(lang))
-            stop_word_message = f"ℹ️ Using NLTK '{lang}' stop words ({len(active_stop_words_set or [])} words)."
-        except OSError: 
-            print(f"❌ Error: NLTK stopwords for '{lang}' not found. Ensure it's downloaded (e.g., via download_nltk_data.py) and supported.")
-            print("Proceeding without stop word removal for this analysis.")
-            active_stop_words_set = set() 
-            stop_word_message = "ℹ️ Stop word removal is OFF (selected language's stopwords not found)."
-        except Exception as e_nltk: # Catch other potential NLTK errors
-            print(f"❌ Error loading NLTK stopwords for '{lang}': {e_nltk}")
-            active_stop_words_set = set()
-            stop_word_message = "ℹ️ Stop word removal is OFF (error loading NLTK language)."
-    elif stop_word_config["type"] == "custom":
-        custom_path = stop_word_config["path"]
-        loaded_set, err_msg = file_io.load_custom_stop_words(custom_path)
-        if loaded_set:
-            active_stop_words_set = loaded_set
-            stop_word_message = f"ℹ️ Using custom stop words from '{Path(custom_path).name}' ({len(active_stop_words_set or [])} words)."
-        else:
-            print(f"❌ Error loading custom stop words: {err_msg}")
-            print("Proceeding without stop word removal for this analysis.")
-            active_stop_words_set = set()
-            stop_word_message = "ℹ️ Stop word removal is OFF (custom list failed to load)."
-    elif stop_word_config["type"] == "none":
-        active_stop_words_set = set() 
-        stop_word_message = "ℹ️ Stop word removal is OFF (user selected 'none')."
+    if stop_word_list is not None:
+        active_stop_words_set: AbstractSet[str] = stop_word_list.words
+        stop_word_message = f"ℹ️ Using {stop_word_list.description}." if stop_word_list.words else "ℹ️ Stop word removal is OFF (user selected 'none')."
+    else:
+        print(err_msg)
+        print("Proceeding without stop word removal for this analysis.")
+        active_stop_words_set = set()
+        stop_word_message = "ℹ️ Stop word removal is OFF (stop word list failed to load)."
 
     display.print_section("🔄 Running complete analysis...")
     
-    results, analysis_duration = time_function(
-        analysis.analyze_text_complete,
-        file_content,
-        active_stop_words=active_stop_words_set, 
-        num_common_words_to_display=num_common_words_cfg,
-        user_patterns=user_defined_patterns
-    )
+    if stream_filepath is not None:
+        print(f"ℹ️ Large file: streaming it in chunks ({', '.join(cfg.STREAMABLE_ANALYSES)}; per-stage diagnostics unavailable).")
+        print(f"ℹ️ Word and n-gram frequencies are approximated with {cfg.DEFAULT_TOP_K_CAPACITY:,} tracked entries each.")
+        results, analysis_duration = time_function(
+            streaming.analyze_text_stream,
+            file_io.read_file_in_chunks(stream_filepath),
+            active_stop_words=active_stop_words_set,
+            num_common_words_to_display=num_common_words_cfg,
+            user_patterns=user_defined_patterns,
+            top_k_capacity=cfg.DEFAULT_TOP_K_CAPACITY
+        )
+    elif diagnostics_mode == "off" and len(file_content) >= 2 * cfg.MIN_SHARD_CHARS:
+        print("ℹ️ Large text: analyzing it in paragraph shards on all CPU cores.")
+        results, analysis_duration = time_function(
+            sharded.analyze_text_sharded,
+            file_content,
+            active_stop_words=active_stop_words_set,
+            num_common_words_to_display=num_common_words_cfg,
+            user_patterns=user_defined_patterns
+        )
+    else:
+        results, analysis_duration = time_function(
+            analysis.analyze_text_complete,
+            file_content,
+            active_stop_words=active_stop_words_set, 
+            num_common_words_to_display=num_common_words_cfg,
+            user_patterns=user_defined_patterns,
+            diagnostics=diagnostics_mode != "off",
+            trace_memory=diagnostics_mode == "memory",
+            compact=True, keep=('full_word_counts_obj',), # Plots, word cloud and saving use the full counts
+            cache=result_cache.get_default_cache() # Analyzing the same file again is a lookup
+        )
     
     print(stop_word_message) 
     removed_count = results.get('word_analysis', {}).get('removed_stop_words_count', 0)
@@ -96,6 +111,10 @@ def _perform_analysis_and_display(file_content: str, source_filename_hint: str)
         print("ℹ️ No stop words (from the active list) were found in the text.")
 
     print(f"\n⏱️ Text analysis pipeline took: {analysis_duration:.4f} seconds")
+    if results.get('_diagnostics'):
+        display.display_diagnostics(results['_diagnostics'])
+    if results.get('_approximation'):
+        display.display_approximation(results['_approximation'])
 
     if results.get('error'):
         print(f"❌ Analysis error: {results['error']}")
@@ -109,10 +128,9 @@ def _perform_analysis_and_display(file_content: str, source_filename_hint: str)
     elif display_choice == "3": display.display_summary(results); display.display_complete_analysis(results)
     else: print("⚠️ Invalid display choice, showing summary:"); display.display_summary(results)
 
-    processed_tokens_len_analysis = results.get('processed_tokens', [])
-    custom_word_length_counts = analysis.analyze_word_lengths(processed_tokens_len_analysis)
+    custom_word_length_counts = results.get('word_length_counts_obj') if stream_filepath is None else None # Streamed results keep no tokens
     if custom_word_length_counts:
-        display.display_word_length_analysis(custom_word_length_counts, len(processed_tokens_len_analysis))
+        display.display_word_length_analysis(custom_word_length_counts, sum(custom_word_length_counts.values()))
 
     if results.get('word_analysis', {}).get('full_word_counts_obj'): # Check if there are results to save
         while True:
@@ -212,7 +230,7 @@ def _perform_analysis_and_display(file_content: str, source_filename_hint: str)
 # =============================================================================
 # USER INPUT CONFIGURATION
 # =============================================================================
-def get_user_input_config() -> Tuple[int, Dict[str, Any], List[Dict[str, str]]]: # Updated return type
+def get_user_input_config() -> Tuple[int, Dict[str, Any], List[Dict[str, str]], str]: # Updated return type
     print("\n--- ⚙️ Text Analysis Configuration ---")
     num_words: int = cfg.DEFAULT_TOP_WORDS_DISPLAY
     while True:
@@ -300,7 +318,15 @@ def get_user_input_config() -> Tuple[int, Dict[str, Any], List[Dict[str, str]]]:
         if user_patterns:
              print(f"ℹ️ Added {len(user_patterns)} custom pattern(s).")
 
-    return num_words, stop_word_config, user_patterns
+    # Per-stage timing: "off", "timing" (perf_counter per stage) or "memory" (timing + tracemalloc peaks, slower)
+    diagnostics_mode: str = "off"
+    diagnostics_choice = input("\nShow per-stage performance diagnostics? (no/yes/memory, default: no): ").strip().lower()
+    if diagnostics_choice == 'yes':
+        diagnostics_mode = "timing"
+    elif diagnostics_choice == 'memory':
+        diagnostics_mode = "memory"
+
+    return num_words, stop_word_config, user_patterns, diagnostics_mode
 
 # =============================================================================
 # MAIN SCRIPT LOGIC
@@ -377,9 +403,13 @@ def _handle_custom_file_option() -> None:
 def _handle_analyze_file_option() -> None:
     filepath_config: str = str(cfg.FIXED_TARGET_FILEPATH)
     print(f"ℹ️ Analyzing fixed file: {filepath_config}")
-    is_valid_path, path_message = file_io.validate_file_path(filepath_config)
+    fixed_path = Path(filepath_config)
+    can_stream: bool = fixed_path.suffix.lower() == '.txt' # Plain text over MAX_FILE_SIZE_BYTES is streamed instead of rejected
+    is_valid_path, path_message = file_io.validate_file_path(filepath_config, max_size_bytes=None if can_stream else cfg.MAX_FILE_SIZE_BYTES)
     if not is_valid_path:
         print(f"❌ Error with fixed file path '{filepath_config}': {path_message}"); return
+    if can_stream and fixed_path.stat().st_size > cfg.MAX_FILE_SIZE_BYTES:
+        _perform_analysis_and_display(None, fixed_path.name, stream_filepath=fixed_path); return
     content: Optional[str] = file_io.read_file(filepath_config) 
     if content is not None: _perform_analysis_and_display(content, Path(cfg.FIXED_TARGET_FILENAME).name) # Use filename for hint
     else: print(f"❌ No content loaded from '{filepath_config}'. Returning to main menu.")
@@ -419,7 +449,7 @@ def main() -> None:
                 print("\nStop Word Options:")
                 print("• Use default English list, NLTK list for other languages, custom file, or no stop words.")
                 print("\nFor best results:")
-                print("• Keep files under 10MB")
+                print("• Keep files under 10MB (larger .txt files are streamed with a reduced set of analyses)")
                 print("• Ensure UTF-8 or compatible (iso-8859-1) encoding")
             elif choice == "5": print("\n👋 Thank you for using Text Analyzer!"); break
             else: print("❌ Invalid choice. Please enter 1-5.")
@@ -4,12 +4,12 @@ Configuration constants for the Text Analyzer application.
 
 import re
 from pathlib import Path
-from typing import Set, Dict, List # Added List
+from typing import Set, Dict, List, Optional, Tuple # Added List
 
 # =============================================================================
 # MODULE-LEVEL CONSTANTS
 # =============================================================================
-MAX_FILE_SIZE_BYTES: int = 10 * 1024 * 1024  # 10MB
+MAX_FILE_SIZE_BYTES: int = 10 * 1024 * 1024  # 10MB (larger plain text files are streamed by the CLI)
 MAX_INPUT_ATTEMPTS: int = 3
 DEFAULT_TOP_WORDS_DISPLAY: int = 10
 PREVIEW_LENGTH: int = 100
@@ -58,7 +58,7 @@ DEFAULT_DISPLAY_SHORT_WORDS_LIMIT: int = 10
 DEFAULT_UNIQUE_WORDS_SAMPLE_DISPLAY_LIMIT: int = 10 # For analyze_text_complete unique_words_sample
 
 # Constants for N-gram analysis (New for Module 4C)
-DEFAULT_NGRAM_N_VALUES: list[int] = [2, 3]  # Calculate bigrams and trigrams by default
+DEFAULT_NGRAM_N_VALUES: list[int] = [2, 3]  # Calculate bigrams and trigrams by default (sizes up to 5 are named)
 DEFAULT_NGRAM_DISPLAY_COUNT: int = 10      # Number of most common N-grams to display/store
 
 # Constants for POS Tagging and NER (New for Modules 4E, 4F, 4H)
@@ -74,6 +74,79 @@ COMMON_PATTERNS: Dict[str, str] = {
 }
 
 DEFAULT_PATTERN_MATCH_LIMIT: int = 10 # Limit the number of matches displayed for patterns
+PATTERN_CACHE_SIZE: int = 256 # Compiled regexes (common and user patterns) kept process-wide
+USER_PATTERN_TIMEOUT_SECONDS: Optional[float] = 2.0 # Time budget per user-defined regex, run in a worker process (None: run in-process without a limit)
+USER_PATTERN_IDLE_WORKERS: int = 2 # Pattern worker processes kept running between calls for reuse
+
+DEFAULT_TFIDF_TOP_TERMS: int = 10 # Terms returned per document by corpus TF-IDF
+
+SENTENCE_INDEX_CACHE_SIZE: int = 8 # Texts whose sentence index is kept for get_sentences_for_word lookups
+
+# Sentiment: 'document' scores the whole text with one VADER call; 'sentence' scores every sentence and
+# aggregates them (weighted by word count), adding sentence-level scores and a positional timeline
+SENTIMENT_MODES: Tuple[str, ...] = ('document', 'sentence')
+DEFAULT_SENTIMENT_MODE: str = 'document'
+SENTIMENT_TIMELINE_POINTS: int = 20 # Position bins (equal slices of the text) in the sentiment timeline
+
+# spaCy model profiles: the pipeline components excluded when loading the model for each profile.
+# Results only use token.pos_ (tagger + attribute_ruler) and doc.ents (ner); every profile keeps tok2vec.
+SPACY_MODEL_PROFILES: Dict[str, List[str]] = {
+    'full': [],
+    'pos_ner': ['parser', 'lemmatizer', 'senter'],
+    'pos': ['parser', 'lemmatizer', 'senter', 'ner'],
+    'ner': ['parser', 'lemmatizer', 'senter', 'tagger', 'attribute_ruler'],
+}
+
+SYLLABLE_CACHE_SIZE: int = 100000 # Distinct words whose syllable count / easy-word status readability keeps memoized
+
+# Selectable analyses for analyze_text_complete(analyses=[...]), mapped to the result section each one fills
+ANALYSIS_SECTIONS: Dict[str, str] = {
+    'word_frequencies': 'word_analysis',
+    'word_lengths': 'word_length_counts_obj',
+    'sentences': 'sentence_analysis',
+    'general_stats': 'general_stats',
+    'readability': 'readability_stats',
+    'patterns': 'interesting_patterns',
+    'ngrams': 'ngram_frequencies',
+    'sentiment': 'sentiment_analysis',
+    'pos': 'pos_analysis',
+    'ner': 'ner_analysis',
+    'keywords': 'keyword_analysis',
+}
+
+# Result members holding whole-document data, left out of compact results unless requested (analyze_text_complete(compact=True, keep=...))
+HEAVY_RESULT_MEMBERS: Tuple[str, ...] = ('original_text', 'processed_tokens', 'full_word_counts_obj')
+
+# Analyses streaming.analyze_text_stream can compute chunk by chunk (the others need the whole text)
+STREAMABLE_ANALYSES: List[str] = ['word_frequencies', 'word_lengths', 'sentences', 'general_stats', 'patterns', 'ngrams']
+# A sentence still open across streamed pieces keeps at most this many characters (its start and end); word counts stay exact
+STREAMING_OPEN_SENTENCE_MAX_CHARS: int = 10000
+
+# Approximate (Space-Saving) counting: entries kept per counter when approximation is requested
+# (the memory budget; estimates are off by at most total / capacity), and n-grams counted per batch
+DEFAULT_TOP_K_CAPACITY: int = 10000
+APPROXIMATE_COUNT_BATCH_SIZE: int = 50000
+# HyperLogLog unique word estimate used alongside approximate counting: 2**14 registers (16 KiB), ~0.8% standard error
+HYPERLOGLOG_PRECISION: int = 14
+
+# Incremental re-analysis (incremental.analyze_text_incremental): per-paragraph partial results kept process-wide
+PARAGRAPH_CACHE_SIZE: int = 4096
+
+# Result cache (result_cache.ResultCache): pickled results kept in memory, and the optional on-disk tier (None: memory only)
+RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+RESULT_CACHE_DIR: Optional[Path] = None
+RESULT_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+
+# Sharded analysis (sharded.analyze_text_sharded): characters per shard at least, unless a shard count is given
+MIN_SHARD_CHARS: int = 200000
+
+# How analyze_text_complete runs independent stages: 'sequential', 'thread' or 'process'
+DEFAULT_ANALYSIS_EXECUTOR: str = 'sequential'
+DEFAULT_ANALYSIS_MAX_WORKERS: Optional[int] = None # None lets concurrent.futures pick (based on CPU count)
+
+# analyze_texts_batch: documents per spaCy nlp.pipe batch / per process-pool task, and worker processes (1 = in this process)
+DEFAULT_BATCH_SIZE: int = 64
+DEFAULT_BATCH_N_PROCESS: int = 1
 
 # Plotting constants
 DEFAULT_PLOT_COLOR: str = 'skyblue'
@@ -84,6 +157,26 @@ SENTIMENT_PLOT_COLORS: Dict[str, str] = {
     'negative': 'lightcoral'
 }
 DEFAULT_NUM_KEYWORDS: int = 10 # Default number of keywords to extract/display
+KEYWORD_TABLES_CACHE_SIZE: int = 8 # Texts whose RAKE phrase/degree/frequency tables are kept for re-ranking
+# RAKE candidate phrases break at these words as well as the active stop words (NLTK's English list, as used by rake_nltk)
+RAKE_STOP_WORDS: Set[str] = {
+    "i", "me", "my", "myself", "we", "our", "ours", "ourselves", "you", "you're", "you've",
+    "you'll", "you'd", "your", "yours", "yourself", "yourselves", "he", "him", "his", "himself",
+    "she", "she's", "her", "hers", "herself", "it", "it's", "its", "itself", "they", "them",
+    "their", "theirs", "themselves", "what", "which", "who", "whom", "this", "that", "that'll",
+    "these", "those", "am", "is", "are", "was", "were", "be", "been", "being", "have", "has",
+    "had", "having", "do", "does", "did", "doing", "a", "an", "the", "and", "but", "if", "or",
+    "because", "as", "until", "while", "of", "at", "by", "for", "with", "about", "against",
+    "between", "into", "through", "during", "before", "after", "above", "below", "to", "from",
+    "up", "down", "in", "out", "on", "off", "over", "under", "again", "further", "then", "once",
+    "here", "there", "when", "where", "why", "how", "all", "any", "both", "each", "few", "more",
+    "most", "other", "some", "such", "no", "nor", "not", "only", "own", "same", "so", "than",
+    "too", "very", "s", "t", "can", "will", "just", "don", "don't", "should", "should've", "now",
+    "d", "ll", "m", "o", "re", "ve", "y", "ain", "aren", "aren't", "couldn", "couldn't", "didn",
+    "didn't", "doesn", "doesn't", "hadn", "hadn't", "hasn", "hasn't", "haven", "haven't", "isn",
+    "isn't", "ma", "mightn", "mightn't", "mustn", "mustn't", "needn", "needn't", "shan", "shan't",
+    "shouldn", "shouldn't", "wasn", "wasn't", "weren", "weren't", "won", "won't", "wouldn", "wouldn't"
+}
 SUPPORTED_NLTK_STOPWORD_LANGUAGES: List[str] = [
     "arabic", "azerbaijani", "basque", "bengali", "catalan", "chinese", 
     "danish", "dutch", "english", "finnish", "french", "german", "greek", 
@@ -187,7 +187,7 @@ def display_complete_analysis(analysis_results: Dict[str, Any]) -> None:
     if patterns_data: display_interesting_patterns(patterns_data)
     else: print("\nℹ️ Interesting patterns not available.")
     word_length_counts = analysis_results.get('word_length_counts_obj')
-    total_processed_tokens = len(analysis_results.get('processed_tokens', []))
+    total_processed_tokens = sum(word_length_counts.values()) if word_length_counts else 0 # Also set for streamed results, which keep no token list
     if word_length_counts and total_processed_tokens > 0:
          display_word_length_analysis(word_length_counts, total_processed_tokens)
     else: print("\nℹ️ Word length analysis data not available.")
@@ -292,6 +292,10 @@ def display_sentiment_analysis(sentiment_scores: Dict[str, float]) -> None:
     else: overall_sentiment = "Neutral"
     print(f"\n  Overall Sentiment: {overall_sentiment}")
     print("  (Interpretation based on VADER's compound score thresholds)")
+    timeline = sentiment_scores.get('timeline')
+    if timeline and timeline.get('compound'):
+        print(f"\n  Averaged over {sentiment_scores.get('sentence_count', 0)} sentences. Compound score from start to end of the text:")
+        print("  " + " ".join(f"{value:+.2f}" if value is not None else "  -- " for value in timeline['compound']))
 
 # =============================================================================
 # N-GRAM DISPLAY FUNCTIONS (New for Module 4C)
@@ -306,6 +310,54 @@ def display_ngram_frequencies(ngram_data: Dict[str, List[Tuple[str, int]]]) -> N
                 print(f"  {i:2d}. '{ngram}' - {count} times")
         else: print(f"No {ngram_type.lower()} found.")
 
+# =============================================================================
+# PIPELINE DIAGNOSTICS AND APPROXIMATION DISPLAY FUNCTIONS
+# =============================================================================
+def format_diagnostics_lines(diagnostics: Dict[str, Any]) -> List[str]:
+    """
+    Formats the `_diagnostics` section of analysis results as text lines,
+    slowest stage first. Shared by the CLI, GUI and web output.
+    """
+    stages: Dict[str, Dict[str, Any]] = diagnostics.get('stages', {})
+    total_seconds: float = diagnostics.get('total_seconds', 0.0)
+    lines: List[str] = [f"Total pipeline time: {total_seconds:.4f} s"]
+    for stage_name, stats in sorted(stages.items(), key=lambda item: item[1].get('seconds', 0.0), reverse=True):
+        seconds: float = stats.get('seconds', 0.0)
+        share: float = (seconds / total_seconds * 100) if total_seconds > 0 else 0.0
+        line = f"  {stage_name:<18} {seconds:9.4f} s ({share:5.1f}%)"
+        if stats.get('peak_memory_bytes') is not None:
+            line += f"  peak {stats['peak_memory_bytes'] / 1024:,.1f} KiB"
+        lines.append(line)
+    return lines
+
+def display_diagnostics(diagnostics: Dict[str, Any]) -> None:
+    print_section("⏱️ Pipeline Stage Diagnostics")
+    if not diagnostics or not diagnostics.get('stages'):
+        print("No stage diagnostics recorded.")
+        return
+    for line in format_diagnostics_lines(diagnostics):
+        print(line)
+
+def format_approximation_lines(approximation: Dict[str, Any]) -> List[str]:
+    """Formats the `_approximation` section (Space-Saving error reports) as text lines."""
+    reports: List[Tuple[str, Dict[str, Any]]] = []
+    if approximation.get('word_frequencies'):
+        reports.append(("words", approximation['word_frequencies']))
+    reports.extend(approximation.get('ngram_frequencies', {}).items())
+    lines: List[str] = []
+    for name, report in reports:
+        accuracy = "exact" if report.get('exact') else f"counts may be over by up to {report.get('max_error', 0)} (bound {report.get('error_bound', 0)})"
+        lines.append(f"  {name:<10} {report.get('tracked', 0):,}/{report.get('capacity', 0):,} tracked of {report.get('total', 0):,}: {accuracy}")
+    unique_words: Dict[str, Any] = approximation.get('unique_words', {})
+    if unique_words:
+        lines.append(f"  unique words ≈ {unique_words.get('estimate', 0):,} (±{unique_words.get('relative_error', 0.0) * 100:.1f}%, HyperLogLog)")
+    return lines
+
+def display_approximation(approximation: Dict[str, Any]) -> None:
+    print_section("≈ Approximate Frequency Counts")
+    for line in format_approximation_lines(approximation) or ["No approximate counters used."]:
+        print(line)
+
 def display_summary(analysis_results: Dict[str, Any]) -> None:
     if 'error' in analysis_results and analysis_results['error']: print(f"❌ Error: {analysis_results['error']}"); return
     general: Dict[str, Any] = analysis_results.get('general_stats', {})
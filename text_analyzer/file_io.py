@@ -8,9 +8,11 @@ import json
 from pathlib import Path
 from typing import Union, Tuple, List, Any, Set, Optional # Added Optional
 from collections import Counter
+from collections.abc import Mapping
 
 from . import config as cfg
 from .text_processing import correct_text_typos # Keep this if used by read_file or other functions
+from .token_store import TokenStore
 from typing import Dict, Generator # Ensure Dict and Generator are imported if not already
 
 # Added json and csv if they are not already present from previous steps
@@ -214,6 +216,10 @@ def _save_results_to_json(analysis_results: Dict[str, Any], filepath: Path) -> N
         # Add other type checks if needed, e.g., for Path objects if they creep in
         if isinstance(obj, Path):
             return str(obj)
+        if isinstance(obj, TokenStore):
+            return list(obj)
+        if isinstance(obj, Mapping): # e.g. a lazy analysis.AnalysisResult
+            return obj.to_dict() if hasattr(obj, 'to_dict') else dict(obj)
         raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
     try:
@@ -351,7 +357,8 @@ def save_analysis_results(analysis_results: Dict[str, Any], output_filename_str:
 def read_file_in_chunks(filepath: Union[str, Path], chunk_size_bytes: int = 1024 * 1024) -> Generator[str, None, None]:
     """
     Reads a file in chunks (binary mode) and yields decoded string chunks.
-    Default chunk size is 1MB.
+    Default chunk size is 1MB. UTF-8 characters split across two chunks are
+    carried over and decoded whole.
 
     Args:
         filepath (Union[str, Path]): The path to the file.
@@ -373,14 +380,24 @@ def read_file_in_chunks(filepath: Union[str, Path], chunk_size_bytes: int = 1024
             raise IsADirectoryError(f"Path '{filepath}' is a directory, not a file.")
 
         with open(file_to_read, 'rb') as file: # Read in binary mode
+            pending_bytes: bytes = b'' # Start of a multi-byte UTF-8 character cut off at the end of the previous chunk
             while True:
                 chunk_bytes = file.read(chunk_size_bytes)
                 if not chunk_bytes:
+                    if pending_bytes:
+                        yield pending_bytes.decode('iso-8859-1') # Truncated character at end of file
                     break
+                chunk_bytes = pending_bytes + chunk_bytes
+                pending_bytes = b''
                 try:
                     # Attempt to decode using UTF-8 first, then fallback to ISO-8859-1
                     yield chunk_bytes.decode('utf-8')
-                except UnicodeDecodeError:
+                except UnicodeDecodeError as ude:
+                    if ude.reason == 'unexpected end of data' and len(chunk_bytes) - ude.start < 4:
+                        # Only the last character is incomplete: decode the rest, finish it with the next chunk
+                        pending_bytes = chunk_bytes[ude.start:]
+                        yield chunk_bytes[:ude.start].decode('utf-8')
+                        continue
                     try:
                         yield chunk_bytes.decode('iso-8859-1')
                     except UnicodeDecodeError as ude:
@@ -404,8 +421,8 @@ def read_file_in_chunks(filepath: Union[str, Path], chunk_size_bytes: int = 1024
         print(f"❌ Unexpected error reading file '{filepath}' in chunks: {type(e).__name__} - {e}")
         raise
 
-def validate_file_path(filename: Union[str, Path]) -> Tuple[bool, str]:
-    """Validate that a file path is safe and accessible."""
+def validate_file_path(filename: Union[str, Path], max_size_bytes: Optional[int] = cfg.MAX_FILE_SIZE_BYTES) -> Tuple[bool, str]:
+    """Validate that a file path is safe and accessible. `max_size_bytes=None` skips the size check (e.g. for streamed files)."""
     try:
         file_path: Path = Path(filename).resolve()
         
@@ -420,13 +437,13 @@ def validate_file_path(filename: Union[str, Path]) -> Tuple[bool, str]:
         # We can add a parameter to skip size check if needed for specific use cases.
         # For now, applying to all.
         file_size: int = file_path.stat().st_size
-        if file_size > cfg.MAX_FILE_SIZE_BYTES: # General max file size
+        if max_size_bytes is not None and file_size > max_size_bytes: # General max file size
             # Specific check for stop word files if we want a smaller limit for them
             # if filename.suffix.lower() == '.txt' and "stopwords" in filename.name.lower():
             #     if file_size > SOME_SMALLER_LIMIT_FOR_STOPWORDS:
             #         return False, "Stop word file too large"
             # else: (the general check)
-            return False, f"File too large ({file_size} bytes). Maximum: {cfg.MAX_FILE_SIZE_BYTES} bytes"
+            return False, f"File too large ({file_size} bytes). Maximum: {max_size_bytes} bytes"
         
         return True, "File validation passed"
         
@@ -6,6 +6,9 @@ from collections import Counter # For type hinting and potentially direct use
 # Import from the text_analyzer package
 from . import text_processing as tp
 from . import analysis
+from . import incremental
+from . import result_cache
+from . import stop_words
 from . import display # Added for word cloud
 from . import config as cfg # To access STOP_WORDS, default values etc.
 from pathlib import Path # For Path objects
@@ -181,13 +184,17 @@ class TextAnalyzerGUI:
             # Call the main analysis function from analysis.py
             # This function bundles many individual analysis steps.
             # Determine the actual set of stop words to use
-            active_stop_words_set = cfg.STOP_WORDS if remove_stopwords_flag else set()
+            # (registry lists are keyed by their ID in the result cache)
+            stop_word_list_id = stop_words.DEFAULT_ID if remove_stopwords_flag else stop_words.NONE_ID
+            active_stop_words_set = stop_words.get_stop_words(stop_word_list_id)[0].words
 
-            self.analysis_results_store = analysis.analyze_text_complete( # Store results
+            # Incremental: re-analyzing after an edit only recomputes the paragraphs that changed
+            self.analysis_results_store = incremental.analyze_text_incremental( # Store results
                 text=current_text_to_analyze,
                 active_stop_words=active_stop_words_set, # Pass actual stop words
                 num_common_words_to_display=top_n,
-                user_patterns=None # Or implement UI for this
+                user_patterns=None, # Or implement UI for this
+                cache=result_cache.get_default_cache()
             )
 
             if self.analysis_results_store.get('error'):
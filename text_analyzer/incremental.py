@@ -0,0 +1,326 @@
+"""
+Incremental re-analysis for the Text Analyzer application.
+
+After a small edit (one paragraph changed in the GUI or the web form), analyzing the text
+again should not redo the whole document. `analyze_text_incremental` cuts the text into
+paragraphs and analyzes each one on its own into a `ParagraphPartial`: a
+`streaming.StreamingAnalysis` for the streamable sections, plus the paragraph's
+sentence-cleaned text, VADER sentence scores, RAKE tables and spaCy POS/NER results as the
+selected analyses need. Partials are cached process-wide, keyed by a digest of the paragraph
+and the analysis settings, so a re-analysis only computes the paragraphs that changed and
+merges all partials again.
+
+Word frequencies, word lengths, sentences, general stats, patterns and n-grams are merged
+exactly (see `StreamingAnalysis.merge`) and equal analyze_text_complete's. A paragraph that
+does not end a sentence (a heading, a list item) is kept with the next one, so no sentence
+spans two partials and sentence-mode sentiment and keywords merge exactly too. Readability,
+document-mode sentiment and POS/NER (spaCy tags with the context of the whole text) need the
+whole text at once, and user-defined regexes are scanned in one time-bounded worker; these
+are recomputed on every call.
+"""
+
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from . import analysis
+from . import config as cfg
+from . import text_processing as tp
+from .keywords import RakeTables, build_rake_tables, merge_rake_tables, rank_keywords
+from .result_cache import ResultCache, analysis_key
+from .sentence_index import SentenceTable, text_digest
+from .streaming import StreamingAnalysis
+
+PARAGRAPH_BREAK_REGEX: re.Pattern = re.compile(r'\n\s*\n\s*') # A blank line and the whitespace up to the next paragraph
+SENTENCE_TERMINATORS: Tuple[str, ...] = ('.', '!', '?') # As split by sentence_index.SentenceTable
+
+# Result sections computed by the streaming accumulators
+STREAMED_SECTIONS: List[str] = analysis.resolve_analyses(cfg.STREAMABLE_ANALYSES)
+
+# =============================================================================
+# PARAGRAPH SPLITTING
+# =============================================================================
+
+def split_paragraphs(text: str) -> List[str]:
+    """
+    Cuts `text` after every blank line that follows the end of a sentence; a paragraph without
+    closing punctuation stays with the next one. Each piece keeps the whitespace that follows
+    it, so the next piece starts at a token and ''.join(pieces) == text.
+    """
+    pieces: List[str] = []
+    start: int = 0
+    for match in PARAGRAPH_BREAK_REGEX.finditer(text):
+        if match.end() < len(text) and text[start:match.start()].rstrip().endswith(SENTENCE_TERMINATORS):
+            pieces.append(text[start:match.end()])
+            start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+# =============================================================================
+# PER-PARAGRAPH PARTIAL RESULTS
+# =============================================================================
+
+class IncrementalSettings(NamedTuple):
+    """The analysis settings a paragraph's partial depends on (part of its cache key)."""
+    active_stop_words: FrozenSet[str]
+    sections: Tuple[str, ...]
+    sentiment_mode: str
+    spacy_profile: Optional[str] # None when neither POS nor NER is selected
+
+    @classmethod
+    def for_run(cls, active_stop_words: Optional[Set[str]], sections: List[str], sentiment_mode: str) -> 'IncrementalSettings':
+        """Settings of a run over `sections`, with the spaCy profile its POS/NER sections need."""
+        spacy_stages: List[str] = [stage for stage, section in (('pos', 'pos_analysis'), ('ner', 'ner_analysis')) if section in sections]
+        spacy_profile: Optional[str] = analysis.select_spacy_profile(spacy_stages) if spacy_stages else None
+        return cls(frozenset(active_stop_words or ()), tuple(sections), sentiment_mode, spacy_profile)
+
+
+class ParagraphPartial:
+    """Everything analyze_text_incremental needs from one paragraph; merged with the others' on every call."""
+    __slots__ = ('stream', 'sentence_text', 'sentence_starts', 'sentence_scores', 'sentence_weights',
+                 'rake_tables', 'pos_analysis', 'ner_analysis')
+
+    def __init__(self) -> None:
+        self.stream: Optional[StreamingAnalysis] = None
+        self.sentence_text: str = ''
+        self.sentence_starts: Optional[np.ndarray] = None  # Sentence offsets in sentence_text
+        self.sentence_scores: Optional[np.ndarray] = None  # (n, 4) VADER scores of the sentences
+        self.sentence_weights: Optional[np.ndarray] = None # Word counts of the sentences
+        self.rake_tables: Optional[RakeTables] = None
+        self.pos_analysis: Optional[Dict[str, Any]] = None
+        self.ner_analysis: Optional[Dict[str, Any]] = None
+
+
+def analyze_paragraph(paragraph: str, settings: IncrementalSettings, nlp: Optional[Any] = None) -> ParagraphPartial:
+    """The partial results of one paragraph for `settings`; `nlp` is the spaCy model for POS/NER (if available)."""
+    partial = ParagraphPartial()
+    wanted: Set[str] = set(settings.sections)
+    if 'readability_stats' in wanted:
+        wanted |= {'word_analysis', 'sentence_analysis'} # Readability reads the word counts and sentence statistics
+    stream_sections: List[str] = [section for section in STREAMED_SECTIONS if section in wanted]
+    if stream_sections:
+        partial.stream = StreamingAnalysis(active_stop_words=set(settings.active_stop_words), sections=stream_sections)
+        partial.stream.update(paragraph)
+
+    partial.sentence_text = tp.preprocess_text_for_sentence_analysis(paragraph)
+    if not partial.sentence_text.strip() or not wanted & {'sentiment_analysis', 'keyword_analysis', 'pos_analysis', 'ner_analysis'}:
+        return partial
+    sentence_table = SentenceTable(partial.sentence_text)
+    if 'sentiment_analysis' in wanted and settings.sentiment_mode == 'sentence' and sentence_table and analysis._vader_analyzer is not None:
+        partial.sentence_starts = np.asarray(sentence_table.starts, dtype=np.int64)
+        partial.sentence_scores = analysis.score_table_sentences(partial.sentence_text, sentence_table)
+        partial.sentence_weights = np.asarray(sentence_table.word_counts, dtype=float)
+    if 'keyword_analysis' in wanted:
+        partial.rake_tables = build_rake_tables(partial.sentence_text, sentence_table, settings.active_stop_words)
+    if nlp is not None and wanted & {'pos_analysis', 'ner_analysis'}:
+        spacy_doc, spacy_error = None, None
+        try:
+            spacy_doc = nlp(partial.sentence_text)
+        except Exception as e:
+            spacy_error = f"spaCy processing failed: {type(e).__name__} - {str(e)}"
+        if 'pos_analysis' in wanted:
+            partial.pos_analysis = analysis._stage_pos(partial.sentence_text, spacy_doc, spacy_error)['pos_analysis']
+        if 'ner_analysis' in wanted:
+            partial.ner_analysis = analysis._stage_ner(partial.sentence_text, spacy_doc, spacy_error)['ner_analysis']
+    return partial
+
+# =============================================================================
+# PARTIAL CACHE
+# =============================================================================
+
+# Partials of recently analyzed paragraphs keyed by (paragraph digest, settings) (least recently used evicted first)
+_paragraph_cache: "OrderedDict[Tuple[bytes, IncrementalSettings], ParagraphPartial]" = OrderedDict()
+_paragraph_cache_lock = threading.Lock() # The GUI and web requests analyze from several threads
+
+def get_paragraph_partial(paragraph: str, settings: IncrementalSettings, nlp: Optional[Any] = None,
+                          cache_size: Optional[int] = None) -> ParagraphPartial:
+    """Returns the partial of `paragraph` for `settings`, analyzing and caching it on first use."""
+    key = (text_digest(paragraph), settings)
+    with _paragraph_cache_lock:
+        partial = _paragraph_cache.get(key)
+        if partial is not None:
+            _paragraph_cache.move_to_end(key)
+            return partial
+    partial = analyze_paragraph(paragraph, settings, nlp) # Analyzed outside the lock
+    limit: int = cfg.PARAGRAPH_CACHE_SIZE if cache_size is None else cache_size
+    with _paragraph_cache_lock:
+        partial = _paragraph_cache.setdefault(key, partial)
+        _paragraph_cache.move_to_end(key)
+        while len(_paragraph_cache) > max(limit, 0):
+            _paragraph_cache.popitem(last=False)
+    return partial
+
+# =============================================================================
+# MERGING
+# =============================================================================
+
+def _merge_sentence_sentiment(partials: List[ParagraphPartial], sentence_text: str) -> Dict[str, Any]:
+    """Sentence-mode sentiment of the joined sentence texts of `partials` from their sentence scores."""
+    starts: List[np.ndarray] = []
+    scores: List[np.ndarray] = []
+    weights: List[np.ndarray] = []
+    offset: int = 0 # Position of each paragraph's sentence text in `sentence_text`
+    for partial in partials:
+        if not partial.sentence_text:
+            continue
+        if partial.sentence_scores is not None:
+            starts.append(partial.sentence_starts + offset)
+            scores.append(partial.sentence_scores)
+            weights.append(partial.sentence_weights)
+        offset += len(partial.sentence_text) + 1
+    if not scores: # No VADER, no text or no sentences: reported as analyze_sentiment_by_sentence does
+        return analysis.analyze_sentiment_by_sentence(sentence_text)
+    return analysis.summarize_sentence_sentiment(np.concatenate(starts), np.concatenate(scores), np.concatenate(weights), len(sentence_text))
+
+
+def _merge_pos(pos_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    pos_counts: Counter[str] = Counter()
+    for pos_result in pos_results:
+        pos_counts.update(pos_result['pos_counts'])
+    total_pos_tags: int = sum(pos_result['total_pos_tags'] for pos_result in pos_results)
+    return {'pos_counts': pos_counts, 'most_common_pos': pos_counts.most_common(cfg.DEFAULT_POS_DISPLAY_COUNT), 'total_pos_tags': total_pos_tags,
+            'error': None, 'lexical_density': analysis.calculate_lexical_density(pos_counts, total_pos_tags)}
+
+
+def _merge_ner(ner_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    entity_type_counts: Counter[str] = Counter()
+    entities_by_type: Dict[str, Set[str]] = defaultdict(set)
+    for ner_result in ner_results:
+        entity_type_counts.update(ner_result['entity_counts_by_type'])
+        for label, entity_texts in ner_result['entities_by_type'].items():
+            entities_by_type[label].update(entity_texts)
+    if not entity_type_counts:
+        return analysis._empty_results()['ner_analysis']
+    return {'entity_counts_by_type': entity_type_counts, 'entities_by_type': {label: sorted(texts) for label, texts in entities_by_type.items()},
+            'total_entities': sum(entity_type_counts.values()), 'most_common_entity_types': entity_type_counts.most_common(cfg.DEFAULT_NER_DISPLAY_COUNT), 'error': None}
+
+
+def _merge_spacy_section(paragraph_results: List[Optional[Dict[str, Any]]], merge: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+                         fallback: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merges the POS or NER results of the paragraphs that have one without an error (e.g. a paragraph
+    of punctuation only has no POS tags). If none has, the first error is reported; without any spaCy
+    output (not tagged per paragraph, model unavailable, no text) `fallback` computes the section
+    from the whole text, like the pipeline stage.
+    """
+    paragraph_results = [result for result in paragraph_results if result is not None]
+    valid_results = [result for result in paragraph_results if not result.get('error')]
+    if valid_results:
+        return merge(valid_results)
+    return paragraph_results[0] if paragraph_results else fallback()
+
+# =============================================================================
+# INCREMENTAL ENTRY POINT
+# =============================================================================
+
+def analyze_text_incremental(
+    text: Optional[str],
+    active_stop_words: Optional[Set[str]] = None,
+    num_common_words_to_display: int = cfg.DEFAULT_TOP_WORDS_DISPLAY,
+    user_patterns: Optional[List[Dict[str, str]]] = None,
+    analyses: Optional[List[str]] = None,
+    sentiment_mode: str = cfg.DEFAULT_SENTIMENT_MODE,
+    cache_size: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+    compact: bool = False,
+    keep: Iterable[str] = ()
+) -> Mapping[str, Any]:
+    """
+    Incremental counterpart of `analysis.analyze_text_complete`, for texts analyzed again after
+    small edits: only paragraphs not seen before (with the same stop words, analyses and
+    sentiment mode) are analyzed, and the cached partials of the others are merged in.
+    Returns a result dict equal to analyze_text_complete's except that 'processed_tokens' is
+    empty, as no token list of the whole text is built. `cache_size` overrides
+    cfg.PARAGRAPH_CACHE_SIZE. With a result `cache`, resubmitting an unchanged text returns the
+    stored result without merging again. `compact`/`keep` work as in analyze_text_complete.
+    """
+    keep = tuple(keep)
+    def failed(error: str) -> Mapping[str, Any]:
+        results = {**analysis._empty_results(), 'error': error}
+        return analysis.CompactAnalysisResult.from_results(results, text or '') if compact else results
+
+    if compact:
+        unknown = [member for member in keep if member not in cfg.HEAVY_RESULT_MEMBERS]
+        if unknown:
+            return failed(f"Unknown result member: {', '.join(unknown)}. Available: {', '.join(cfg.HEAVY_RESULT_MEMBERS)}")
+        if text and cache is not None:
+            analysis.remember_text(text, cache)
+    if not text:
+        return failed('No text provided for analysis')
+
+    try:
+        sections: List[str] = analysis.resolve_analyses(analyses)
+    except ValueError as e:
+        return failed(str(e))
+
+    cache_key: Optional[str] = None
+    if cache is not None:
+        cache_key = analysis_key(text, sections, active_stop_words, num_common_words_to_display, user_patterns, None, sentiment_mode,
+                                 method=analysis.compact_method('incremental', keep) if compact else 'incremental')
+        cached_results: Optional[Mapping[str, Any]] = cache.get(cache_key)
+        if cached_results is not None:
+            if compact:
+                cached_results.original_text = text if 'original_text' in keep else None
+            else:
+                cached_results['original_text'] = text
+            return cached_results
+
+    try:
+        settings = IncrementalSettings.for_run(active_stop_words, sections, sentiment_mode)
+        # No spaCy model for the paragraphs: merge_partials tags the whole text, as a full run does
+        partials: List[ParagraphPartial] = [get_paragraph_partial(paragraph, settings, None, cache_size) for paragraph in split_paragraphs(text)]
+        results: Mapping[str, Any] = merge_partials(partials, text, settings, num_common_words_to_display, user_patterns)
+        if compact:
+            results = analysis.CompactAnalysisResult.from_results(results, text, keep)
+        if cache_key is not None:
+            cache.put(cache_key, analysis._without_text(results)) # The text is the key
+    except Exception as e:
+        return failed(f'Analysis failed: {type(e).__name__} - {str(e)}')
+    return results
+
+
+def merge_partials(partials: List[ParagraphPartial], text: str, settings: IncrementalSettings,
+                    num_common_words_to_display: int, user_patterns: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+    """
+    Builds the result dict of `text` from the partials of consecutive spans of it (in order).
+    POS/NER are merged from the partials that have spaCy output (see analyze_paragraph's `nlp`);
+    without any, the whole text is tagged here.
+    """
+    sections: Tuple[str, ...] = settings.sections
+    results: Dict[str, Any] = analysis._empty_results()
+    sentence_text: str = tp.preprocess_text_for_sentence_analysis(text)
+
+    streamed: Optional[StreamingAnalysis] = None
+    stream_partials: List[StreamingAnalysis] = [partial.stream for partial in partials if partial.stream is not None]
+    if stream_partials:
+        streamed = StreamingAnalysis(active_stop_words=set(settings.active_stop_words), sections=stream_partials[0].sections)
+        for stream_partial in stream_partials:
+            streamed.merge(stream_partial)
+        results.update({section: value for section, value in streamed.results(num_common_words_to_display).items() if section in sections})
+        if results['interesting_patterns'] and user_patterns:
+            results['interesting_patterns']['user_defined_pattern_results'] = analysis.find_user_defined_patterns(text, user_patterns)[0]
+
+    if 'readability_stats' in sections:
+        results['readability_stats'] = analysis._stage_readability(sentence_text, streamed.word_counts, streamed.sentences.result())['readability_stats']
+    if 'sentiment_analysis' in sections:
+        if settings.sentiment_mode == 'sentence':
+            results['sentiment_analysis'] = _merge_sentence_sentiment(partials, sentence_text)
+        else:
+            results['sentiment_analysis'] = analysis._stage_sentiment(sentence_text, None, settings.sentiment_mode)['sentiment_analysis']
+    if 'keyword_analysis' in sections:
+        results['keyword_analysis'] = rank_keywords(merge_rake_tables(partial.rake_tables for partial in partials if partial.rake_tables is not None), cfg.DEFAULT_NUM_KEYWORDS)
+    spacy_values: Dict[str, Any] = {'spacy_doc': None, 'spacy_error': None}
+    if settings.spacy_profile and all(partial.pos_analysis is None and partial.ner_analysis is None for partial in partials):
+        spacy_values = analysis._stage_spacy_doc(sentence_text, settings.spacy_profile) # One parse of the whole text
+    if 'pos_analysis' in sections:
+        results['pos_analysis'] = _merge_spacy_section([partial.pos_analysis for partial in partials], _merge_pos,
+                                                       lambda: analysis._stage_pos(sentence_text, **spacy_values)['pos_analysis'])
+    if 'ner_analysis' in sections:
+        results['ner_analysis'] = _merge_spacy_section([partial.ner_analysis for partial in partials], _merge_ner,
+                                                       lambda: analysis._stage_ner(sentence_text, **spacy_values)['ner_analysis'])
+    results['original_text'] = text
+    return results
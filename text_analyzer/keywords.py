@@ -0,0 +1,126 @@
+"""
+RAKE keyword extraction for the Text Analyzer application.
+
+A native implementation of RAKE (Rapid Automatic Keyword Extraction) that works on the
+pipeline's `SentenceTable` and the caller's active stop words instead of re-tokenizing
+the text with NLTK. Sentences are cut at punctuation between words (apostrophes and hyphens
+inside a word do not cut it) and every fragment is tokenized like the pipeline's 'tokens'
+stage (`tp.clean_text_for_word_tokenization` + `tp.tokenize_text`), so "don't e-mail" gives
+the words dont / email. Candidate phrases are maximal runs of those words not interrupted by
+a stop word (the active ones plus cfg.RAKE_STOP_WORDS) or punctuation; a word scores
+degree / frequency and a phrase the sum of its word scores, as in rake_nltk.
+
+The phrase, frequency and degree tables of recently analyzed texts are cached, so asking
+for a different number of keywords (or re-analyzing the same text) only re-ranks them.
+"""
+
+import hashlib
+import heapq
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from . import config as cfg
+from . import text_processing as tp
+from .sentence_index import SentenceTable
+
+# Runs of punctuation that end a phrase: anything but an apostrophe or hyphen joining two word characters
+PHRASE_DELIMITER_PATTERN = re.compile(r"(?:(?!\b['’-]\b)[^\w\s])+")
+
+# cfg.RAKE_STOP_WORDS as the pipeline tokenizes them ("don't" -> "dont")
+RAKE_STOP_WORDS: frozenset = frozenset(word for entry in cfg.RAKE_STOP_WORDS for word in tp.tokenize_text(tp.clean_text_for_word_tokenization(entry)))
+
+# =============================================================================
+# PHRASE, FREQUENCY AND DEGREE TABLES
+# =============================================================================
+
+class RakeTables(NamedTuple):
+    phrase_counts: Counter # Candidate phrase (tuple of words) -> occurrences
+    frequency: Counter     # Word -> occurrences in candidate phrases
+    degree: Counter        # Word -> co-occurrences with the words of its phrases (itself included)
+
+
+def rake_stop_words(stop_words: Optional[Iterable[str]] = None) -> frozenset:
+    """The words RAKE phrases break at: `stop_words` (the active stop words, if any) plus RAKE_STOP_WORDS."""
+    return RAKE_STOP_WORDS.union(stop_words) if stop_words else RAKE_STOP_WORDS
+
+
+def build_rake_tables(text: str, sentence_table: Optional[SentenceTable] = None,
+                      stop_words: Optional[Iterable[str]] = None) -> RakeTables:
+    """
+    Splits the sentences of `text` into candidate phrases at stop words (`rake_stop_words`)
+    and punctuation and counts them. `sentence_table` must segment `text` (it is built if not given).
+    """
+    if sentence_table is None:
+        sentence_table = SentenceTable(text)
+    stop_word_set: frozenset = rake_stop_words(stop_words)
+
+    phrase_counts: Counter = Counter()
+    for start, end in zip(sentence_table.starts, sentence_table.ends):
+        for fragment in PHRASE_DELIMITER_PATTERN.split(text[start:end]):
+            phrase: List[str] = []
+            for word in tp.tokenize_text(tp.clean_text_for_word_tokenization(fragment)):
+                if word in stop_word_set:
+                    if phrase:
+                        phrase_counts[tuple(phrase)] += 1
+                        phrase = []
+                else:
+                    phrase.append(word)
+            if phrase:
+                phrase_counts[tuple(phrase)] += 1
+
+    # Every word of a phrase co-occurs with all len(phrase) words of it (itself included),
+    # so its degree grows by len(phrase) per occurrence
+    frequency: Counter = Counter()
+    degree: Counter = Counter()
+    for phrase_words, occurrences in phrase_counts.items():
+        for word in phrase_words:
+            frequency[word] += occurrences
+            degree[word] += occurrences * len(phrase_words)
+    return RakeTables(phrase_counts, frequency, degree)
+
+
+def merge_rake_tables(tables: Iterable[RakeTables]) -> RakeTables:
+    """The tables of the concatenated texts of `tables` (all three counts are additive, as phrases never span two texts)."""
+    merged = RakeTables(Counter(), Counter(), Counter())
+    for part in tables:
+        merged.phrase_counts.update(part.phrase_counts)
+        merged.frequency.update(part.frequency)
+        merged.degree.update(part.degree)
+    return merged
+
+
+def rank_keywords(tables: RakeTables, num_keywords: int = cfg.DEFAULT_NUM_KEYWORDS) -> List[Tuple[str, float]]:
+    """The `num_keywords` best distinct phrases as (phrase, score), highest score first (ties: reverse alphabetical, as rake_nltk)."""
+    if num_keywords <= 0 or not tables.phrase_counts:
+        return []
+    word_scores = {word: tables.degree[word] / occurrences for word, occurrences in tables.frequency.items()}
+    scored = ((sum(word_scores[word] for word in phrase_words), ' '.join(phrase_words)) for phrase_words in tables.phrase_counts)
+    return [(phrase, score) for score, phrase in heapq.nlargest(num_keywords, scored)]
+
+# =============================================================================
+# TABLE CACHE
+# =============================================================================
+
+# Tables of recently analyzed texts keyed by digests of the text and the stop words (least recently used evicted first)
+_tables_cache: "OrderedDict[Tuple[bytes, frozenset], RakeTables]" = OrderedDict()
+_tables_cache_lock = threading.Lock() # Stages and web requests share the cache across threads
+
+def get_rake_tables(text: str, sentence_table: Optional[SentenceTable] = None,
+                    stop_words: Optional[Iterable[str]] = None, cache_size: Optional[int] = None) -> RakeTables:
+    """Returns the RAKE tables of `text` for `stop_words`, building and caching them on first use."""
+    key = (hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest(), rake_stop_words(stop_words))
+    with _tables_cache_lock:
+        tables = _tables_cache.get(key)
+        if tables is not None:
+            _tables_cache.move_to_end(key)
+            return tables
+    tables = build_rake_tables(text, sentence_table, key[1]) # Built outside the lock
+    limit: int = cfg.KEYWORD_TABLES_CACHE_SIZE if cache_size is None else cache_size
+    with _tables_cache_lock:
+        tables = _tables_cache.setdefault(key, tables)
+        _tables_cache.move_to_end(key)
+        while len(_tables_cache) > max(limit, 0):
+            _tables_cache.popitem(last=False)
+    return tables
@@ -0,0 +1,50 @@
+"""
+Exact n-gram counting on integer token IDs for the Text Analyzer application.
+
+Tokens are interned to dense integer IDs once (a TokenStore already holds them). The
+n-grams of each size are then keyed by rolling the window one token further: an n-gram's
+key packs the dense ID of its leading (n-1)-gram with the ID of its last token into one
+int64, and the distinct keys are renumbered densely for the next size. No n-gram tuples or joined strings are built
+for the whole text; only the top n-grams of each size are turned back into strings.
+
+Ties are ordered by first occurrence, so results equal
+Counter(" ".join(ngram) for ngram in ngrams).most_common(top_n).
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .token_store import TokenStore, intern_tokens
+
+# =============================================================================
+# COUNTING
+# =============================================================================
+
+def count_top_ngrams(tokens: Sequence[str], n_values: Iterable[int], top_n: int) -> Dict[int, List[Tuple[str, int]]]:
+    """
+    The `top_n` most frequent n-grams (space-joined) of `tokens` for each n in `n_values`,
+    with their counts, most frequent first. Sizes with no n-grams (n <= 0 or longer than
+    the text) are left out. A TokenStore is counted on its existing IDs.
+    """
+    wanted = sorted({n for n in n_values if 0 < n <= len(tokens)})
+    if not wanted:
+        return {}
+    if isinstance(tokens, TokenStore):
+        token_ids, vocabulary_size = tokens.token_ids.astype(np.int64), len(tokens.vocabulary)
+    else:
+        token_ids, vocabulary = intern_tokens(tokens)
+        token_ids, vocabulary_size = token_ids.astype(np.int64), len(vocabulary)
+    top_ngrams: Dict[int, List[Tuple[str, int]]] = {}
+    gram_ids: np.ndarray = token_ids # Dense IDs of the current size's n-grams, by start position
+    for n in range(1, wanted[-1] + 1):
+        if n == 1:
+            keys: np.ndarray = token_ids
+        else:
+            # (n-1)-gram ID * vocabulary size + last token ID: unique per n-gram and below len(tokens) * vocabulary size
+            keys = gram_ids[:len(tokens) - n + 1] * vocabulary_size + token_ids[n - 1:]
+        _, first_positions, gram_ids, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+        if n in wanted:
+            ranking = np.lexsort((first_positions, -counts))[:max(top_n, 0)]
+            top_ngrams[n] = [(" ".join(tokens[first_positions[i]:first_positions[i] + n]), int(counts[i])) for i in ranking]
+    return {n: top_ngrams[n] for n in n_values if n in top_ngrams}
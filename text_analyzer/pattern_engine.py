@@ -0,0 +1,248 @@
+"""
+Regex pattern matching for the Text Analyzer application.
+
+Compiled patterns are shared process-wide through an LRU cache, so `cfg.COMMON_PATTERNS`
+and recurring user regexes are compiled once rather than on every analysis. Each pattern
+is scanned lazily with `finditer` and stops once its match limit is reached; with
+`count_matches`, the same pass goes on counting the remaining matches without keeping them.
+
+Patterns are scanned one after another rather than as a single named-group alternation:
+an alternation reports at most one pattern per position and consumes the text it matched,
+so overlapping matches of different patterns (and user regexes with backreferences or
+their own groups) would give different results than searching for each pattern alone.
+
+User-defined regexes can backtrack catastrophically, so `match_user_patterns` runs them in
+a worker process with a time budget per pattern (`cfg.USER_PATTERN_TIMEOUT_SECONDS`): a
+pattern that overruns it is reported as {'error': 'timeout'}, its worker is killed, and the
+remaining patterns continue in a fresh worker. Workers are long-lived: after a call they are
+kept idle (up to `cfg.USER_PATTERN_IDLE_WORKERS`) and reused, so streaming a file chunk by
+chunk or serving many requests does not start a process per call.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import config as cfg
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+@lru_cache(maxsize=cfg.PATTERN_CACHE_SIZE)
+def compile_pattern(regex_str: str) -> 're.Pattern[str]':
+    """The compiled form of `regex_str`, cached process-wide (raises re.error if invalid)."""
+    return re.compile(regex_str)
+
+# =============================================================================
+# MATCHING
+# =============================================================================
+
+def _findall_item(match: 're.Match[str]', group_count: int) -> Any:
+    """What re.findall reports for `match`: the whole match, the only group, or a tuple of all groups."""
+    if group_count == 0:
+        return match.group()
+    if group_count == 1:
+        return match.group(1) or ''
+    return match.groups('')
+
+
+def find_matches(compiled: 're.Pattern[str]', text: str, limit: Optional[int] = None,
+                 count_matches: bool = False) -> Tuple[List[Any], Optional[int]]:
+    """
+    The first `limit` (default DEFAULT_PATTERN_MATCH_LIMIT) items re.findall would return for
+    `compiled` in `text`, and, with `count_matches`, the total number of matches (else None).
+    """
+    if limit is None:
+        limit = cfg.DEFAULT_PATTERN_MATCH_LIMIT
+    matches = compiled.finditer(text)
+    found: List[Any] = [_findall_item(match, compiled.groups) for match in islice(matches, max(limit, 0))]
+    if not count_matches:
+        return found, None
+    return found, len(found) + sum(1 for _ in matches)
+
+
+def match_patterns(text: str, named_patterns: Iterable[Tuple[str, str]], limit: Optional[int] = None,
+                   count_matches: bool = False) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Matches of each (name, regex) in `text`: name -> first `limit` matches (see find_matches), or
+    {'error': ...} for an invalid regex. The second dict has the total match count of each
+    valid pattern when `count_matches` is set (and is empty otherwise).
+    """
+    results: Dict[str, Any] = {}
+    totals: Dict[str, int] = {}
+    for pattern_name, regex_str in named_patterns:
+        try:
+            compiled = compile_pattern(regex_str)
+        except re.error as e:
+            results[pattern_name] = {'error': f"Invalid regex: {str(e)}"}
+            continue
+        except Exception as e: # e.g. a regex that is not a string
+            results[pattern_name] = {'error': f"Unexpected error processing pattern: {str(e)}"}
+            continue
+        results[pattern_name], total = find_matches(compiled, text, limit, count_matches)
+        if total is not None:
+            totals[pattern_name] = total
+    return results, totals
+
+# =============================================================================
+# TIME-BOUNDED EXECUTION OF USER PATTERNS
+# =============================================================================
+
+def _pattern_worker(connection: Any) -> None:
+    """Worker process body: for each (text, named_patterns, limit, count_matches) job received, sends (matches, total) per pattern as soon as it is done."""
+    while True:
+        try:
+            text, named_patterns, limit, count_matches = connection.recv()
+        except EOFError: # The parent closed its end
+            break
+        for pattern_name, regex_str in named_patterns:
+            results, totals = match_patterns(text, [(pattern_name, regex_str)], limit, count_matches)
+            connection.send((results[pattern_name], totals.get(pattern_name)))
+    connection.close()
+
+
+class PatternWorker:
+    """A worker process running `_pattern_worker`, with the parent's end of its pipe."""
+    __slots__ = ('process', 'connection')
+
+    def __init__(self) -> None:
+        self.connection, child_connection = multiprocessing.Pipe()
+        # Daemonic: an idle worker blocks on its pipe and must not hold up interpreter exit
+        self.process = multiprocessing.Process(target=_pattern_worker, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def close(self) -> None:
+        """Kills the worker (if still running) and releases its pipe."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+# Idle workers of this process, reused by later calls (most recently used last)
+_idle_workers: List[PatternWorker] = []
+_idle_workers_lock = threading.Lock()
+
+def _forget_idle_workers() -> None:
+    """In a forked child: the parent's workers are not the child's to use or kill."""
+    global _idle_workers_lock
+    _idle_workers.clear()
+    _idle_workers_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_forget_idle_workers)
+
+
+def _acquire_worker() -> PatternWorker:
+    """An idle live worker, or a newly started one."""
+    with _idle_workers_lock:
+        while _idle_workers:
+            worker = _idle_workers.pop()
+            if worker.is_alive():
+                return worker
+            worker.close()
+    return PatternWorker()
+
+
+def _release_worker(worker: PatternWorker) -> None:
+    """Keeps `worker` for reuse, unless USER_PATTERN_IDLE_WORKERS workers are already idle."""
+    with _idle_workers_lock:
+        if len(_idle_workers) < cfg.USER_PATTERN_IDLE_WORKERS:
+            _idle_workers.append(worker)
+            return
+    worker.close()
+
+
+def shutdown_pattern_workers() -> None:
+    """Stops the idle workers (a later call starts new ones)."""
+    with _idle_workers_lock:
+        workers = list(_idle_workers)
+        _idle_workers.clear()
+    for worker in workers:
+        worker.close()
+
+
+def _start_job(job: Tuple[Any, ...]) -> Optional[PatternWorker]:
+    """
+    A worker that has been sent `job`: an idle one if possible. An idle worker can die
+    between its is_alive() check and the send; the job then goes to a newly started worker
+    instead. None if that one cannot take it either.
+    """
+    worker = _acquire_worker()
+    try:
+        worker.connection.send(job)
+        return worker
+    except OSError:
+        worker.close()
+    worker = PatternWorker()
+    try:
+        worker.connection.send(job)
+        return worker
+    except OSError:
+        worker.close()
+        return None
+
+
+def match_patterns_isolated(text: str, named_patterns: Iterable[Tuple[str, str]], limit: Optional[int] = None,
+                            count_matches: bool = False, timeout: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    `match_patterns` in a worker process, giving each pattern at most `timeout` seconds
+    (default USER_PATTERN_TIMEOUT_SECONDS). A pattern that runs longer gets {'error': 'timeout'};
+    the worker is then killed and the patterns after it run in a new one. Workers that finish
+    their patterns in time are kept for the next call.
+    """
+    pending: List[Tuple[str, str]] = list(named_patterns)
+    limit = cfg.DEFAULT_PATTERN_MATCH_LIMIT if limit is None else limit # Resolved here so the worker sees the caller's config
+    timeout = cfg.USER_PATTERN_TIMEOUT_SECONDS if timeout is None else timeout
+    results: Dict[str, Any] = {}
+    totals: Dict[str, int] = {}
+    while pending:
+        worker = _start_job((text, pending, limit, count_matches))
+        if worker is None:
+            for pattern_name, _ in pending:
+                results[pattern_name] = {'error': 'Pattern worker could not be started.'}
+            break
+        finished: bool = False # Every result of the job received: the worker is idle again
+        try:
+            while pending:
+                pattern_name = pending[0][0]
+                if not worker.connection.poll(timeout):
+                    results[pattern_name] = {'error': 'timeout'}
+                    pending.pop(0)
+                    break
+                try:
+                    results[pattern_name], total = worker.connection.recv()
+                except EOFError: # The worker died (e.g. out of memory) without reporting this pattern
+                    results[pattern_name] = {'error': 'Pattern worker exited unexpectedly.'}
+                    pending.pop(0)
+                    break
+                if total is not None:
+                    totals[pattern_name] = total
+                pending.pop(0)
+            else:
+                finished = True
+        finally:
+            if finished:
+                _release_worker(worker)
+            else: # Timed out, died or interrupted: its pipe may still carry results of this job
+                worker.close()
+    return results, totals
+
+
+def match_user_patterns(text: str, named_patterns: Iterable[Tuple[str, str]], limit: Optional[int] = None,
+                        count_matches: bool = False) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Matches user-defined patterns, time-bounded in a worker process unless USER_PATTERN_TIMEOUT_SECONDS is None."""
+    named_patterns = list(named_patterns)
+    if not named_patterns:
+        return {}, {}
+    if cfg.USER_PATTERN_TIMEOUT_SECONDS is None:
+        return match_patterns(text, named_patterns, limit, count_matches)
+    return match_patterns_isolated(text, named_patterns, limit, count_matches)
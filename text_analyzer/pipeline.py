@@ -0,0 +1,306 @@
+"""
+Stage registry and scheduler for the Text Analyzer analysis pipeline.
+
+An analysis stage is a plain function that takes some named values (the raw text,
+the processed tokens, the spaCy Doc, ...) as keyword arguments and returns a dict
+of newly produced values. Each stage declares its `inputs` and `outputs`, which is
+all the scheduler needs to work out which stages a request depends on and in what
+order they must run.
+
+Stages can be executed one after another ('sequential'), or concurrently on a
+thread pool ('thread') or a process pool ('process'), where every stage starts as
+soon as all of its inputs are available.
+"""
+
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# =============================================================================
+# STAGE DEFINITIONS
+# =============================================================================
+
+class AnalysisStage(NamedTuple):
+    """
+    A single step of the analysis pipeline.
+    `process_safe` is False for stages whose inputs or outputs cannot (or should not)
+    be pickled to a worker process, e.g. anything handling a spaCy Doc.
+    """
+    name: str
+    func: Callable[..., Dict[str, Any]]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    process_safe: bool = True
+
+
+class StageRegistry:
+    """
+    Registry of analysis stages keyed by name, with a lookup from each produced
+    value to the stage that produces it.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, AnalysisStage] = {}
+        self._producers: Dict[str, str] = {}
+
+    def register(self, name: str, inputs: Iterable[str] = (), outputs: Iterable[str] = (), process_safe: bool = True) -> Callable:
+        """
+        Decorator registering `func` as the stage `name`.
+        Every output may only be produced by one stage.
+        """
+        def decorator(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+            stage = AnalysisStage(name, func, tuple(inputs), tuple(outputs), process_safe)
+            if name in self._stages:
+                raise ValueError(f"Analysis stage '{name}' is already registered.")
+            for value_name in stage.outputs:
+                if value_name in self._producers:
+                    raise ValueError(f"Value '{value_name}' is already produced by stage '{self._producers[value_name]}'.")
+                self._producers[value_name] = name
+            self._stages[name] = stage
+            return func
+        return decorator
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._stages
+
+    def __getitem__(self, name: str) -> AnalysisStage:
+        return self._stages[name]
+
+    def names(self) -> List[str]:
+        return list(self._stages)
+
+    def producer_of(self, value_name: str) -> Optional[AnalysisStage]:
+        """The stage producing `value_name`, or None if it is not produced by any stage."""
+        stage_name = self._producers.get(value_name)
+        return self._stages[stage_name] if stage_name else None
+
+    def resolve(self, targets: Iterable[str], provided: Iterable[str] = ()) -> List[AnalysisStage]:
+        """
+        Resolves the values in `targets` into the stages that must run to produce them,
+        dependencies first. Values in `provided` are already available and are not recomputed.
+
+        Raises:
+            ValueError: If a value is neither provided nor produced by a stage,
+                        or if stage dependencies form a cycle.
+        """
+        available: Set[str] = set(provided)
+        plan: List[AnalysisStage] = []
+        planned: Set[str] = set()
+        visiting: Set[str] = set()
+
+        def visit(value_name: str) -> None:
+            if value_name in available:
+                return
+            stage = self.producer_of(value_name)
+            if stage is None:
+                raise ValueError(f"No analysis stage produces '{value_name}'.")
+            if stage.name in planned:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Circular dependency detected at analysis stage '{stage.name}'.")
+            visiting.add(stage.name)
+            for input_name in stage.inputs:
+                visit(input_name)
+            visiting.discard(stage.name)
+            planned.add(stage.name)
+            plan.append(stage)
+
+        for target in targets:
+            visit(target)
+        return plan
+
+# =============================================================================
+# EXECUTION
+# =============================================================================
+
+def run_stage(stage: AnalysisStage, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Calls `stage` with its inputs taken from `values` and returns the values it produced."""
+    produced: Dict[str, Any] = stage.func(**{name: values[name] for name in stage.inputs})
+    unexpected = set(produced) - set(stage.outputs)
+    if unexpected:
+        raise ValueError(f"Analysis stage '{stage.name}' produced undeclared values: {', '.join(sorted(unexpected))}")
+    return produced
+
+
+def run_stage_instrumented(stage: AnalysisStage, values: Dict[str, Any], trace_memory: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Like `run_stage`, but also returns the stage's wall-clock time (`time.perf_counter`)
+    and, if `trace_memory` is set, the peak memory it allocated on top of what was
+    already in use (requires tracemalloc to be tracing, see `memory_tracing`).
+    """
+    baseline_bytes: int = 0
+    if trace_memory:
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    start: float = time.perf_counter()
+    produced = run_stage(stage, values)
+    stats: Dict[str, Any] = {'seconds': round(time.perf_counter() - start, 6), 'peak_memory_bytes': None}
+    if trace_memory:
+        stats['peak_memory_bytes'] = max(0, tracemalloc.get_traced_memory()[1] - baseline_bytes)
+    return produced, stats
+
+
+EXECUTOR_MODES: Tuple[str, ...] = ('sequential', 'thread', 'process')
+
+# Process pools are expensive to start, so one pool per worker count is kept for the process lifetime.
+_process_pools: Dict[Optional[int], ProcessPoolExecutor] = {}
+
+def _get_process_pool(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    """Returns (creating on first use) the shared process pool for `max_workers`."""
+    if max_workers not in _process_pools:
+        _process_pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+    return _process_pools[max_workers]
+
+
+def run_stages(
+    plan: List[AnalysisStage],
+    values: Dict[str, Any],
+    diagnostics: Optional[Dict[str, Dict[str, Any]]] = None,
+    trace_memory: bool = False,
+    executor: str = 'sequential',
+    max_workers: Optional[int] = None,
+    release: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Runs the stages of `plan`, merging their outputs into `values` (which is returned).
+    If a `diagnostics` dict is given, per-stage timing (and memory, with `trace_memory`)
+    is recorded in it under each stage name. Values named in `release` are removed from
+    `values` as soon as the last stage of `plan` reading them has run, so intermediate
+    data nobody needs after the run (token lists, a spaCy Doc) is freed early.
+
+    `executor` selects how stages run: 'sequential' (in plan order, in this thread),
+    'thread' or 'process' (independent stages concurrently, see `run_stages_concurrently`).
+
+    Raises:
+        ValueError: If `executor` is not one of EXECUTOR_MODES.
+    """
+    if executor not in EXECUTOR_MODES:
+        raise ValueError(f"Unknown executor '{executor}'. Use one of: {', '.join(EXECUTOR_MODES)}")
+    if executor != 'sequential' and len(plan) > 1:
+        return run_stages_concurrently(plan, values, diagnostics=diagnostics, use_processes=executor == 'process',
+                                       max_workers=max_workers, release=release)
+    readers: Counter[str] = _count_readers(plan, release)
+    for stage in plan:
+        if diagnostics is None:
+            values.update(run_stage(stage, values))
+        else:
+            produced, diagnostics[stage.name] = run_stage_instrumented(stage, values, trace_memory)
+            values.update(produced)
+        _release_inputs(stage, readers, values)
+    return values
+
+
+def _count_readers(plan: List[AnalysisStage], release: Iterable[str]) -> Counter[str]:
+    """How many stages of `plan` read each value of `release`."""
+    releasable: Set[str] = set(release)
+    return Counter(name for stage in plan for name in stage.inputs if name in releasable)
+
+
+def _release_inputs(stage: AnalysisStage, readers: Counter[str], values: Dict[str, Any]) -> None:
+    """Removes the releasable inputs of the finished `stage` that no other stage of the plan still reads."""
+    for name in stage.inputs:
+        if name in readers:
+            readers[name] -= 1
+            if readers[name] <= 0:
+                values.pop(name, None)
+
+
+def run_stages_concurrently(
+    plan: List[AnalysisStage],
+    values: Dict[str, Any],
+    diagnostics: Optional[Dict[str, Dict[str, Any]]] = None,
+    use_processes: bool = False,
+    max_workers: Optional[int] = None,
+    release: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Runs the stages of `plan` concurrently: each stage is submitted as soon as all of its
+    inputs are in `values`, and its outputs are merged back when it completes.
+
+    With `use_processes`, process-safe stages go to a shared process pool (only their own
+    inputs are pickled over) while the others run on threads of this process. Memory peaks
+    are not recorded here since tracemalloc cannot attribute allocations to concurrent stages.
+    `release` is handled as in `run_stages`.
+    """
+    pending: List[AnalysisStage] = list(plan)
+    readers: Counter[str] = _count_readers(plan, release)
+    running: Dict[Future, AnalysisStage] = {}
+    process_pool: Optional[Executor] = _get_process_pool(max_workers) if use_processes else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+        while pending or running:
+            ready = [stage for stage in pending if all(name in values for name in stage.inputs)]
+            for stage in ready:
+                pending.remove(stage)
+                pool = process_pool if (process_pool is not None and stage.process_safe) else thread_pool
+                stage_inputs = {name: values[name] for name in stage.inputs}
+                running[pool.submit(run_stage_instrumented, stage, stage_inputs)] = stage
+            if not running:
+                missing = sorted({name for stage in pending for name in stage.inputs if name not in values})
+                raise ValueError(f"Analysis stages cannot run, missing inputs: {', '.join(missing)}")
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    produced, stats = future.result()
+                except BrokenProcessPool:
+                    _process_pools.pop(max_workers, None) # Recreate the pool on next use
+                    raise
+                values.update(produced)
+                _release_inputs(stage, readers, values)
+                if diagnostics is not None:
+                    diagnostics[stage.name] = stats
+    return values
+
+
+def _run_stage_guarded(stage: AnalysisStage, values: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """`run_stage` returning (produced, None), or (None, error message) if the stage raised."""
+    try:
+        return run_stage(stage, values), None
+    except Exception as e:
+        return None, f"{type(e).__name__} - {str(e)}"
+
+
+def run_stage_batch(
+    stage: AnalysisStage,
+    inputs_list: List[Dict[str, Any]],
+    use_processes: bool = False,
+    max_workers: Optional[int] = None,
+    chunksize: int = 1
+) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Runs `stage` once per inputs dict in `inputs_list` (one per document of a batch), returning
+    (produced, error) pairs in order; a failing document does not stop the others.
+    With `use_processes` (and a process-safe stage) the inputs are sent to the shared process
+    pool `chunksize` documents at a time.
+    """
+    if use_processes and stage.process_safe and len(inputs_list) > 1:
+        return map_on_process_pool(_run_stage_guarded, [stage] * len(inputs_list), inputs_list, max_workers=max_workers, chunksize=chunksize)
+    return [_run_stage_guarded(stage, values) for values in inputs_list]
+
+
+def map_on_process_pool(func: Callable, *iterables: Iterable[Any], max_workers: Optional[int] = None, chunksize: int = 1) -> List[Any]:
+    """`map(func, *iterables)` on the shared process pool for `max_workers`, results in order."""
+    try:
+        return list(_get_process_pool(max_workers).map(func, *iterables, chunksize=max(1, chunksize)))
+    except BrokenProcessPool:
+        _process_pools.pop(max_workers, None) # Recreate the pool on next use
+        raise
+
+
+@contextmanager
+def memory_tracing(enabled: bool = True) -> Iterator[None]:
+    """Starts tracemalloc for the duration of the block (unless disabled or already tracing)."""
+    started: bool = enabled and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,145 @@
+"""
+One-pass readability statistics for the Text Analyzer application.
+
+`count_readability` gathers every count the standard readability formulas need (words,
+sentences, syllables, polysyllables, characters, letters, difficult words) from a single
+tokenization of the text, looking up syllables and the Dale-Chall easy word list once per
+distinct word. `readability_indices` then derives all indices from those counts.
+
+The counting rules and formulas reproduce textstat's (English configuration), including
+its rounding, so the indices equal textstat.<index>(text) without scanning the text once
+per index.
+"""
+
+import math
+import re
+import string
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, NamedTuple
+
+import textstat
+from pyphen import Pyphen
+
+from . import config as cfg
+
+PUNCTUATION_REGEX = re.compile(f'[{re.escape(string.punctuation)}]')
+# textstat's sentence boundary: terminator (+ closing quotes/brackets), whitespace, then a capital letter
+TEXTSTAT_SENTENCE_SPLIT_REGEX = re.compile(r' *[\.\?!][\'"\)\]]*[ |\n](?=[A-Z])')
+DIFFICULT_WORD_CANDIDATE_REGEX = re.compile(r"[\w\='‘’]+")
+
+# textstat's English constants and hyphenation dictionary
+HYPHENATOR = Pyphen(lang='en_US')
+FLESCH_BASE, FLESCH_SENTENCE_LENGTH, FLESCH_SYLLABLES_PER_WORD = 206.835, 1.015, 84.6
+GUNNING_FOG_SYLLABLE_THRESHOLD: int = 3
+
+# =============================================================================
+# WORD-LEVEL LOOKUPS (memoized)
+# =============================================================================
+
+def legacy_round(number: float, points: int = 0) -> float:
+    """Rounds half away from zero (textstat's rounding, unlike the built-in round)."""
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+@lru_cache(maxsize=cfg.SYLLABLE_CACHE_SIZE)
+def _hyphenated_syllables(part: str) -> int:
+    """Syllables of a lower-cased, punctuation-free part: pyphen hyphenation points + 1 (also 1 for '')."""
+    return len(HYPHENATOR.positions(part)) + 1
+
+@lru_cache(maxsize=cfg.SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """Syllables of a word as textstat counts them (0 if it is only punctuation)."""
+    cleaned: str = PUNCTUATION_REGEX.sub('', word.lower())
+    if not cleaned:
+        return 0
+    return sum(_hyphenated_syllables(part) for part in cleaned.split(' '))
+
+@lru_cache(maxsize=cfg.SYLLABLE_CACHE_SIZE)
+def is_easy_word(word: str) -> bool:
+    """Whether a lower-cased word is on textstat's Dale-Chall easy word list."""
+    return not textstat.is_difficult_word(word, syllable_threshold=0)
+
+# =============================================================================
+# COUNTS AND INDICES
+# =============================================================================
+
+class ReadabilityCounts(NamedTuple):
+    characters: int           # Characters other than spaces
+    letters: int              # Characters other than spaces and punctuation
+    words: int
+    sentences: int            # textstat's count: at least 1, sentences of <= 2 words are ignored
+    syllables: int
+    polysyllables: int        # Words of 3+ syllables
+    difficult_words: int      # Distinct non-easy words of 3+ syllables (Gunning Fog)
+    dale_chall_difficult_words: int # Distinct words not on the easy word list
+
+
+def count_readability(text: str) -> ReadabilityCounts:
+    """Counts everything `readability_indices` needs in one tokenization of `text`."""
+    no_punctuation: str = PUNCTUATION_REGEX.sub('', text)
+    lowered: str = no_punctuation.lower()
+    syllables: int = 0
+    if lowered:
+        for part, occurrences in Counter(lowered.split(' ')).items():
+            syllables += occurrences * _hyphenated_syllables(part)
+    polysyllables: int = sum(occurrences for token, occurrences in Counter(text.split()).items() if count_syllables(token) >= 3)
+
+    sentences = TEXTSTAT_SENTENCE_SPLIT_REGEX.split(text)
+    short_sentences: int = sum(1 for sentence in sentences if len(PUNCTUATION_REGEX.sub('', sentence).split()) <= 2)
+
+    difficult_words: int = 0
+    dale_chall_difficult_words: int = 0
+    for word in set(DIFFICULT_WORD_CANDIDATE_REGEX.findall(text.lower())):
+        if not is_easy_word(word):
+            dale_chall_difficult_words += 1
+            if count_syllables(word) >= GUNNING_FOG_SYLLABLE_THRESHOLD:
+                difficult_words += 1
+
+    characters: int = len(text) - text.count(' ')
+    return ReadabilityCounts(
+        characters=characters,
+        letters=len(no_punctuation) - no_punctuation.count(' '),
+        words=len(no_punctuation.split()),
+        sentences=max(1, len(sentences) - short_sentences),
+        syllables=syllables,
+        polysyllables=polysyllables,
+        difficult_words=difficult_words,
+        dale_chall_difficult_words=dale_chall_difficult_words
+    )
+
+
+def readability_indices(counts: ReadabilityCounts) -> Dict[str, float]:
+    """The readability indices of `calculate_readability_stats`, computed from `counts` as textstat does."""
+    words, sentences = counts.words, counts.sentences
+    avg_sentence_length: float = legacy_round(words / sentences, 1)
+    avg_syllables_per_word: float = legacy_round(counts.syllables / words, 1) if words else 0.0
+
+    smog: float = 0.0
+    if sentences >= 3:
+        smog = legacy_round(1.043 * (30 * (counts.polysyllables / sentences)) ** .5 + 3.1291, 1)
+
+    letters_per_100_words: float = legacy_round((legacy_round(counts.letters / words, 2) if words else 0.0) * 100, 2)
+    sentences_per_100_words: float = legacy_round((legacy_round(sentences / words, 2) if words else 0.0) * 100, 2)
+
+    dale_chall: float = 0.0
+    gunning_fog: float = 0.0
+    automated_readability: float = 0.0
+    if words:
+        difficult_percentage: float = 100 - (words - counts.dale_chall_difficult_words) / words * 100
+        dale_chall = 0.1579 * difficult_percentage + 0.0496 * avg_sentence_length
+        if difficult_percentage > 5:
+            dale_chall += 3.6365
+        dale_chall = legacy_round(dale_chall, 2)
+        gunning_fog = legacy_round(0.4 * (avg_sentence_length + counts.difficult_words / words * 100), 2)
+        automated_readability = legacy_round(4.71 * legacy_round(counts.characters / words, 2) + 0.5 * legacy_round(words / sentences, 2) - 21.43, 1)
+
+    return {
+        'flesch_reading_ease': legacy_round(FLESCH_BASE - FLESCH_SENTENCE_LENGTH * avg_sentence_length - FLESCH_SYLLABLES_PER_WORD * avg_syllables_per_word, 2),
+        'flesch_kincaid_grade': legacy_round(0.39 * avg_sentence_length + 11.8 * avg_syllables_per_word - 15.59, 1),
+        'gunning_fog': gunning_fog,
+        'smog_index': smog,
+        'coleman_liau_index': legacy_round(0.058 * letters_per_100_words - 0.296 * sentences_per_100_words - 15.8, 2),
+        'dale_chall_readability_score': dale_chall,
+        'automated_readability_index': automated_readability,
+    }
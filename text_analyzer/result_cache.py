@@ -0,0 +1,232 @@
+"""
+Content-addressed cache of analysis results for the Text Analyzer application.
+
+The web app, the GUI and batch jobs analyze the same documents again and again. A
+`ResultCache` keeps finished result dicts under a key derived from the text and a canonical
+form of the analysis arguments (`result_key`), so repeating an analysis costs a lookup.
+
+Results are stored pickled: the in-memory tier holds up to `max_bytes` of them (least
+recently used evicted first), and every lookup returns a fresh copy the caller may modify.
+With `disk_dir`, results are also written to files there (write-through) and found again by
+later processes; the directory is kept under `disk_max_bytes` by removing the least recently
+used files. Only point `disk_dir` at a directory you trust: entries are unpickled on load.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from . import config as cfg
+from .stop_words import StopWordSet
+
+# Part of every key: bump when the content of results changes, so older on-disk entries are not reused
+CACHE_FORMAT_VERSION: int = 1
+
+DISK_ENTRY_SUFFIX: str = '.pickle'
+
+# =============================================================================
+# KEYS
+# =============================================================================
+
+def result_key(text: str, **arguments: Any) -> str:
+    """
+    Hex key of `text` analyzed with `arguments`. Sets (e.g. stop words) and other iterables are
+    canonicalized (sorted / listed), so equal arguments give equal keys whatever their order.
+    """
+    canonical: Dict[str, Any] = {'version': CACHE_FORMAT_VERSION}
+    for name, value in sorted(arguments.items()):
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        elif isinstance(value, tuple):
+            value = list(value)
+        canonical[name] = value
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(text.encode('utf-8', 'surrogatepass'))
+    digest.update(b'\0')
+    digest.update(json.dumps(canonical, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+def analysis_key(text: str, sections: List[str], active_stop_words: Optional[Iterable[str]], num_common_words_to_display: int,
+                 user_patterns: Optional[List[Dict[str, str]]], top_k_capacity: Optional[int], sentiment_mode: str,
+                 method: str = 'complete') -> str:
+    """
+    Key of an analysis run: `sections` as resolved by analysis.resolve_analyses, `method` the entry point.
+    Stop-word lists from the stop_words registry are keyed by their list ID, other sets by their words.
+    """
+    if not active_stop_words:
+        stop_words_component: Any = []
+    elif isinstance(active_stop_words, StopWordSet):
+        stop_words_component = active_stop_words.list_id
+    else:
+        stop_words_component = frozenset(active_stop_words)
+    return result_key(text, method=method, sections=sections, active_stop_words=stop_words_component,
+                      num_common_words_to_display=max(0, num_common_words_to_display), user_patterns=user_patterns or [],
+                      top_k_capacity=top_k_capacity, sentiment_mode=sentiment_mode)
+
+def text_entry_key(text_key: str) -> str:
+    """Key under which the text identified by `text_key` (its sentence_index.text_digest, in hex) is stored."""
+    return result_key(text_key, entry='text')
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class ResultCache:
+    """In-memory LRU of pickled results with a byte budget, plus an optional on-disk tier."""
+
+    def __init__(self, max_bytes: int = cfg.RESULT_CACHE_MAX_BYTES, disk_dir: Optional[Union[str, Path]] = None,
+                 disk_max_bytes: int = cfg.RESULT_CACHE_DISK_MAX_BYTES) -> None:
+        self.max_bytes: int = max_bytes
+        self.disk_dir: Optional[Path] = Path(disk_dir) if disk_dir is not None else None
+        self.disk_max_bytes: int = disk_max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes: int = 0
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.disk_evictions: int = 0
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        path: Optional[Path] = self._disk_path(key)
+        return key in self._entries or (path is not None and path.is_file())
+
+    def get(self, key: str) -> Optional[Any]:
+        """A copy of the result stored under `key`, or None (counted as a miss)."""
+        with self._lock:
+            data: Optional[bytes] = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            return pickle.loads(data)
+        data = self._read_disk(key)
+        try:
+            result: Any = pickle.loads(data) if data is not None else None
+        except Exception: # A truncated or foreign file: treated as missing
+            result = None
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data)
+        return result
+
+    def put(self, key: str, result: Any) -> None:
+        """Stores (a snapshot of) `result` under `key` in memory and, with a disk tier, on disk."""
+        data: bytes = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store(key, data)
+        self._write_disk(key, data)
+
+    def clear(self) -> None:
+        """Empties the in-memory tier (the disk tier is left alone) and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = self.disk_evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the current size of the in-memory tier."""
+        lookups: int = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+            'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes,
+            'evictions': self.evictions, 'disk_evictions': self.disk_evictions,
+        }
+
+    # In-memory tier ----------------------------------------------------------
+
+    def _store(self, key: str, data: bytes) -> None:
+        """Adds `data` to the in-memory tier (caller holds the lock); entries over the whole budget are not kept."""
+        previous: Optional[bytes] = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    # On-disk tier ------------------------------------------------------------
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.disk_dir / f"{key}{DISK_ENTRY_SUFFIX}" if self.disk_dir is not None else None
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path: Optional[Path] = self._disk_path(key)
+        if path is None:
+            return None
+        try:
+            data: bytes = path.read_bytes()
+            os.utime(path) # Recently used entries are evicted last
+        except OSError:
+            return None
+        return data
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        path: Optional[Path] = self._disk_path(key)
+        if path is None or len(data) > self.disk_max_bytes:
+            return
+        temporary_path: Path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temporary_path.write_bytes(data)
+            os.replace(temporary_path, path) # Readers never see a partly written entry
+        except OSError as e:
+            print(f"⚠️ Could not write analysis result cache entry '{path}': {e}")
+            temporary_path.unlink(missing_ok=True)
+            return
+        self._evict_disk(path)
+
+    def _evict_disk(self, newest: Path) -> None:
+        """Removes the least recently used entry files other than `newest` until the directory fits in `disk_max_bytes`."""
+        files: List[os.stat_result] = []
+        paths: List[Path] = []
+        for path in self.disk_dir.glob(f"*{DISK_ENTRY_SUFFIX}"):
+            try:
+                files.append(path.stat())
+                paths.append(path)
+            except OSError: # Removed by another process meanwhile
+                continue
+        total_bytes: int = sum(stat.st_size for stat in files)
+        for stat, path in sorted(zip(files, paths), key=lambda entry: entry[0].st_mtime):
+            if total_bytes <= self.disk_max_bytes:
+                break
+            if path == newest:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total_bytes -= stat.st_size
+            with self._lock:
+                self.disk_evictions += 1
+
+# =============================================================================
+# DEFAULT CACHE
+# =============================================================================
+
+_default_cache: Optional[ResultCache] = None
+
+def get_default_cache() -> ResultCache:
+    """The process-wide cache configured by RESULT_CACHE_MAX_BYTES / RESULT_CACHE_DIR (created on first use)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(cfg.RESULT_CACHE_MAX_BYTES, cfg.RESULT_CACHE_DIR, cfg.RESULT_CACHE_DISK_MAX_BYTES)
+    return _default_cache
@@ -0,0 +1,171 @@
+"""
+Sentence segmentation and lookup for the Text Analyzer application.
+
+`SentenceTable` is the single sentence segmentation pass: it splits a text at runs of
+'.', '!' and '?' into sentence spans (character offsets) with their word counts, and
+every sentence-aware step (sentence statistics, sentence lookup, ...) reads from it.
+
+`SentenceIndex` keeps an inverted index from every (lower-cased) word to the sentences
+and character offsets where it occurs, so "which sentences contain this word?" is
+answered in time proportional to the number of matches instead of by rescanning the
+text. Lookups follow the semantics of searching each sentence for r'\\b<word>\\b'
+case-insensitively.
+"""
+
+import hashlib
+import re
+import string
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import config as cfg
+
+SENTENCE_PATTERN = re.compile(r'[^.!?]+') # Text between runs of sentence terminators
+WORD_RUN_PATTERN = re.compile(r'\w+') # Word characters as seen by \b
+
+# =============================================================================
+# SENTENCE SEGMENTATION
+# =============================================================================
+
+def count_sentence_words(sentence: str) -> int:
+    """
+    Words in `sentence` as counted after `tp.clean_text_for_word_tokenization(advanced=False)`:
+    whitespace-separated chunks that are not made of punctuation only.
+    """
+    return sum(1 for chunk in sentence.split() if chunk.strip(string.punctuation))
+
+
+class SentenceTable:
+    """
+    The sentences of a text as (start, end) character spans, stripped of surrounding
+    whitespace and in text order, with the number of words in each.
+    Empty sentences (e.g. between '...' and '!') are left out.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        self.starts: array = array('Q')
+        self.ends: array = array('Q')
+        self.word_counts: array = array('I')
+        for match in SENTENCE_PATTERN.finditer(text):
+            piece: str = match.group()
+            sentence: str = piece.strip()
+            if not sentence:
+                continue
+            start: int = match.start() + len(piece) - len(piece.lstrip())
+            self.starts.append(start)
+            self.ends.append(start + len(sentence))
+            self.word_counts.append(count_sentence_words(sentence))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.text[start:end] for start, end in zip(self.starts, self.ends))
+
+    def sentence(self, sentence_id: int) -> str:
+        return self.text[self.starts[sentence_id]:self.ends[sentence_id]]
+
+    @property
+    def total_words(self) -> int:
+        return sum(self.word_counts)
+
+# =============================================================================
+# INVERTED SENTENCE INDEX
+# =============================================================================
+
+class SentenceIndex:
+    """Word -> (sentence id, offset) postings over the sentences of one text."""
+
+    def __init__(self, text_content: str, sentence_table: Optional[SentenceTable] = None) -> None:
+        self.table: SentenceTable = sentence_table if sentence_table is not None else SentenceTable(text_content)
+        self._postings: Dict[str, Tuple[array, array]] = {} # Word -> (sentence ids, offsets), in text order
+        for sentence_id, (start, end) in enumerate(zip(self.table.starts, self.table.ends)):
+            for match in WORD_RUN_PATTERN.finditer(text_content, start, end):
+                word: str = match.group().lower()
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = (array('I'), array('I'))
+                postings[0].append(sentence_id)
+                postings[1].append(match.start() - start)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def positions(self, word: str) -> List[Tuple[int, int]]:
+        """(sentence id, character offset in the sentence) of every occurrence of a single word."""
+        postings = self._postings.get(word.lower())
+        return list(zip(*postings)) if postings else []
+
+    def sentence_ids(self, word: str) -> List[int]:
+        """Ids of the sentences containing `word` (as r'\\b<word>\\b', ignoring case), in text order."""
+        if not word:
+            return []
+        folded: str = word.lower()
+        if WORD_RUN_PATTERN.fullmatch(folded):
+            postings = self._postings.get(folded)
+            return list(dict.fromkeys(postings[0])) if postings else []
+
+        # Words with non-word characters ("don't", "e-mail"): every match contains each of the
+        # word's runs as a whole run, so only sentences containing all of them need to be searched
+        try: word_regex = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
+        except re.error: return []
+        runs: List[str] = WORD_RUN_PATTERN.findall(folded)
+        if runs:
+            if any(run not in self._postings for run in runs):
+                return []
+            runs.sort(key=lambda run: len(self._postings[run][0]))
+            candidates = set(self._postings[runs[0]][0])
+            for run in runs[1:]:
+                candidates.intersection_update(self._postings[run][0])
+            candidate_ids: List[int] = sorted(candidates)
+        else:
+            candidate_ids = list(range(len(self.table)))
+        return [sentence_id for sentence_id in candidate_ids if word_regex.search(self.table.sentence(sentence_id))]
+
+    def sentences_for_word(self, word: str) -> List[str]:
+        """The sentences containing `word`, each terminated with a period (as get_sentences_for_word returns them)."""
+        return [self.table.sentence(sentence_id) + '.' for sentence_id in self.sentence_ids(word)]
+
+# =============================================================================
+# INDEX CACHE
+# =============================================================================
+
+# Indexes of recently analyzed texts keyed by a digest of the text (least recently used evicted first)
+_index_cache: "OrderedDict[bytes, SentenceIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock() # Web requests look indexes up from several threads
+
+def text_digest(text_content: str) -> bytes:
+    """The key identifying `text_content` in the index cache (see also `cached_sentence_index`)."""
+    return hashlib.blake2b(text_content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+def get_sentence_index(text_content: str, cache_size: Optional[int] = None,
+                       sentence_table: Optional[SentenceTable] = None) -> SentenceIndex:
+    """
+    Returns the index of `text_content`, building and caching it on first use.
+    A `sentence_table` already built for `text_content` is indexed instead of segmenting the text again.
+    """
+    key: bytes = text_digest(text_content)
+    index = cached_sentence_index(key)
+    if index is not None:
+        return index
+    if sentence_table is not None and sentence_table.text != text_content:
+        raise ValueError("sentence_table does not segment text_content")
+    index = SentenceIndex(text_content, sentence_table) # Built outside the lock; a concurrent build of the same text is kept once
+    limit: int = cfg.SENTENCE_INDEX_CACHE_SIZE if cache_size is None else cache_size
+    with _index_cache_lock:
+        index = _index_cache.setdefault(key, index)
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > max(limit, 0):
+            _index_cache.popitem(last=False)
+    return index
+
+def cached_sentence_index(key: bytes) -> Optional[SentenceIndex]:
+    """The cached index of the text with digest `key`, or None if it is not (or no longer) cached."""
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+    return index
@@ -0,0 +1,93 @@
+"""
+Paragraph-sharded analysis of a single large document for the Text Analyzer application.
+
+`analyze_text_sharded` cuts a document at paragraph breaks into shards of roughly equal size,
+analyzes every shard into an `incremental.ParagraphPartial` on the shared process pool, and
+merges the partials like `incremental.analyze_text_incremental`: word, word length and n-gram
+counters, sentence and paragraph statistics and pattern matches exactly; VADER sentence
+scores, RAKE tables and spaCy POS/entity counts by summing them up. Shards only end at
+paragraph breaks that close a sentence, so sentiment and keywords merge exactly; spaCy sees
+one shard at a time, so POS and entity counts can differ slightly from a full run (an entity
+tagged differently with more context). Readability, document-mode sentiment and user-defined
+regexes need the whole text and are computed in the calling process after the merge.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Set
+
+from . import analysis
+from . import config as cfg
+from .incremental import IncrementalSettings, ParagraphPartial, analyze_paragraph, merge_partials, split_paragraphs
+from .pipeline import map_on_process_pool
+
+# =============================================================================
+# SHARDING
+# =============================================================================
+
+def split_shards(text: str, shard_count: int) -> List[str]:
+    """
+    Consecutive runs of paragraphs of `text` of at least len(text) / `shard_count` characters
+    each (the last may be shorter); ''.join(shards) == text. A text with fewer (or very uneven)
+    paragraphs gets fewer shards.
+    """
+    target_size: int = max(1, -(-len(text) // max(shard_count, 1)))
+    shards: List[str] = []
+    current: List[str] = []
+    current_size: int = 0
+    for paragraph in split_paragraphs(text):
+        current.append(paragraph)
+        current_size += len(paragraph)
+        if current_size >= target_size:
+            shards.append(''.join(current))
+            current, current_size = [], 0
+    if current:
+        shards.append(''.join(current))
+    return shards
+
+
+def _analyze_shard(shard: str, settings: IncrementalSettings) -> ParagraphPartial:
+    """Worker body: the partial of one shard (each worker loads its own spaCy model)."""
+    nlp = analysis._get_nlp_model(settings.spacy_profile) if settings.spacy_profile else None
+    return analyze_paragraph(shard, settings, nlp)
+
+# =============================================================================
+# SHARDED ENTRY POINT
+# =============================================================================
+
+def analyze_text_sharded(
+    text: Optional[str],
+    active_stop_words: Optional[Set[str]] = None,
+    num_common_words_to_display: int = cfg.DEFAULT_TOP_WORDS_DISPLAY,
+    user_patterns: Optional[List[Dict[str, str]]] = None,
+    analyses: Optional[List[str]] = None,
+    sentiment_mode: str = cfg.DEFAULT_SENTIMENT_MODE,
+    shard_count: Optional[int] = None,
+    max_workers: Optional[int] = cfg.DEFAULT_ANALYSIS_MAX_WORKERS
+) -> Dict[str, Any]:
+    """
+    Counterpart of `analysis.analyze_text_complete` for one large document, spread over up to
+    `max_workers` processes (None: one per CPU). `shard_count` defaults to one shard per worker,
+    but no more than one per cfg.MIN_SHARD_CHARS characters; a single shard is analyzed in this
+    process. Returns a result dict in the same format; 'processed_tokens' is empty.
+    """
+    if not text:
+        return {**analysis._empty_results(), 'error': 'No text provided for analysis'}
+
+    try:
+        sections: List[str] = analysis.resolve_analyses(analyses)
+    except ValueError as e:
+        return {**analysis._empty_results(), 'error': str(e)}
+
+    try:
+        settings = IncrementalSettings.for_run(active_stop_words, sections, sentiment_mode)
+        if shard_count is None:
+            shard_count = min(max_workers or os.cpu_count() or 1, -(-len(text) // max(cfg.MIN_SHARD_CHARS, 1)))
+        shards: List[str] = split_shards(text, shard_count)
+        if len(shards) > 1:
+            partials: List[ParagraphPartial] = map_on_process_pool(_analyze_shard, shards, [settings] * len(shards), max_workers=max_workers)
+        else:
+            partials = [_analyze_shard(shard, settings) for shard in shards]
+        results: Dict[str, Any] = merge_partials(partials, text, settings, num_common_words_to_display, user_patterns)
+    except Exception as e:
+        results = {**analysis._empty_results(), 'error': f'Analysis failed: {type(e).__name__} - {str(e)}'}
+    return results
@@ -0,0 +1,168 @@
+"""
+Bounded-memory frequency summaries for the Text Analyzer application.
+
+`SpaceSavingCounter` estimates the most frequent items of a stream (words, n-grams)
+while tracking at most `capacity` of them (Space-Saving, Metwally et al. 2005, in
+its mergeable form). Every estimate is an upper bound on the true count and
+overestimates it by at most the item's recorded error, which never exceeds
+total / capacity.
+
+`HyperLogLog` estimates the number of distinct items (e.g. the vocabulary size) in
+2**precision bytes, with a standard error of about 1.04 / sqrt(2**precision).
+"""
+
+import hashlib
+import math
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# =============================================================================
+# SPACE-SAVING TOP-K SUMMARY
+# =============================================================================
+
+class SpaceSavingCounter:
+    """
+    Approximate counter keeping at most `capacity` items.
+
+    Items are added in batches (`update`) which are counted exactly and then merged
+    into the summary, so the per-item cost stays that of `collections.Counter`.
+    Summaries of consecutive (or unrelated) parts of a stream can be combined with `merge`.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("SpaceSavingCounter capacity must be at least 1.")
+        self.capacity: int = capacity
+        self.counts: Counter = Counter()     # Estimated (upper bound) count per tracked item
+        self.errors: Dict[Hashable, int] = {} # Maximum overestimation per tracked item (only non-zero ones)
+        self.total: int = 0                  # Number of items counted, tracked or not
+        self.floor: int = 0                  # Upper bound on the count of any untracked item
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.counts
+
+    def update(self, items: Iterable[Hashable]) -> None:
+        """Counts a batch of items."""
+        batch: Counter = Counter(items)
+        self._combine(batch, {}, 0, sum(batch.values()))
+
+    def merge(self, other: 'SpaceSavingCounter') -> 'SpaceSavingCounter':
+        """Adds the items summarized by `other` (in place; returns self)."""
+        self._combine(other.counts, other.errors, other.floor, other.total)
+        return self
+
+    def _combine(self, other_counts: Counter, other_errors: Dict[Hashable, int], other_floor: int, other_total: int) -> None:
+        if self.floor == 0 and other_floor == 0:
+            self.counts.update(other_counts) # Both sides still exact: plain addition
+            for item, error in other_errors.items():
+                self.errors[item] = self.errors.get(item, 0) + error
+        else:
+            # An item missing from one side may have been seen up to that side's floor times
+            combined: Counter = Counter()
+            errors: Dict[Hashable, int] = {}
+            for item, count in self.counts.items():
+                in_other: bool = item in other_counts
+                combined[item] = count + (other_counts[item] if in_other else other_floor)
+                errors[item] = self.errors.get(item, 0) + (other_errors.get(item, 0) if in_other else other_floor)
+            for item, count in other_counts.items():
+                if item not in self.counts:
+                    combined[item] = count + self.floor
+                    errors[item] = other_errors.get(item, 0) + self.floor
+            self.counts, self.errors = combined, {item: error for item, error in errors.items() if error}
+        self.total += other_total
+        self.floor += other_floor
+        if len(self.counts) > self.capacity:
+            kept: List[Tuple[Hashable, int]] = nlargest(self.capacity, self.counts.items(), key=itemgetter(1))
+            self.counts = Counter(dict(kept))
+            self.errors = {item: self.errors[item] for item, _ in kept if item in self.errors}
+            self.floor = max(self.floor, kept[-1][1])
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """Tracked items with the highest estimated counts (like `Counter.most_common`)."""
+        return self.counts.most_common(n)
+
+    def error_report(self) -> Dict[str, Any]:
+        """
+        How far the estimates can be off: each tracked count exceeds the true count by at
+        most `max_error`, which is guaranteed to stay below `error_bound` (total / capacity).
+        `exact` is True while nothing has been evicted, i.e. all counts are exact.
+        """
+        return {
+            'capacity': self.capacity,
+            'tracked': len(self.counts),
+            'total': self.total,
+            'max_error': max(self.errors.values(), default=0),
+            'error_bound': round(self.total / self.capacity, 2),
+            'exact': self.floor == 0,
+        }
+
+# =============================================================================
+# HYPERLOGLOG CARDINALITY SKETCH
+# =============================================================================
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch (Flajolet et al. 2007) over 64-bit BLAKE2b hashes.
+    Hashes are stable across processes, so sketches built from different chunks, files or
+    worker processes can be merged (`merge`) or stored (`to_bytes` / `from_bytes`).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18.")
+        self.precision: int = precision
+        self.registers: bytearray = bytearray(1 << precision)
+
+    @staticmethod
+    def _hash(item: str) -> int:
+        return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'big')
+
+    def update(self, items: Iterable[str]) -> None:
+        """Adds items (strings); duplicates within the batch are hashed once."""
+        registers = self.registers
+        index_shift: int = 64 - self.precision
+        rest_mask: int = (1 << index_shift) - 1
+        for item in set(items):
+            hashed = self._hash(item)
+            index = hashed >> index_shift
+            rank = index_shift - (hashed & rest_mask).bit_length() + 1 # Position of the first 1-bit after the index bits
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Adds the items seen by `other` (in place; returns self)."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        self.registers = bytearray(max(mine, theirs) for mine, theirs in zip(self.registers, other.registers))
+        return self
+
+    def estimate(self) -> int:
+        """Estimated number of distinct items added."""
+        register_count: int = len(self.registers)
+        alpha: float = {16: 0.673, 32: 0.697, 64: 0.709}.get(register_count, 0.7213 / (1 + 1.079 / register_count))
+        raw_estimate: float = alpha * register_count ** 2 / sum(2.0 ** -rank for rank in self.registers)
+        empty_registers: int = self.registers.count(0)
+        if raw_estimate <= 2.5 * register_count and empty_registers:
+            return round(register_count * math.log(register_count / empty_registers)) # Linear counting for small sets
+        return round(raw_estimate)
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of `estimate` relative to the true count."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        sketch = cls(data[0])
+        if len(data) != len(sketch.registers) + 1:
+            raise ValueError("Invalid HyperLogLog data.")
+        sketch.registers = bytearray(data[1:])
+        return sketch
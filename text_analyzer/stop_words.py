@@ -0,0 +1,142 @@
+"""
+Process-wide stop-word registry for the Text Analyzer application.
+
+Stop-word lists are loaded once and handed out as frozensets under a stable ID that callers
+can use as (part of) a cache key:
+
+- 'default': the built-in English list (cfg.STOP_WORDS)
+- 'none': no stop-word removal (an empty set)
+- 'nltk:<language>': an NLTK stopwords corpus list, for the languages in
+  cfg.SUPPORTED_NLTK_STOPWORD_LANGUAGES, loaded on first use
+- 'custom:<path>@<mtime_ns>:<size>': a custom file (file_io.load_custom_stop_words), loaded again
+  only when the file's modification time or size changes
+
+Lookups return `(StopWordList, '')` or `(None, error_message)`, like the file loaders. The
+`words` of a list are a `StopWordSet`, a frozenset that carries its list ID, so result cache
+keys (result_cache.analysis_key) name the list instead of serializing its words.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from . import config as cfg
+from . import file_io
+
+DEFAULT_ID: str = 'default'
+NONE_ID: str = 'none'
+NLTK_PREFIX: str = 'nltk:'
+CUSTOM_PREFIX: str = 'custom:'
+
+
+class StopWordSet(frozenset):
+    """A frozenset of stop words that knows the ID of the registry list it came from."""
+    __slots__ = ('list_id',)
+
+    def __new__(cls, words: Iterable[str] = (), list_id: str = '') -> 'StopWordSet':
+        self = super().__new__(cls, words)
+        self.list_id = list_id
+        return self
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (StopWordSet, (frozenset(self), self.list_id))
+
+
+class StopWordList(NamedTuple):
+    list_id: str
+    words: StopWordSet
+    description: str
+
+
+_lock = threading.Lock()
+_nltk_lists: Dict[str, StopWordList] = {}
+_custom_lists: Dict[Path, Tuple[Tuple[int, int], StopWordList]] = {} # Resolved path -> ((mtime_ns, size), list)
+
+_DEFAULT_LIST = StopWordList(DEFAULT_ID, StopWordSet(cfg.STOP_WORDS, DEFAULT_ID), f"default English stop words ({len(cfg.STOP_WORDS)} words)")
+_NONE_LIST = StopWordList(NONE_ID, StopWordSet((), NONE_ID), "no stop words")
+
+# =============================================================================
+# BUILT-IN AND NLTK LISTS
+# =============================================================================
+
+def available_languages() -> List[str]:
+    """NLTK stop-word languages offered (cfg.SUPPORTED_NLTK_STOPWORD_LANGUAGES)."""
+    return list(cfg.SUPPORTED_NLTK_STOPWORD_LANGUAGES)
+
+
+def nltk_stop_words(language: str) -> Tuple[Optional[StopWordList], str]:
+    """The NLTK stop words of `language`, read from the corpus on the first request only."""
+    language = language.strip().lower()
+    if language not in cfg.SUPPORTED_NLTK_STOPWORD_LANGUAGES:
+        return None, f"❌ Error: Language '{language}' is not a supported NLTK stop-word language."
+    with _lock:
+        cached: Optional[StopWordList] = _nltk_lists.get(language)
+    if cached is not None:
+        return cached, ""
+
+    try:
+        from nltk.corpus import stopwords
+        words = StopWordSet((word.lower() for word in stopwords.words(language)), f"{NLTK_PREFIX}{language}")
+    except (OSError, LookupError): # Failures are not cached: the corpus may be downloaded later
+        return None, f"❌ Error: NLTK stopwords for '{language}' not found. Ensure it's downloaded (e.g., via download_nltk_data.py)."
+    except Exception as e:
+        return None, f"❌ Error loading NLTK stopwords for '{language}': {type(e).__name__} - {e}"
+
+    stop_word_list = StopWordList(words.list_id, words, f"NLTK '{language}' stop words ({len(words)} words)")
+    with _lock:
+        return _nltk_lists.setdefault(language, stop_word_list), ""
+
+# =============================================================================
+# CUSTOM FILES
+# =============================================================================
+
+def custom_stop_words(filepath: Union[str, Path]) -> Tuple[Optional[StopWordList], str]:
+    """The stop words of a custom file, cached by resolved path and re-read when the file changes."""
+    path = Path(filepath)
+    try:
+        resolved: Path = path.resolve()
+        stat = resolved.stat()
+    except OSError:
+        return None, f"❌ Error: Custom stop word file '{path}' not found."
+    version: Tuple[int, int] = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _custom_lists.get(resolved)
+    if cached is not None and cached[0] == version:
+        return cached[1], ""
+
+    words, error_message = file_io.load_custom_stop_words(str(resolved))
+    if not words:
+        return None, error_message
+    list_id: str = f"{CUSTOM_PREFIX}{resolved}@{stat.st_mtime_ns}:{stat.st_size}"
+    stop_word_list = StopWordList(list_id, StopWordSet(words, list_id),
+                                  f"custom stop words from '{resolved.name}' ({len(words)} words)")
+    with _lock:
+        _custom_lists[resolved] = (version, stop_word_list)
+    return stop_word_list, ""
+
+# =============================================================================
+# LOOKUP BY ID
+# =============================================================================
+
+def get_stop_words(list_id: str) -> Tuple[Optional[StopWordList], str]:
+    """The list named by `list_id` ('default', 'none', 'nltk:<language>' or 'custom:<path>[@<mtime_ns>:<size>]')."""
+    if list_id == DEFAULT_ID:
+        return _DEFAULT_LIST, ""
+    if list_id == NONE_ID:
+        return _NONE_LIST, ""
+    if list_id.startswith(NLTK_PREFIX):
+        return nltk_stop_words(list_id[len(NLTK_PREFIX):])
+    if list_id.startswith(CUSTOM_PREFIX):
+        path, _, version = list_id[len(CUSTOM_PREFIX):].rpartition('@')
+        if not path or not re.fullmatch(r'\d+:\d+', version): # No version suffix: the whole rest is the path
+            path = list_id[len(CUSTOM_PREFIX):]
+        return custom_stop_words(path)
+    return None, f"❌ Error: Unknown stop word list '{list_id}'."
+
+
+def clear_registry() -> None:
+    """Forgets the loaded NLTK and custom lists (they are loaded again on next use)."""
+    with _lock:
+        _nltk_lists.clear()
+        _custom_lists.clear()
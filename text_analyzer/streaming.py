@@ -0,0 +1,548 @@
+"""
+Streaming analysis for the Text Analyzer application.
+
+`analyze_text_stream` analyzes text arriving as an iterator of chunks (e.g. from
+`file_io.read_file_in_chunks`) without ever holding the whole text in memory.
+Chunks are re-cut at token boundaries and folded into a `StreamingAnalysis`, a
+set of mergeable accumulators (word counts, n-grams, sentence and paragraph
+statistics, pattern matches). Memory use grows with the vocabulary, not with
+the size of the input; with `top_k_capacity` word and n-gram counts are kept in
+bounded-size Space-Saving summaries instead (see `sketches.SpaceSavingCounter`), and
+the number of unique words is estimated with a HyperLogLog sketch.
+
+Partial results are mergeable: `a.merge(b)` gives the same state as streaming
+the text of `a` followed by the text of `b`, provided the two texts meet at a
+token boundary (whitespace before the cut, a token right after it).
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import config as cfg
+from . import text_processing as tp
+from . import analysis
+from .pattern_engine import compile_pattern, find_matches, match_user_patterns
+from .sentence_index import count_sentence_words
+from .sketches import HyperLogLog, SpaceSavingCounter
+
+# Sentence terminators, as used by analysis.analyze_sentences
+SENTENCE_BOUNDARY_REGEX: re.Pattern = re.compile(r'[.!?]+')
+
+# =============================================================================
+# CHUNK SPLITTING
+# =============================================================================
+
+def _last_token_start(buffer: str) -> int:
+    """
+    Position where the last (possibly incomplete) token of `buffer` starts, i.e. a cut
+    point with a whole whitespace run before it and a token after it. A line start is
+    preferred, so regex matches within a line are never split. 0 if there is no such cut.
+    """
+    content_end: int = len(buffer.rstrip())
+    if content_end == 0:
+        return 0
+    newline_pos: int = buffer.rfind('\n', 0, content_end)
+    if newline_pos != -1:
+        cut = newline_pos + 1
+        while buffer[cut].isspace():
+            cut += 1
+        return cut
+    cut = content_end - 1
+    while cut >= 0 and not buffer[cut].isspace():
+        cut -= 1
+    return cut + 1
+
+
+def split_at_token_boundaries(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Re-cuts arbitrary text chunks so that no token, whitespace run (and hence no
+    paragraph break) or line is split across two pieces. Only the trailing partial
+    line of each chunk is carried over to the next one.
+    """
+    carry: str = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer = carry + chunk
+        cut = _last_token_start(buffer)
+        if cut > 0:
+            yield buffer[:cut]
+            carry = buffer[cut:]
+        else:
+            carry = buffer
+    if carry:
+        yield carry
+
+# =============================================================================
+# MERGEABLE ACCUMULATORS
+# =============================================================================
+
+def _new_counter(top_k_capacity: Optional[int] = None) -> Any:
+    """An exact Counter, or an approximate SpaceSavingCounter if `top_k_capacity` is set."""
+    return SpaceSavingCounter(top_k_capacity) if top_k_capacity else Counter()
+
+def _add_counts(target: Any, source: Any) -> None:
+    if isinstance(target, SpaceSavingCounter):
+        target.merge(source)
+    else:
+        target.update(source)
+
+
+class _SentenceFragment:
+    """
+    Text of a sentence that is still open across pieces, joined piece by piece with single
+    spaces. Its word count is exact; beyond cfg.STREAMING_OPEN_SENTENCE_MAX_CHARS only the
+    first and last half of the characters are kept, so text without sentence terminators
+    (logs, CSV, code) does not pile up in memory.
+    """
+    __slots__ = ('words', 'has_content', 'prefix', 'suffix', 'truncated')
+
+    def __init__(self, text: str = '') -> None:
+        self.words: int = count_sentence_words(text)
+        self.has_content: bool = bool(text.strip())
+        self.prefix: str = text  # The whole text unless truncated
+        self.suffix: str = ''    # The last characters, once truncated
+        self.truncated: bool = False
+        self._bound()
+
+    def _bound(self) -> None:
+        half: int = max(cfg.STREAMING_OPEN_SENTENCE_MAX_CHARS // 2, 1)
+        if not self.truncated and len(self.prefix) > 2 * half:
+            self.prefix, self.suffix, self.truncated = self.prefix[:half], self.prefix[-half:], True
+
+    def join(self, other: '_SentenceFragment') -> '_SentenceFragment':
+        """The fragment of our text, a space and the text of `other`."""
+        joined = _SentenceFragment()
+        joined.words = self.words + other.words # Pieces meet at token boundaries: no word spans the join
+        joined.has_content = self.has_content or other.has_content
+        if not self.truncated and not other.truncated:
+            joined.prefix = f"{self.prefix} {other.prefix}"
+            joined._bound()
+            return joined
+        half: int = max(cfg.STREAMING_OPEN_SENTENCE_MAX_CHARS // 2, 1)
+        joined.truncated = True
+        joined.prefix = self.prefix if self.truncated else f"{self.prefix} {other.prefix}"[:half]
+        joined.suffix = other.suffix if other.truncated else f"{self.suffix if self.truncated else self.prefix} {other.prefix}"[-half:]
+        return joined
+
+    def text(self) -> str:
+        """The stripped sentence; a truncated one shows its start and end around ' … '."""
+        if not self.truncated:
+            return self.prefix.strip()
+        return f"{self.prefix.lstrip()} … {self.suffix.rstrip()}"
+
+
+class _SentenceStats:
+    """Count, total words and first longest/shortest sentence of a run of complete sentences."""
+    __slots__ = ('count', 'total_words', 'longest', 'shortest')
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total_words: int = 0
+        self.longest: Optional[Tuple[int, str]] = None
+        self.shortest: Optional[Tuple[int, str]] = None
+
+    def add(self, sentence: str) -> None:
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        self._add_counted(count_sentence_words(sentence), sentence)
+
+    def add_fragment(self, fragment: _SentenceFragment) -> None:
+        if fragment.has_content:
+            self._add_counted(fragment.words, fragment.text())
+
+    def _add_counted(self, words: int, sentence: str) -> None:
+        self.count += 1
+        self.total_words += words
+        if self.longest is None or words > self.longest[0]:
+            self.longest = (words, sentence)
+        if self.shortest is None or words < self.shortest[0]:
+            self.shortest = (words, sentence)
+
+    def extend(self, other: '_SentenceStats') -> None:
+        """Appends the sentences summarized by `other` (which come after ours)."""
+        self.count += other.count
+        self.total_words += other.total_words
+        if other.longest is not None and (self.longest is None or other.longest[0] > self.longest[0]):
+            self.longest = other.longest
+        if other.shortest is not None and (self.shortest is None or other.shortest[0] < self.shortest[0]):
+            self.shortest = other.shortest
+
+
+class SentenceAccumulator:
+    """
+    Streaming equivalent of `analysis.analyze_sentences` on the sentence-cleaned text.
+    Keeps the open fragments before the first and after the last sentence terminator
+    (bounded, see `_SentenceFragment`), so sentences spanning pieces are completed when
+    the next piece is merged in.
+    """
+
+    def __init__(self) -> None:
+        self.has_text: bool = False
+        self.closed: bool = False # Whether a sentence terminator has been seen
+        self.head: _SentenceFragment = _SentenceFragment() # Text before the first terminator
+        self.middle: _SentenceStats = _SentenceStats()
+        self.tail: _SentenceFragment = _SentenceFragment() # Text after the last terminator
+
+    def update(self, piece: str) -> None:
+        # Same cleaning as tp.preprocess_text_for_sentence_analysis; the regex only removes
+        # single characters, so cleaning piece by piece matches cleaning the whole text.
+        normalized: str = ' '.join(piece.lower().split())
+        if not normalized:
+            return
+        parts: List[str] = SENTENCE_BOUNDARY_REGEX.split(cfg.SENTENCE_STRUCTURE_PRESERVE_CLEAN_REGEX.sub('', normalized))
+        other = SentenceAccumulator()
+        other.has_text = True
+        other.head = _SentenceFragment(parts[0])
+        other.tail = _SentenceFragment(parts[-1])
+        if len(parts) > 1:
+            other.closed = True
+            for sentence in parts[1:-1]:
+                other.middle.add(sentence)
+        self.merge(other)
+
+    def merge(self, other: 'SentenceAccumulator') -> 'SentenceAccumulator':
+        if not other.has_text:
+            return self
+        if not self.has_text:
+            self.has_text, self.closed, self.head, self.tail = True, other.closed, other.head, other.tail
+            self.middle.extend(other.middle)
+        elif not self.closed and not other.closed:
+            self.head = self.tail = self.head.join(other.head)
+        elif not self.closed:
+            self.head = self.head.join(other.head)
+            self.closed, self.tail = True, other.tail
+            self.middle.extend(other.middle)
+        elif not other.closed:
+            self.tail = self.tail.join(other.head)
+        else:
+            self.middle.add_fragment(self.tail.join(other.head))
+            self.middle.extend(other.middle)
+            self.tail = other.tail
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        stats = _SentenceStats()
+        stats.add_fragment(self.head)
+        if self.closed:
+            stats.extend(self.middle)
+            stats.add_fragment(self.tail)
+        if not stats.count:
+            return {'sentence_count': 0, 'average_words_per_sentence': 0.0, 'longest_sentence': '', 'shortest_sentence': ''}
+        return {
+            'sentence_count': stats.count,
+            'average_words_per_sentence': round(stats.total_words / stats.count, 1),
+            'longest_sentence': stats.longest[1],
+            'shortest_sentence': stats.shortest[1]
+        }
+
+
+class ParagraphAccumulator:
+    """Counts non-blank paragraphs ('\\n\\n'-separated blocks, as in general_stats)."""
+
+    def __init__(self) -> None:
+        self.closed: bool = False        # Whether a paragraph break has been seen
+        self.head_content: bool = False  # Content before the first break
+        self.middle_count: int = 0       # Non-blank paragraphs between the first and last break
+        self.tail_content: bool = False  # Content after the last break
+
+    def update(self, piece: str) -> None:
+        parts: List[str] = piece.split('\n\n')
+        other = ParagraphAccumulator()
+        other.head_content = bool(parts[0].strip())
+        other.tail_content = bool(parts[-1].strip())
+        if len(parts) > 1:
+            other.closed = True
+            other.middle_count = sum(1 for part in parts[1:-1] if part.strip())
+        self.merge(other)
+
+    def merge(self, other: 'ParagraphAccumulator') -> 'ParagraphAccumulator':
+        if not self.closed and not other.closed:
+            self.head_content = self.tail_content = self.head_content or other.head_content
+        elif not self.closed:
+            self.head_content = self.head_content or other.head_content
+            self.closed, self.middle_count, self.tail_content = True, other.middle_count, other.tail_content
+        elif not other.closed:
+            self.tail_content = self.tail_content or other.head_content
+        else:
+            self.middle_count += int(self.tail_content or other.head_content) + other.middle_count
+            self.tail_content = other.tail_content
+        return self
+
+    def result(self) -> int:
+        return int(self.head_content) + (self.middle_count + int(self.tail_content) if self.closed else 0)
+
+
+class NgramAccumulator:
+    """
+    N-gram counts over a token stream. The first and last (max n - 1) tokens are kept
+    so that n-grams spanning two merged partials can be counted.
+    With `top_k_capacity`, counts are approximate (one SpaceSavingCounter per n).
+    """
+
+    def __init__(self, n_values: Iterable[int], top_k_capacity: Optional[int] = None) -> None:
+        self.n_values: List[int] = [n for n in n_values if n > 0]
+        self.top_k_capacity: Optional[int] = top_k_capacity
+        self.window: int = max(self.n_values, default=1) - 1
+        self.counts: Dict[int, Any] = {n: _new_counter(top_k_capacity) for n in self.n_values}
+        self.token_count: int = 0
+        self.head: List[str] = []
+        self.tail: List[str] = []
+
+    def update(self, tokens: List[str]) -> None:
+        other = NgramAccumulator(self.n_values, self.top_k_capacity)
+        for n, ngram_list in tp.generate_ngrams(tokens, self.n_values).items():
+            other.counts[n].update(" ".join(ngram_tuple) for ngram_tuple in ngram_list)
+        other.token_count = len(tokens)
+        other.head = tokens[:self.window]
+        other.tail = tokens[-self.window:] if self.window else []
+        self.merge(other)
+
+    def merge(self, other: 'NgramAccumulator') -> 'NgramAccumulator':
+        if not other.token_count:
+            return self
+        boundary: List[str] = self.tail + other.head
+        for n in self.n_values:
+            # Only n-grams starting in our tail and ending in other's head span the boundary
+            self.counts[n].update([" ".join(boundary[start:start + n]) for start in range(max(0, len(self.tail) - n + 1), len(self.tail)) if start + n <= len(boundary)])
+            _add_counts(self.counts[n], other.counts[n])
+        if self.token_count < self.window:
+            self.head = (self.head + other.head)[:self.window]
+        self.tail = (self.tail + other.tail)[-self.window:] if self.window else []
+        self.token_count += other.token_count
+        return self
+
+    def result(self) -> Dict[str, List[Tuple[str, int]]]:
+        """Same shape as the 'ngram_frequencies' section of analyze_text_complete."""
+        if not self.token_count:
+            return analysis.format_ngram_frequencies({})
+        return analysis.format_ngram_frequencies({analysis.ngram_name(n): counter for n, counter in self.counts.items() if counter})
+
+    def error_reports(self) -> Dict[str, Dict[str, Any]]:
+        """Per n-gram size error report of the approximate counts (empty when counting exactly)."""
+        return {analysis.ngram_name(n): counter.error_report() for n, counter in self.counts.items() if isinstance(counter, SpaceSavingCounter) and counter}
+
+
+class PatternAccumulator:
+    """First DEFAULT_PATTERN_MATCH_LIMIT matches of the common and user-defined regex patterns."""
+
+    def __init__(self, user_patterns: Optional[List[Dict[str, str]]] = None) -> None:
+        self.common_patterns: Dict[str, Any] = {}
+        self.user_defined_pattern_results: Dict[str, Any] = {}
+        self._compiled: List[Tuple[Dict[str, Any], str, Any]] = []
+        for pattern_name, regex_str in cfg.COMMON_PATTERNS.items():
+            self._add_pattern(self.common_patterns, pattern_name, regex_str)
+        for user_pattern_dict in user_patterns or []:
+            pattern_name = user_pattern_dict.get('name'); regex_str = user_pattern_dict.get('regex')
+            if not pattern_name or not regex_str:
+                self.user_defined_pattern_results[f"UnnamedPattern_{len(self.user_defined_pattern_results)}"] = {'error': 'Pattern name or regex string missing.'}
+                continue
+            self._add_pattern(self.user_defined_pattern_results, pattern_name, regex_str)
+
+    def _add_pattern(self, target: Dict[str, Any], pattern_name: str, regex_str: str) -> None:
+        try:
+            compiled = compile_pattern(regex_str)
+        except re.error as e:
+            target[pattern_name] = {'error': f"Invalid regex: {str(e)}"}
+            return
+        target[pattern_name] = []
+        self._compiled.append((target, pattern_name, compiled))
+
+    def update(self, piece: str) -> None:
+        pending_user_patterns: List[Tuple[str, str]] = []
+        for target, pattern_name, compiled in self._compiled:
+            matches = target[pattern_name]
+            if not isinstance(matches, list) or len(matches) >= cfg.DEFAULT_PATTERN_MATCH_LIMIT:
+                continue
+            if target is self.user_defined_pattern_results:
+                pending_user_patterns.append((pattern_name, compiled.pattern))
+            else:
+                matches.extend(find_matches(compiled, piece, cfg.DEFAULT_PATTERN_MATCH_LIMIT - len(matches))[0])
+        # User regexes are time-bounded like in analyze_text_complete; a timeout ends that pattern's scan
+        for pattern_name, piece_matches in match_user_patterns(piece, pending_user_patterns)[0].items():
+            matches = self.user_defined_pattern_results[pattern_name]
+            if isinstance(piece_matches, list):
+                matches.extend(piece_matches[:cfg.DEFAULT_PATTERN_MATCH_LIMIT - len(matches)])
+            else:
+                self.user_defined_pattern_results[pattern_name] = piece_matches
+
+    def merge(self, other: 'PatternAccumulator') -> 'PatternAccumulator':
+        for target, pattern_name, _ in self._compiled:
+            other_matches = (other.common_patterns if target is self.common_patterns else other.user_defined_pattern_results).get(pattern_name)
+            if isinstance(other_matches, dict): # The pattern failed (e.g. timed out) on the other span
+                target[pattern_name] = other_matches
+            elif isinstance(other_matches, list) and isinstance(target[pattern_name], list):
+                target[pattern_name] = (target[pattern_name] + other_matches)[:cfg.DEFAULT_PATTERN_MATCH_LIMIT]
+        return self
+
+
+class StreamingAnalysis:
+    """
+    Mergeable partial analysis of a text stream. Feed it whitespace-aligned pieces (see
+    `split_at_token_boundaries`) with `update`, combine partials of consecutive spans with
+    `merge`, and build the analyze_text_complete-style sections with `results`.
+    Only the accumulators needed for `sections` (result section names) are kept.
+    With `top_k_capacity`, word and n-gram counts are approximate and bounded in size, and
+    unique words are counted by a HyperLogLog sketch (`unique_words`).
+    """
+
+    def __init__(
+        self,
+        active_stop_words: Optional[Set[str]] = None,
+        user_patterns: Optional[List[Dict[str, str]]] = None,
+        sections: Optional[Iterable[str]] = None,
+        top_k_capacity: Optional[int] = None
+    ) -> None:
+        self.sections: List[str] = list(sections) if sections is not None else analysis.resolve_analyses(cfg.STREAMABLE_ANALYSES)
+        self.active_stop_words: Optional[Set[str]] = active_stop_words
+        self.character_count: int = 0
+        self.space_count: int = 0
+        self.word_counts: Any = _new_counter(top_k_capacity)
+        self.word_length_counts: Counter[int] = Counter()
+        self.unique_words: Optional[HyperLogLog] = HyperLogLog(cfg.HYPERLOGLOG_PRECISION) if top_k_capacity else None
+        self.removed_stop_words_count: int = 0
+        wanted = set(self.sections)
+        self.sentences: Optional[SentenceAccumulator] = SentenceAccumulator() if wanted & {'sentence_analysis', 'general_stats'} else None
+        self.paragraphs: Optional[ParagraphAccumulator] = ParagraphAccumulator() if 'general_stats' in wanted else None
+        self.ngrams: Optional[NgramAccumulator] = NgramAccumulator(cfg.DEFAULT_NGRAM_N_VALUES, top_k_capacity) if 'ngram_frequencies' in wanted else None
+        self.patterns: Optional[PatternAccumulator] = PatternAccumulator(user_patterns) if 'interesting_patterns' in wanted else None
+
+    def update(self, piece: str) -> None:
+        """Adds the next piece of text; it must start at a token boundary (see `split_at_token_boundaries`)."""
+        self.character_count += len(piece)
+        self.space_count += piece.count(' ')
+        tokens: List[str] = tp.tokenize_text(tp.clean_text_for_word_tokenization(piece, advanced=True))
+        if self.active_stop_words:
+            tokens, removed_count = tp.remove_stop_words(tokens, self.active_stop_words)
+            self.removed_stop_words_count += removed_count
+        self.word_counts.update(tokens)
+        self.word_length_counts.update(map(len, tokens))
+        if self.unique_words is not None: self.unique_words.update(tokens)
+        if self.ngrams is not None: self.ngrams.update(tokens)
+        if self.sentences is not None: self.sentences.update(piece)
+        if self.paragraphs is not None: self.paragraphs.update(piece)
+        if self.patterns is not None: self.patterns.update(piece)
+
+    def merge(self, other: 'StreamingAnalysis') -> 'StreamingAnalysis':
+        """Merges in the partial analysis of the text following ours (in place; returns self)."""
+        self.character_count += other.character_count
+        self.space_count += other.space_count
+        _add_counts(self.word_counts, other.word_counts)
+        self.word_length_counts.update(other.word_length_counts)
+        if self.unique_words is not None and other.unique_words is not None:
+            self.unique_words.merge(other.unique_words)
+        self.removed_stop_words_count += other.removed_stop_words_count
+        for name in ('sentences', 'paragraphs', 'ngrams', 'patterns'):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if mine is not None and theirs is not None:
+                mine.merge(theirs)
+        return self
+
+    def results(self, num_common_words_to_display: int = cfg.DEFAULT_TOP_WORDS_DISPLAY) -> Dict[str, Any]:
+        """
+        The selected result sections, in the same format as analyze_text_complete.
+        In approximate mode word frequencies cover the tracked words only; the total word
+        count stays exact and unique words / word variety use the HyperLogLog estimate.
+        """
+        approximate: bool = isinstance(self.word_counts, SpaceSavingCounter)
+        word_counts: Counter[str] = self.word_counts.counts if approximate else self.word_counts
+        total_words: Optional[int] = self.word_counts.total if approximate else None
+        unique_words: Optional[int] = self.unique_words.estimate() if self.unique_words is not None else None
+        word_stats: Dict[str, Any] = analysis.get_word_count_stats(word_counts, total_words=total_words, unique_words=unique_words)
+        sentence_analysis: Dict[str, Any] = self.sentences.result() if self.sentences is not None else {}
+        section_values: Dict[str, Any] = {}
+        if 'word_analysis' in self.sections:
+            section_values['word_analysis'] = analysis._stage_word_frequencies(word_counts, word_stats, self.removed_stop_words_count, max(0, num_common_words_to_display))['word_analysis']
+        if 'word_length_counts_obj' in self.sections:
+            section_values['word_length_counts_obj'] = self.word_length_counts
+        if 'sentence_analysis' in self.sections:
+            section_values['sentence_analysis'] = sentence_analysis
+        if 'general_stats' in self.sections:
+            section_values['general_stats'] = {'character_count': self.character_count, 'character_count_no_spaces': self.character_count - self.space_count, 'word_count': word_stats['total_words'], 'sentence_count': sentence_analysis['sentence_count'], 'paragraph_count': self.paragraphs.result()}
+        if 'interesting_patterns' in self.sections:
+            interesting_patterns: Dict[str, Any] = {}
+            if word_counts:
+                interesting_patterns = analysis.find_interesting_patterns(word_counts, '', total_words=total_words, unique_words=unique_words)
+                interesting_patterns['common_patterns'] = self.patterns.common_patterns
+                interesting_patterns['user_defined_pattern_results'] = self.patterns.user_defined_pattern_results
+            section_values['interesting_patterns'] = interesting_patterns
+        if 'ngram_frequencies' in self.sections:
+            section_values['ngram_frequencies'] = self.ngrams.result()
+        return section_values
+
+    def approximation_report(self) -> Dict[str, Any]:
+        """Error reports of the approximate counters behind the selected sections (empty when counting exactly)."""
+        report: Dict[str, Any] = {}
+        if isinstance(self.word_counts, SpaceSavingCounter) and 'word_analysis' in self.sections:
+            report['word_frequencies'] = self.word_counts.error_report()
+        if self.unique_words is not None and self.word_counts:
+            report['unique_words'] = {'estimate': self.unique_words.estimate(), 'relative_error': round(self.unique_words.relative_error, 4), 'precision': self.unique_words.precision}
+        if self.ngrams is not None and self.ngrams.top_k_capacity:
+            report['ngram_frequencies'] = self.ngrams.error_reports()
+        return report
+
+# =============================================================================
+# STREAMING ENTRY POINT
+# =============================================================================
+
+def resolve_stream_analyses(analyses: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Like `analysis.resolve_analyses`, restricted to `cfg.STREAMABLE_ANALYSES`.
+    None selects every streamable analysis.
+
+    Raises:
+        ValueError: If an unknown or non-streamable analysis is requested.
+    """
+    if analyses is None:
+        analyses = cfg.STREAMABLE_ANALYSES
+    elif isinstance(analyses, str):
+        analyses = [analyses]
+    sections: List[str] = analysis.resolve_analyses(analyses)
+    not_streamable = [name for name in analyses if name not in cfg.STREAMABLE_ANALYSES]
+    if not_streamable:
+        raise ValueError(f"Analysis not available in streaming mode: {', '.join(not_streamable)}. Available: {', '.join(cfg.STREAMABLE_ANALYSES)}")
+    return sections
+
+
+def analyze_text_stream(
+    chunks: Iterable[str],
+    active_stop_words: Optional[Set[str]] = None,
+    num_common_words_to_display: int = cfg.DEFAULT_TOP_WORDS_DISPLAY,
+    user_patterns: Optional[List[Dict[str, str]]] = None,
+    analyses: Optional[Iterable[str]] = None,
+    top_k_capacity: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Streaming counterpart of `analysis.analyze_text_complete` for inputs too large to load
+    at once, e.g. `analyze_text_stream(file_io.read_file_in_chunks(path))`.
+
+    Supports the analyses in `cfg.STREAMABLE_ANALYSES` (word frequencies, word lengths,
+    sentences, general stats, patterns, n-grams) and gives the same results for them as
+    analyze_text_complete on the joined text. Sections needing the whole document (readability,
+    sentiment, spaCy, keywords) keep their empty defaults. Neither the text nor the token
+    list is retained, so 'processed_tokens' is empty and there is no 'original_text'.
+
+    `top_k_capacity` bounds memory further: word and n-gram frequencies are then estimated
+    with Space-Saving summaries of that many entries each, and the result gains an
+    `_approximation` section with their error bounds (see `SpaceSavingCounter.error_report`).
+    """
+    try:
+        sections: List[str] = resolve_stream_analyses(analyses)
+    except ValueError as e:
+        return {**analysis._empty_results(), 'error': str(e)}
+
+    try:
+        partial = StreamingAnalysis(active_stop_words=active_stop_words, user_patterns=user_patterns, sections=sections, top_k_capacity=top_k_capacity)
+        for piece in split_at_token_boundaries(chunks):
+            partial.update(piece)
+        if not partial.character_count:
+            return {**analysis._empty_results(), 'error': 'No text provided for analysis'}
+        results: Dict[str, Any] = analysis._empty_results()
+        results.update(partial.results(num_common_words_to_display))
+        if top_k_capacity:
+            results['_approximation'] = partial.approximation_report()
+    except Exception as e:
+        results = {**analysis._empty_results(), 'error': f'Analysis failed: {type(e).__name__} - {str(e)}'}
+    return results
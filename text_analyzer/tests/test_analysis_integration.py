@@ -155,6 +155,26 @@ class TestAnalysisIntegration(unittest.TestCase):
         self.assertEqual(empty_sentiment['pos'], 0.0)
         self.assertEqual(empty_sentiment['compound'], 0.0)
 
+    def test_analyze_sentiment_by_sentence(self):
+        text = "this is wonderful! the chair is blue. the ending was horrible and sad."
+        results = analysis.analyze_sentiment_by_sentence(text, timeline_points=2)
+        self.assertEqual(results['sentence_count'], 3)
+        compounds = results['sentence_scores']['compound']
+        self.assertEqual(compounds[0], analysis._vader_analyzer.polarity_scores("this is wonderful!")['compound'])
+        self.assertGreater(compounds[0], 0)
+        self.assertLess(compounds[2], 0)
+        self.assertEqual(results['sentence_scores']['neu'][1], 1.0) # No lexicon word: neutral without running VADER
+        weights = [3, 4, 6] # Words per sentence
+        self.assertAlmostEqual(results['compound'], sum(c * w for c, w in zip(compounds, weights)) / sum(weights), places=4)
+        self.assertEqual(results['timeline']['positions'], [25.0, 75.0])
+        self.assertEqual(len(results['timeline']['compound']), 2)
+
+        via_pipeline = analysis.analyze_text_complete(text, analyses=['sentiment'], sentiment_mode='sentence')
+        self.assertEqual(via_pipeline['sentiment_analysis']['sentence_scores'], results['sentence_scores'])
+        self.assertEqual(via_pipeline['sentiment_analysis']['compound'], results['compound'])
+        self.assertNotIn('timeline', analysis.analyze_text_complete(text, analyses=['sentiment'])['sentiment_analysis'])
+        self.assertIn('sentiment mode', analysis.analyze_text_complete(text, analyses=['sentiment'], sentiment_mode='paragraph')['error'])
+
     def test_analyze_pos_tags_spacy_and_lexical_density(self):
         # This test uses the actual spaCy model if available.
         # Ensure your environment has 'en_core_web_sm' for this to pass.
@@ -298,6 +318,129 @@ class TestAnalysisIntegration(unittest.TestCase):
         # Ensure all keys are still present due to default structures
         self.assertTrue(all(key in empty_results for key in ['ngram_frequencies', 'sentiment_analysis', 'pos_analysis', 'ner_analysis']))
 
+    def test_analyze_text_complete_parses_spacy_doc_once(self):
+        mock_doc = MockSpacyDoc(
+            [MockSpacyToken("visit", "VERB"), MockSpacyToken("london", "PROPN"), MockSpacyToken(".", "PUNCT", is_punct=True)],
+            ents=[MockSpacyToken("london", "PROPN", label_="GPE")]
+        )
+        mock_nlp = mock.MagicMock(return_value=mock_doc)
+        with mock.patch.object(analysis, '_get_nlp_model', return_value=mock_nlp):
+            results = analysis.analyze_text_complete("Visit London.", active_stop_words=set())
+
+        mock_nlp.assert_called_once() # POS and NER share one parse
+        self.assertEqual(results['pos_analysis']['total_pos_tags'], 2)
+        self.assertEqual(results['ner_analysis']['total_entities'], 1)
+        self.assertEqual(results['ner_analysis']['entities_by_type'], {'GPE': ['london']})
+
+    def test_spacy_model_profile_follows_selected_analyses(self):
+        mock_nlp = mock.MagicMock(return_value=MockSpacyDoc([MockSpacyToken("dogs", "NOUN")]))
+        for analyses, profile in ((['pos'], 'pos'), (['ner'], 'ner'), (['pos', 'ner'], 'pos_ner'), (None, 'pos_ner')):
+            with self.subTest(analyses=analyses), mock.patch.object(analysis, '_get_nlp_model', return_value=mock_nlp) as mock_get_model:
+                analysis.analyze_text_complete("Dogs bark.", analyses=analyses)
+                mock_get_model.assert_called_once_with(profile)
+        self.assertEqual(analysis.select_spacy_profile(['tokens', 'ngrams']), 'full')
+
+    @mock.patch('spacy.load')
+    def test_spacy_model_profiles_load_and_cache_separately(self, mock_spacy_load):
+        mock_spacy_load.side_effect = lambda name, exclude: ('model', tuple(exclude))
+        with mock.patch.dict(analysis._nlp_profile_models, clear=True):
+            pos_model = analysis._get_nlp_model('pos')
+            self.assertIs(analysis._get_nlp_model('pos'), pos_model)
+            self.assertEqual(pos_model[1], tuple(cfg.SPACY_MODEL_PROFILES['pos']))
+            self.assertIn('ner', pos_model[1])
+            self.assertIn('tagger', analysis._get_nlp_model('ner')[1])
+        self.assertEqual(mock_spacy_load.call_count, 2)
+
+    def test_spacy_stages_accept_pre_parsed_doc(self):
+        mock_doc = MockSpacyDoc([MockSpacyToken("dogs", "NOUN"), MockSpacyToken("bark", "VERB")])
+        with mock.patch.object(analysis, '_get_nlp_model') as mock_get_model:
+            pos_results = analysis.analyze_pos_tags_spacy("dogs bark", doc=mock_doc)
+            ner_results = analysis.analyze_ner_spacy("dogs bark", doc=mock_doc)
+        mock_get_model.assert_not_called()
+        self.assertEqual(pos_results['pos_counts'], Counter({'NOUN': 1, 'VERB': 1}))
+        self.assertEqual(ner_results['total_entities'], 0)
+
+    def test_plan_analysis_only_includes_required_stages(self):
+        self.assertEqual(analysis.plan_analysis(['word_frequencies']), ['tokens', 'word_counts', 'word_frequencies'])
+        readability_plan = analysis.plan_analysis(['readability'])
+        self.assertIn('sentences', readability_plan)
+        self.assertNotIn('spacy_doc', readability_plan)
+        self.assertLess(readability_plan.index('sentences'), readability_plan.index('readability'))
+        self.assertIn('spacy_doc', analysis.plan_analysis(['ner']))
+
+    def test_analyze_text_complete_selected_analyses(self):
+        with mock.patch.object(analysis, '_get_nlp_model') as mock_get_model:
+            results = analysis.analyze_text_complete("Cats chase mice. Mice flee cats.", active_stop_words=set(), analyses=['word_frequencies'])
+        mock_get_model.assert_not_called() # spaCy work is skipped entirely
+        self.assertIsNone(results.get('error'))
+        self.assertEqual(results['word_analysis']['word_frequencies']['cats'], 2)
+        self.assertEqual(results['sentence_analysis'], {}) # Not selected: left at its empty default
+        self.assertEqual(results['pos_analysis']['total_pos_tags'], 0)
+
+        unknown = analysis.analyze_text_complete("Some text.", analyses=['word_frequencies', 'astrology'])
+        self.assertIn('astrology', unknown['error'])
+
+    def test_analyze_text_complete_diagnostics(self):
+        text = "One fish. Two fish. Red fish, blue fish."
+        plain = analysis.analyze_text_complete(text, analyses=['ngrams'])
+        self.assertNotIn('_diagnostics', plain) # Opt-in only
+
+        timed = analysis.analyze_text_complete(text, analyses=['ngrams'], diagnostics=True)
+        diagnostics = timed['_diagnostics']
+        self.assertEqual(list(diagnostics['stages']), ['tokens', 'ngrams'])
+        self.assertFalse(diagnostics['memory_traced'])
+        self.assertIsNone(diagnostics['stages']['ngrams']['peak_memory_bytes'])
+        self.assertGreaterEqual(diagnostics['total_seconds'], diagnostics['stages']['ngrams']['seconds'])
+
+        traced = analysis.analyze_text_complete(text, analyses=['ngrams'], trace_memory=True)
+        self.assertTrue(traced['_diagnostics']['memory_traced'])
+        self.assertGreater(traced['_diagnostics']['stages']['tokens']['peak_memory_bytes'], 0)
+
+    def test_analyze_text_complete_concurrent_executors_match_sequential(self):
+        text = "One fish. Two fish. Red fish, blue fish. Cats like fish, and the fish like cats!"
+        analyses = ['word_frequencies', 'word_lengths', 'sentences', 'general_stats', 'readability', 'patterns', 'ngrams', 'sentiment']
+        sequential = analysis.analyze_text_complete(text, analyses=analyses)
+        for executor in ('thread', 'process'):
+            with self.subTest(executor=executor):
+                concurrent = analysis.analyze_text_complete(text, analyses=analyses, executor=executor, max_workers=2)
+                self.assertEqual(concurrent, sequential)
+
+    def test_analyze_text_complete_approximate_ngrams(self):
+        text = "the cat sat on the mat and the cat ran. " * 5
+        exact = analysis.analyze_text_complete(text, analyses=['ngrams'])
+        self.assertNotIn('_approximation', exact)
+        approximate = analysis.analyze_text_complete(text, analyses=['ngrams'], top_k_capacity=3)
+        bigram_report = approximate['_approximation']['ngram_frequencies']['bigrams']
+        self.assertEqual(bigram_report['tracked'], 3)
+        self.assertEqual(bigram_report['total'], len(approximate['processed_tokens']) - 1)
+        self.assertEqual(approximate['ngram_frequencies']['bigrams'][0], exact['ngram_frequencies']['bigrams'][0])
+
+    def test_analyze_texts_batch_matches_single_document_analysis(self):
+        texts = ["One fish. Two fish.", "", "Red fish, blue fish! Cats like fish.", "The cat sat on the mat."]
+        analyses = ['word_frequencies', 'word_lengths', 'sentences', 'general_stats', 'readability', 'patterns', 'ngrams', 'sentiment', 'keywords']
+        expected = [analysis.analyze_text_complete(text, active_stop_words={'the'}, analyses=analyses) for text in texts]
+        for n_process in (1, 2):
+            with self.subTest(n_process=n_process):
+                batch = analysis.analyze_texts_batch(texts, active_stop_words={'the'}, analyses=analyses, batch_size=2, n_process=n_process)
+                self.assertEqual(batch, expected)
+        self.assertIn('astrology', analysis.analyze_texts_batch(["Some text."], analyses=['astrology'])[0]['error'])
+
+    def test_analyze_texts_batch_parses_with_nlp_pipe(self):
+        docs = [
+            MockSpacyDoc([MockSpacyToken("visit", "VERB"), MockSpacyToken("london", "PROPN")], ents=[MockSpacyToken("london", "PROPN", label_="GPE")]),
+            MockSpacyDoc([MockSpacyToken("dogs", "NOUN"), MockSpacyToken(".", "PUNCT", is_punct=True)]),
+        ]
+        mock_nlp = mock.MagicMock()
+        mock_nlp.pipe.return_value = iter(docs)
+        with mock.patch.object(analysis, '_get_nlp_model', return_value=mock_nlp):
+            results = analysis.analyze_texts_batch(["Visit London.", "   ", "Dogs."], analyses=['pos', 'ner'], batch_size=16)
+
+        mock_nlp.assert_not_called() # Every document goes through the single pipe call
+        self.assertEqual(mock_nlp.pipe.call_args.kwargs, {'batch_size': 16, 'n_process': 1})
+        self.assertEqual(results[0]['ner_analysis']['entities_by_type'], {'GPE': ['london']})
+        self.assertIn('empty', results[1]['pos_analysis']['error'])
+        self.assertEqual(results[2]['pos_analysis']['pos_counts'], Counter({'NOUN': 1}))
+
     @mock.patch('text_analyzer.file_io.load_custom_stopwords')
     @mock.patch('text_analyzer.file_io.get_nltk_stopwords')
     def test_analyze_text_complete_with_dynamic_stopwords(self, mock_get_nltk_stopwords, mock_load_custom_stopwords):
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from collections import Counter
+
+from text_analyzer import analysis, sentence_index
+from text_analyzer.result_cache import ResultCache
+
+SAMPLE_TEXT = "Apples are red. Bananas are yellow. Red apples are sweet."
+ANALYSES = ['word_frequencies', 'word_lengths', 'general_stats']
+
+
+class TestCompactAnalysisResult(unittest.TestCase):
+
+    def test_heavy_members_are_left_out_by_default(self):
+        eager = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES)
+        compact = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True)
+        self.assertIsInstance(compact, analysis.CompactAnalysisResult)
+        self.assertFalse(hasattr(compact, '__dict__'))
+        self.assertNotIn('original_text', compact)
+        self.assertNotIn('processed_tokens', compact)
+        self.assertEqual(compact.get('processed_tokens', []), [])
+        self.assertNotIn('full_word_counts_obj', compact['word_analysis'])
+        self.assertEqual(compact['word_analysis']['word_frequencies'], eager['word_analysis']['word_frequencies'])
+        self.assertEqual(compact.get('general_stats'), eager['general_stats'])
+        self.assertEqual(compact['word_length_counts_obj'], eager['word_length_counts_obj'])
+
+    def test_kept_members_are_references(self):
+        compact = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True,
+                                                 keep=('original_text', 'processed_tokens', 'full_word_counts_obj'))
+        self.assertIs(compact['original_text'], SAMPLE_TEXT)
+        self.assertEqual(list(compact['processed_tokens'])[:2], ['apples', 'are'])
+        self.assertIs(compact['word_analysis']['full_word_counts_obj'], compact.full_word_counts)
+        self.assertEqual(compact.full_word_counts['apples'], 2)
+        self.assertIsInstance(compact.full_word_counts, Counter)
+
+    def test_text_key_finds_cached_sentences(self):
+        compact = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True)
+        self.assertIsNone(analysis.get_sentences_for_text_key('zz', 'apples'))
+        analysis.get_sentence_index(SAMPLE_TEXT)
+        self.assertEqual(analysis.get_sentences_for_text_key(compact.text_key, 'apples'), ['Apples are red.', 'Red apples are sweet.'])
+
+    def test_text_key_finds_text_stored_by_another_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            compact = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True, cache=ResultCache(disk_dir=directory))
+            sentence_index._index_cache.clear()
+            other_process_cache = ResultCache(disk_dir=directory)
+            self.assertEqual(analysis.get_sentences_for_text_key(compact.text_key, 'bananas', cache=other_process_cache), ['Bananas are yellow.'])
+            self.assertIsNone(analysis.get_sentences_for_text_key('00' * 16, 'bananas', cache=other_process_cache))
+
+    def test_compact_runs_cache_only_the_compact_result(self):
+        cache = ResultCache()
+        first = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True, keep=('original_text',), cache=cache)
+        again = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True, keep=('original_text',), cache=cache)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertIsInstance(again, analysis.CompactAnalysisResult)
+        self.assertIs(again['original_text'], SAMPLE_TEXT)
+        self.assertEqual(dict(again), dict(first))
+        full = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, cache=cache) # Not served the compact entry
+        self.assertIn('full_word_counts_obj', full['word_analysis'])
+
+    def test_errors_are_reported(self):
+        self.assertIn('No text', analysis.analyze_text_complete("", compact=True)['error'])
+        self.assertIn('Unknown result member', analysis.analyze_text_complete(SAMPLE_TEXT, compact=True, keep=['nope'])['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
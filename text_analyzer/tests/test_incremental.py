@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+from text_analyzer import analysis, incremental
+from text_analyzer import config as cfg
+
+PARAGRAPHS = [
+    "I love this wonderful city. The parks are green and quiet!",
+    "Traffic is terrible in the morning. Visit http://example.com for maps.",
+    "  The food is great, the food is cheap. Would you stay?",
+]
+SAMPLE_TEXT = "\n\n".join(PARAGRAPHS) + "\n"
+ANALYSES = [name for name in cfg.ANALYSIS_SECTIONS if name not in ('pos', 'ner')] # spaCy runs on the whole text every time
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        incremental._paragraph_cache.clear()
+
+    def test_split_paragraphs_keeps_every_character(self):
+        pieces = incremental.split_paragraphs(" One.\n\n \nTwo.\nStill two.\n\nThree.\n\n")
+        self.assertEqual(pieces, [" One.\n\n \n", "Two.\nStill two.\n\n", "Three.\n\n"])
+        self.assertEqual(incremental.split_paragraphs("single"), ["single"])
+
+    def test_results_match_full_analysis(self):
+        user_patterns = [{'name': 'Food', 'regex': r'fo+d'}]
+        for stop_words in (None, cfg.STOP_WORDS):
+            for sentiment_mode in cfg.SENTIMENT_MODES:
+                with self.subTest(stop_words=bool(stop_words), sentiment_mode=sentiment_mode):
+                    full = analysis.analyze_text_complete(SAMPLE_TEXT, active_stop_words=stop_words, user_patterns=user_patterns,
+                                                          analyses=ANALYSES, sentiment_mode=sentiment_mode)
+                    results = incremental.analyze_text_incremental(SAMPLE_TEXT, active_stop_words=stop_words, user_patterns=user_patterns,
+                                                                   analyses=ANALYSES, sentiment_mode=sentiment_mode)
+                    for section in cfg.ANALYSIS_SECTIONS.values():
+                        self.assertEqual(results[section], full[section], section)
+                    self.assertEqual(results['original_text'], SAMPLE_TEXT)
+
+    def test_sentences_spanning_a_paragraph_break_match_full_analysis(self):
+        text = ("Title\n\nBody sentence with a great idea. It is not finished\n\n"
+                "here, the sentence goes on!\n\n- a list item\n- another item\n\nThe end.")
+        self.assertEqual(incremental.split_paragraphs(text)[0], "Title\n\nBody sentence with a great idea. It is not finished\n\nhere, the sentence goes on!\n\n")
+        for sentiment_mode in cfg.SENTIMENT_MODES:
+            with self.subTest(sentiment_mode=sentiment_mode):
+                full = analysis.analyze_text_complete(text, active_stop_words=cfg.STOP_WORDS, sentiment_mode=sentiment_mode)
+                results = incremental.analyze_text_incremental(text, active_stop_words=cfg.STOP_WORDS, sentiment_mode=sentiment_mode)
+                for section in cfg.ANALYSIS_SECTIONS.values():
+                    self.assertEqual(results[section], full[section], section)
+
+    def test_only_changed_paragraphs_are_analyzed(self):
+        with mock.patch.object(incremental, 'analyze_paragraph', wraps=incremental.analyze_paragraph) as analyze_paragraph:
+            incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=ANALYSES, sentiment_mode='sentence')
+            self.assertEqual(analyze_paragraph.call_count, 3)
+            edited = SAMPLE_TEXT.replace("terrible", "light")
+            results = incremental.analyze_text_incremental(edited, analyses=ANALYSES, sentiment_mode='sentence')
+            self.assertEqual(analyze_paragraph.call_count, 4)
+            # Other settings give other partials
+            incremental.analyze_text_incremental(edited, active_stop_words=cfg.STOP_WORDS, analyses=ANALYSES, sentiment_mode='sentence')
+            self.assertEqual(analyze_paragraph.call_count, 7)
+        full = analysis.analyze_text_complete(edited, analyses=ANALYSES, sentiment_mode='sentence')
+        self.assertEqual(results['sentiment_analysis'], full['sentiment_analysis'])
+        self.assertEqual(results['word_analysis'], full['word_analysis'])
+
+    def test_compact_results_match_full_analysis(self):
+        full = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, compact=True)
+        results = incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=ANALYSES, compact=True)
+        self.assertIsInstance(results, analysis.CompactAnalysisResult)
+        self.assertEqual(results.text_key, full.text_key)
+        self.assertEqual(dict(results), dict(full))
+
+    def test_cache_is_bounded(self):
+        incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=['word_frequencies'], cache_size=2)
+        self.assertEqual(len(incremental._paragraph_cache), 2)
+
+    def test_errors_are_reported(self):
+        self.assertEqual(incremental.analyze_text_incremental("")['error'], 'No text provided for analysis')
+        self.assertIn('Unknown analysis', incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=['bogus'])['error'])
+        self.assertIn('Unknown sentiment mode', incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=['sentiment'], sentiment_mode='bogus')['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
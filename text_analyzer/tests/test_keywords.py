@@ -0,0 +1,67 @@
+import unittest
+
+from text_analyzer import analysis, keywords
+from text_analyzer import config as cfg
+from text_analyzer.sentence_index import SentenceTable
+
+SAMPLE_TEXT = "compatibility of systems of linear constraints over the set of natural numbers."
+SAMPLE_STOP_WORDS = {'of', 'over', 'the'}
+
+
+class TestRakeKeywords(unittest.TestCase):
+
+    def test_ranking_matches_rake_scores(self):
+        tables = keywords.build_rake_tables(SAMPLE_TEXT, stop_words=SAMPLE_STOP_WORDS)
+        self.assertEqual(keywords.rank_keywords(tables, 10), [
+            ('natural numbers', 4.0), ('linear constraints', 4.0),
+            ('systems', 1.0), ('set', 1.0), ('compatibility', 1.0),
+        ])
+        self.assertEqual(keywords.rank_keywords(tables, 2), [('natural numbers', 4.0), ('linear constraints', 4.0)])
+
+    def test_phrases_break_at_punctuation_and_sentences(self):
+        text = "red apples, green apples. red apples"
+        tables = keywords.build_rake_tables(text, SentenceTable(text), stop_words={'the'})
+        self.assertEqual(tables.phrase_counts, {('red', 'apples'): 2, ('green', 'apples'): 1})
+        self.assertEqual(tables.frequency, {'red': 2, 'apples': 3, 'green': 1})
+        self.assertEqual(tables.degree, {'red': 4, 'apples': 6, 'green': 2})
+        # Repeated phrases are ranked once
+        self.assertEqual(keywords.rank_keywords(tables), [('red apples', 4.0), ('green apples', 4.0)])
+
+    def test_words_are_tokenized_like_the_pipeline(self):
+        text = "He said: It's great. don't e-mail me, well-known rock--roll"
+        tables = keywords.build_rake_tables(text, stop_words=set())
+        self.assertEqual(set(tables.phrase_counts), {('said',), ('great',), ('email',), ('wellknown', 'rock'), ('roll',)})
+        # Contracted stop words are matched in their tokenized form
+        self.assertIn('dont', keywords.RAKE_STOP_WORDS)
+        self.assertNotIn('t', {word for phrase in tables.phrase_counts for word in phrase})
+
+    def test_extract_keywords_uses_active_stop_words(self):
+        keywords._tables_cache.clear()
+        with_stop_words = analysis.extract_keywords_rake(SAMPLE_TEXT, num_keywords=10, active_stop_words=SAMPLE_STOP_WORDS)
+        self.assertIn(('linear constraints', 4.0), with_stop_words)
+        # Without active stop words the RAKE list still splits phrases
+        default = analysis.extract_keywords_rake("the cat and the dog", num_keywords=10)
+        self.assertTrue({'the', 'and'} <= cfg.RAKE_STOP_WORDS)
+        self.assertEqual(default, [('dog', 1.0), ('cat', 1.0)])
+        # Active stop words are added to it
+        self.assertEqual(analysis.extract_keywords_rake("red cat and big dog", num_keywords=10, active_stop_words={'big'}),
+                         [('red cat', 4.0), ('dog', 1.0)])
+        self.assertEqual(analysis.extract_keywords_rake("   ", num_keywords=10), [])
+
+    def test_tables_are_cached_per_text_and_stop_words(self):
+        keywords._tables_cache.clear()
+        first = keywords.get_rake_tables(SAMPLE_TEXT, stop_words=SAMPLE_STOP_WORDS)
+        self.assertIs(keywords.get_rake_tables(SAMPLE_TEXT, stop_words=set(SAMPLE_STOP_WORDS)), first)
+        self.assertIsNot(keywords.get_rake_tables(SAMPLE_TEXT, stop_words={'systems'}), first)
+        keywords.get_rake_tables("another text", cache_size=1)
+        self.assertEqual(len(keywords._tables_cache), 1)
+
+    def test_keywords_stage_uses_pipeline_stop_words(self):
+        results = analysis.analyze_text_complete(
+            SAMPLE_TEXT, active_stop_words=SAMPLE_STOP_WORDS, num_common_words_to_display=5,
+            user_patterns=None, analyses=['keywords'])
+        self.assertEqual(results['keyword_analysis'][:2], [('natural numbers', 4.0), ('linear constraints', 4.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from text_analyzer import analysis, file_io
+
+SAMPLE_TEXT = "The quick brown fox jumps over the lazy dog. It was a great day! The dog slept."
+ANALYSES = ['word_frequencies', 'general_stats', 'readability', 'sentiment', 'ngrams', 'patterns']
+
+
+class TestLazyAnalysisResult(unittest.TestCase):
+
+    def test_sections_are_computed_on_first_access(self):
+        results = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, lazy=True)
+        self.assertIsInstance(results, analysis.AnalysisResult)
+        self.assertNotIn('sentiment_analysis', results._context.values)
+        self.assertEqual(results.get('general_stats')['sentence_count'], 3)
+        self.assertNotIn('general_stats', results.pending)
+        self.assertIn('sentiment_analysis', results.pending)
+        self.assertNotIn('sentiment_analysis', results._context.values)
+        self.assertIsNone(results.get('error'))
+        # Unselected sections keep their empty defaults without running anything
+        self.assertEqual(results['keyword_analysis'], [])
+
+    def test_matches_eager_result(self):
+        eager = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, top_k_capacity=50)
+        lazy = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, top_k_capacity=50, lazy=True)
+        self.assertEqual(list(lazy), list(eager))
+        self.assertEqual(lazy.to_dict(), eager)
+        self.assertEqual(lazy.pending, [])
+
+    def test_failing_section_reports_error_when_read(self):
+        results = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, lazy=True)
+        with mock.patch.object(analysis, 'calculate_readability_stats', side_effect=RuntimeError('boom')):
+            readability = results['readability_stats']
+        self.assertEqual(readability['flesch_reading_ease'], 'N/A')
+        self.assertEqual(results['error'], 'Analysis failed: RuntimeError - boom')
+        self.assertEqual(results['general_stats']['sentence_count'], 3)
+
+    def test_input_errors_and_diagnostics_stay_eager(self):
+        self.assertIn('error', analysis.analyze_text_complete("", lazy=True))
+        self.assertIn('Unknown analysis', analysis.analyze_text_complete(SAMPLE_TEXT, analyses=['nope'], lazy=True)['error'])
+        self.assertIsInstance(analysis.analyze_text_complete(SAMPLE_TEXT, analyses=['general_stats'], diagnostics=True, lazy=True), dict)
+
+    def test_json_export_computes_pending_sections(self):
+        results = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=['word_frequencies'], lazy=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "results.json")
+            file_io._save_results_to_json(results, path)
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+        self.assertEqual(saved['word_analysis']['statistics']['total_words'], results['word_analysis']['statistics']['total_words'])
+
+
+if __name__ == '__main__':
+    unittest.main()
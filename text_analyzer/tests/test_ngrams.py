@@ -0,0 +1,38 @@
+import unittest
+from collections import Counter
+
+from text_analyzer import analysis, ngrams
+from text_analyzer import text_processing as tp
+
+
+def counter_top_ngrams(tokens, n, top_n):
+    return Counter(" ".join(ngram) for ngram in tp.generate_ngrams(tokens, [n])[n]).most_common(top_n)
+
+
+class TestIntegerNgramCounter(unittest.TestCase):
+
+    def test_matches_counter_up_to_pentagrams(self):
+        tokens = "the cat sat on the mat the cat sat on the hat and the cat ran".split() * 3
+        top = ngrams.count_top_ngrams(tokens, [1, 2, 3, 4, 5], 7)
+        for n in range(1, 6):
+            self.assertEqual(top[n], counter_top_ngrams(tokens, n, 7))
+        self.assertEqual(top[2][0], ("the cat", 9))
+
+    def test_ties_keep_first_occurrence_order(self):
+        top = ngrams.count_top_ngrams(["x", "y", "z", "x", "y", "z"], [2], 3)
+        self.assertEqual(top[2], [("x y", 2), ("y z", 2), ("z x", 1)])
+
+    def test_sizes_without_ngrams_are_left_out(self):
+        self.assertEqual(ngrams.count_top_ngrams(["one", "two"], [0, 2, 3], 5), {2: [("one two", 1)]})
+        self.assertEqual(ngrams.count_top_ngrams([], [2, 3], 5), {})
+
+    def test_ngram_stage_uses_names_and_empty_defaults(self):
+        results = analysis.analyze_text_complete("alpha beta gamma alpha beta.", None, 5, None, analyses=['ngrams'])
+        self.assertEqual(results['ngram_frequencies']['bigrams'][0], ("alpha beta", 2))
+        self.assertEqual(results['ngram_frequencies']['trigrams'][0], ("alpha beta gamma", 1))
+        empty = analysis.analyze_text_complete("alpha.", None, 5, None, analyses=['ngrams'])
+        self.assertEqual(empty['ngram_frequencies'], {'bigrams': [], 'trigrams': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import re
+import unittest
+from collections import Counter
+from unittest import mock
+
+from text_analyzer import analysis, pattern_engine
+from text_analyzer import config as cfg
+
+SAMPLE_TEXT = "Mail ann@example.com or bob@test.org, then visit https://example.com and http://test.org/a."
+
+
+class TestPatternEngine(unittest.TestCase):
+
+    def test_compiled_patterns_are_cached(self):
+        pattern_engine.compile_pattern.cache_clear()
+        first = pattern_engine.compile_pattern(r'\w+@\w+')
+        self.assertIs(pattern_engine.compile_pattern(r'\w+@\w+'), first)
+        self.assertEqual(pattern_engine.compile_pattern.cache_info().hits, 1)
+
+    def test_matches_follow_findall_and_stop_at_limit(self):
+        for regex in [r'\w+@\w+', r'(\w+)@\w+', r'(\w+)@(\w+)\.(com)?', r'x*']:
+            compiled = pattern_engine.compile_pattern(regex)
+            expected = re.findall(regex, SAMPLE_TEXT)
+            self.assertEqual(pattern_engine.find_matches(compiled, SAMPLE_TEXT, 1), (expected[:1], None))
+            self.assertEqual(pattern_engine.find_matches(compiled, SAMPLE_TEXT, 1, count_matches=True), (expected[:1], len(expected)))
+
+    def test_match_patterns_reports_errors_and_totals(self):
+        results, totals = pattern_engine.match_patterns(SAMPLE_TEXT, [('emails', r'\w+@\w+'), ('broken', r'[a-')], limit=1, count_matches=True)
+        self.assertEqual(results['emails'], ['ann@example'])
+        self.assertIn('Invalid regex', results['broken']['error'])
+        self.assertEqual(totals, {'emails': 2})
+
+    def test_find_interesting_patterns_counts_matches(self):
+        user_patterns = [{'name': 'Emails', 'regex': r'\w+@\w+\.\w+'}, {'name': '', 'regex': 'x'}]
+        patterns = analysis.find_interesting_patterns(Counter(mail=1), SAMPLE_TEXT, user_patterns=user_patterns, count_matches=True)
+        self.assertEqual(patterns['user_defined_pattern_results']['Emails'], ['ann@example.com', 'bob@test.org'])
+        self.assertIn('error', patterns['user_defined_pattern_results']['UnnamedPattern_1'])
+        self.assertEqual(patterns['pattern_match_counts']['user_defined_pattern_results'], {'Emails': 2})
+        self.assertEqual(set(patterns['pattern_match_counts']['common_patterns']), set(cfg.COMMON_PATTERNS))
+        self.assertNotIn('pattern_match_counts', analysis.find_interesting_patterns(Counter(mail=1), SAMPLE_TEXT))
+
+
+class TestUserPatternTimeouts(unittest.TestCase):
+    BACKTRACKING_TEXT = "a" * 40 + "b aaa"
+
+    def test_timed_out_pattern_does_not_block_the_rest(self):
+        named_patterns = [('Backtracking', r'(a+)+$'), ('Triples', r'a{3}'), ('Broken', r'(')]
+        results, _ = pattern_engine.match_patterns_isolated(self.BACKTRACKING_TEXT, named_patterns, limit=2, timeout=0.3)
+        self.assertEqual(results['Backtracking'], {'error': 'timeout'})
+        self.assertEqual(results['Triples'], ['aaa', 'aaa'])
+        self.assertIn('Invalid regex', results['Broken']['error'])
+
+    def test_isolated_matching_agrees_with_in_process_matching(self):
+        named_patterns = [('Emails', r'(\w+)@(\w+)'), ('Words', r'\b\w{3}\b')]
+        self.assertEqual(pattern_engine.match_patterns_isolated(SAMPLE_TEXT, named_patterns, count_matches=True),
+                         pattern_engine.match_patterns(SAMPLE_TEXT, named_patterns, count_matches=True))
+
+    def test_workers_are_reused_until_a_timeout(self):
+        pattern_engine.shutdown_pattern_workers()
+        with mock.patch.object(pattern_engine, 'PatternWorker', wraps=pattern_engine.PatternWorker) as start_worker:
+            for _ in range(3):
+                pattern_engine.match_patterns_isolated(SAMPLE_TEXT, [('Words', r'\b\w{3}\b')])
+            self.assertEqual(start_worker.call_count, 1)
+            pattern_engine.match_patterns_isolated(self.BACKTRACKING_TEXT, [('Backtracking', r'(a+)+$'), ('Triples', r'a{3}')], timeout=0.3)
+            self.assertEqual(start_worker.call_count, 2) # The overrunning worker was replaced
+            self.assertEqual(len(pattern_engine._idle_workers), 1)
+        pattern_engine.shutdown_pattern_workers()
+        self.assertEqual(pattern_engine._idle_workers, [])
+
+    def test_dead_idle_worker_is_replaced_without_losing_a_pattern(self):
+        pattern_engine.shutdown_pattern_workers()
+        named_patterns = [('Words', r'\b\w{3}\b'), ('Emails', r'(\w+)@(\w+)')]
+        pattern_engine.match_patterns_isolated(SAMPLE_TEXT, named_patterns)
+        idle = pattern_engine._idle_workers[0]
+        idle.process.kill()
+        idle.process.join()
+        # The worker died after passing the is_alive() check: the send fails and the job is retried
+        with mock.patch.object(pattern_engine.PatternWorker, 'is_alive', return_value=True):
+            results = pattern_engine.match_patterns_isolated(SAMPLE_TEXT, named_patterns)
+        self.assertEqual(results, pattern_engine.match_patterns(SAMPLE_TEXT, named_patterns))
+        pattern_engine.shutdown_pattern_workers()
+
+    @mock.patch.object(cfg, 'USER_PATTERN_TIMEOUT_SECONDS', 0.3)
+    def test_analysis_reports_timeout_in_user_results(self):
+        user_patterns = [{'name': 'Backtracking', 'regex': r'(a+)+$'}, {'name': '', 'regex': ''}, {'name': 'Triples', 'regex': r'a{3}'}]
+        results = analysis.find_interesting_patterns(Counter(a=1), self.BACKTRACKING_TEXT, user_patterns=user_patterns)['user_defined_pattern_results']
+        self.assertEqual(list(results), ['Backtracking', 'UnnamedPattern_1', 'Triples'])
+        self.assertEqual(results['Backtracking'], {'error': 'timeout'})
+        self.assertEqual(results['Triples'][0], 'aaa')
+
+
+if __name__ == '__main__':
+    unittest.main()
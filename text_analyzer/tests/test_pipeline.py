@@ -0,0 +1,93 @@
+import threading
+import unittest
+
+from text_analyzer.pipeline import StageRegistry, run_stages
+
+
+def _build_registry() -> StageRegistry:
+    registry = StageRegistry()
+
+    @registry.register('upper', inputs=('text',), outputs=('upper_text',))
+    def _upper(text):
+        return {'upper_text': text.upper()}
+
+    @registry.register('words', inputs=('upper_text',), outputs=('words',))
+    def _words(upper_text):
+        return {'words': upper_text.split()}
+
+    @registry.register('length', inputs=('text',), outputs=('length',))
+    def _length(text):
+        return {'length': len(text)}
+
+    return registry
+
+
+class TestStageRegistry(unittest.TestCase):
+    def test_resolve_orders_dependencies_first(self):
+        registry = _build_registry()
+        plan = registry.resolve(['words'], provided=['text'])
+        self.assertEqual([stage.name for stage in plan], ['upper', 'words'])
+
+    def test_resolve_skips_unrelated_and_provided_values(self):
+        registry = _build_registry()
+        self.assertEqual([stage.name for stage in registry.resolve(['length'], provided=['text'])], ['length'])
+        self.assertEqual([stage.name for stage in registry.resolve(['words'], provided=['text', 'upper_text'])], ['words'])
+
+    def test_resolve_unknown_value_raises(self):
+        registry = _build_registry()
+        with self.assertRaises(ValueError):
+            registry.resolve(['missing'], provided=['text'])
+        with self.assertRaises(ValueError): # 'text' itself is not produced by any stage
+            registry.resolve(['words'])
+
+    def test_resolve_detects_cycles(self):
+        registry = StageRegistry()
+        registry.register('a', inputs=('b_value',), outputs=('a_value',))(lambda b_value: {})
+        registry.register('b', inputs=('a_value',), outputs=('b_value',))(lambda a_value: {})
+        with self.assertRaises(ValueError):
+            registry.resolve(['a_value'])
+
+    def test_duplicate_output_rejected(self):
+        registry = _build_registry()
+        with self.assertRaises(ValueError):
+            registry.register('other_upper', inputs=('text',), outputs=('upper_text',))(lambda text: {})
+
+    def test_run_stages_merges_outputs(self):
+        registry = _build_registry()
+        values = run_stages(registry.resolve(['words', 'length'], provided=['text']), {'text': 'two words'})
+        self.assertEqual(values['words'], ['TWO', 'WORDS'])
+        self.assertEqual(values['length'], 9)
+
+    def test_run_stages_thread_executor_runs_independent_stages_concurrently(self):
+        registry = StageRegistry()
+        barrier = threading.Barrier(2, timeout=5) # Breaks (and fails the test) if the stages run one after another
+        registry.register('left', inputs=('text',), outputs=('left',))(lambda text: {'left': barrier.wait() >= 0})
+        registry.register('right', inputs=('text',), outputs=('right',))(lambda text: {'right': barrier.wait() >= 0})
+        diagnostics = {}
+        values = run_stages(registry.resolve(['left', 'right'], provided=['text']), {'text': ''}, diagnostics=diagnostics, executor='thread', max_workers=2)
+        self.assertTrue(values['left'] and values['right'])
+        self.assertEqual(set(diagnostics), {'left', 'right'})
+
+    def test_run_stages_thread_executor_respects_dependencies(self):
+        registry = _build_registry()
+        values = run_stages(registry.resolve(['words', 'length'], provided=['text']), {'text': 'two words'}, executor='thread')
+        self.assertEqual(values['words'], ['TWO', 'WORDS'])
+        self.assertEqual(values['length'], 9)
+
+    def test_run_stages_releases_values_after_their_last_reader(self):
+        registry = _build_registry()
+        for executor in ('sequential', 'thread'):
+            with self.subTest(executor=executor):
+                values = run_stages(registry.resolve(['words', 'length'], provided=['text']), {'text': 'two words'},
+                                    executor=executor, release=['upper_text'])
+                self.assertNotIn('upper_text', values)
+                self.assertEqual(values['words'], ['TWO', 'WORDS'])
+
+    def test_run_stages_unknown_executor_raises(self):
+        registry = _build_registry()
+        with self.assertRaises(ValueError):
+            run_stages(registry.resolve(['length'], provided=['text']), {'text': ''}, executor='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from pathlib import Path
+
+import textstat
+
+from text_analyzer import analysis, readability
+from text_analyzer import text_processing as tp
+
+INDEX_NAMES = ['flesch_reading_ease', 'flesch_kincaid_grade', 'gunning_fog', 'smog_index', 'coleman_liau_index', 'dale_chall_readability_score', 'automated_readability_index']
+
+SAMPLE_TEXTS = [
+    "The cat sat on the mat. It was a sunny day! Was it? Everyone enjoyed the extraordinary, unbelievable weather.",
+    "Readability formulas estimate how difficult a passage is. They combine sentence length with word complexity. "
+    "Polysyllabic vocabulary, like 'characterization' or 'institutionalization', raises most grades considerably.",
+    "Short.",
+    "no capital letters here. so textstat sees a single sentence. with  double  spaces  too",
+    "!!! ... ???",
+]
+
+
+class TestReadabilityEngine(unittest.TestCase):
+
+    def test_indices_match_textstat(self):
+        for text in SAMPLE_TEXTS + [tp.preprocess_text_for_sentence_analysis(text) for text in SAMPLE_TEXTS]:
+            indices = readability.readability_indices(readability.count_readability(text))
+            for name in INDEX_NAMES:
+                with self.subTest(text=text[:30], index=name):
+                    self.assertEqual(indices[name], getattr(textstat, name)(text))
+
+    def test_indices_match_public_textstat_on_real_text(self):
+        # Every index the engine reports is checked, so a textstat upgrade that changes any formula fails here
+        text = (Path(__file__).resolve().parents[2] / 'README.md').read_text(encoding='utf-8')
+        indices = readability.readability_indices(readability.count_readability(text))
+        self.assertEqual(sorted(indices), sorted(INDEX_NAMES))
+        for name, value in indices.items():
+            with self.subTest(index=name):
+                self.assertEqual(value, getattr(textstat, name)(text))
+        for word in set(text.split()):
+            with self.subTest(word=word):
+                self.assertEqual(readability.count_syllables(word), textstat.syllable_count(word))
+
+    def test_counts(self):
+        text = "The cat. Everyone enjoyed the unbelievable weather today!"
+        counts = readability.count_readability(text)
+        self.assertEqual(counts.words, 8)
+        self.assertEqual(counts.sentences, 1) # "The cat" has too few words to count as a sentence
+        self.assertEqual(counts.syllables, textstat.syllable_count(text))
+        self.assertEqual(counts.polysyllables, 2)
+        self.assertEqual(readability.legacy_round(2.5), 3.0)
+        self.assertEqual(readability.legacy_round(-0.125, 2), -0.13)
+
+    def test_calculate_readability_stats_uses_engine(self):
+        text = SAMPLE_TEXTS[1]
+        stats = analysis.calculate_readability_stats(text, analysis.Counter(text.lower().split()), {'average_words_per_sentence': 9.0})
+        self.assertIsNone(stats['error'])
+        for name in INDEX_NAMES:
+            self.assertEqual(stats[name], round(getattr(textstat, name)(text), 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from text_analyzer import analysis, incremental, result_cache, stop_words
+from text_analyzer import config as cfg
+
+SAMPLE_TEXT = "Apples are red. Bananas are yellow. Red apples are sweet."
+ANALYSES = ['word_frequencies', 'sentences', 'ngrams']
+
+
+class TestResultKeys(unittest.TestCase):
+
+    def test_keys_are_canonical(self):
+        key = result_cache.result_key(SAMPLE_TEXT, stop_words={'a', 'b'}, top_n=5)
+        self.assertEqual(key, result_cache.result_key(SAMPLE_TEXT, top_n=5, stop_words={'b', 'a'}))
+        self.assertNotEqual(key, result_cache.result_key(SAMPLE_TEXT, stop_words={'a'}, top_n=5))
+        self.assertNotEqual(key, result_cache.result_key(SAMPLE_TEXT + " ", stop_words={'a', 'b'}, top_n=5))
+        self.assertEqual(result_cache.analysis_key(SAMPLE_TEXT, ['word_analysis'], None, 10, None, None, 'document'),
+                         result_cache.analysis_key(SAMPLE_TEXT, ['word_analysis'], set(), 10, [], None, 'document'))
+
+    def test_registry_lists_are_keyed_by_id(self):
+        def key(words):
+            return result_cache.analysis_key(SAMPLE_TEXT, ['word_analysis'], words, 10, None, None, 'document')
+        default = stop_words.get_stop_words('default')[0].words
+        self.assertEqual(key(default), key(stop_words.StopWordSet({'other'}, 'default')))
+        self.assertNotEqual(key(default), key(stop_words.StopWordSet(default, 'nltk:english')))
+        self.assertEqual(key(stop_words.get_stop_words('none')[0].words), key(None))
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru_within_byte_budget(self):
+        cache = result_cache.ResultCache(max_bytes=400)
+        cache.put('a', {'value': 'x' * 100})
+        cache.put('b', {'value': 'y' * 100})
+        cache.get('a')
+        cache.put('c', {'value': 'z' * 150})
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        cache.put('huge', {'value': 'w' * 1000}) # Over the whole budget: not kept
+        self.assertNotIn('huge', cache)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 0, 1))
+        self.assertLessEqual(stats['bytes'], 400)
+
+    def test_lookups_return_copies(self):
+        cache = result_cache.ResultCache()
+        cache.put('k', {'counts': [1, 2]})
+        cache.get('k')['counts'].append(3)
+        self.assertEqual(cache.get('k'), {'counts': [1, 2]})
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_disk_tier_survives_and_evicts(self):
+        with tempfile.TemporaryDirectory() as disk_dir:
+            first = result_cache.ResultCache(disk_dir=disk_dir, disk_max_bytes=10000)
+            first.put('k', {'value': 1})
+            second = result_cache.ResultCache(disk_dir=disk_dir, disk_max_bytes=10000)
+            self.assertEqual(second.get('k'), {'value': 1})
+            self.assertEqual(second.stats()['disk_hits'], 1)
+            self.assertEqual(second.get('k'), {'value': 1})
+            self.assertEqual(second.stats()['hits'], 1)
+
+            (Path(disk_dir) / f"broken{result_cache.DISK_ENTRY_SUFFIX}").write_bytes(b'not a pickle')
+            self.assertIsNone(second.get('broken'))
+
+            small = result_cache.ResultCache(disk_dir=disk_dir, disk_max_bytes=300)
+            for i in range(5):
+                small.put(f"entry{i}", {'value': 'v' * 100})
+            self.assertGreater(small.stats()['disk_evictions'], 0)
+            self.assertLessEqual(sum(path.stat().st_size for path in Path(disk_dir).iterdir()), 300)
+            self.assertIn('entry4', small)
+
+
+class TestCachedAnalysis(unittest.TestCase):
+
+    def test_repeated_analysis_is_served_from_cache(self):
+        cache = result_cache.ResultCache()
+        first = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, cache=cache)
+        with mock.patch.object(analysis.AnalysisContext, 'run') as run:
+            second = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, cache=cache)
+            run.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertEqual(second['original_text'], SAMPLE_TEXT)
+        self.assertEqual(cache.stats()['hits'], 1)
+        # Other arguments are another entry
+        analysis.analyze_text_complete(SAMPLE_TEXT, active_stop_words=cfg.STOP_WORDS, analyses=ANALYSES, cache=cache)
+        self.assertEqual(len(cache), 2)
+        # Diagnostics always run the pipeline
+        self.assertIn('_diagnostics', analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, diagnostics=True, cache=cache))
+
+    def test_batch_and_incremental_use_the_cache(self):
+        cache = result_cache.ResultCache()
+        single = analysis.analyze_text_complete(SAMPLE_TEXT, analyses=ANALYSES, cache=cache)
+        batch = analysis.analyze_texts_batch([SAMPLE_TEXT, "Another text."], analyses=ANALYSES, cache=cache)
+        self.assertEqual(batch[0], single)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(len(cache), 2)
+        incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=ANALYSES, cache=cache)
+        self.assertEqual(len(cache), 3) # Incremental results are kept apart
+        incremental.analyze_text_incremental(SAMPLE_TEXT, analyses=ANALYSES, cache=cache)
+        self.assertEqual(cache.stats()['hits'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
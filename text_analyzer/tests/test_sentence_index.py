@@ -0,0 +1,88 @@
+import re
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from text_analyzer import analysis, sentence_index
+
+SAMPLE_TEXT = (
+    "The cat sat. Don't feed the CAT! Cats are not the cat's owners? "
+    "An e-mail about the cat-flap... Concatenate nothing. The end"
+)
+
+
+def _scan_sentences_for_word(text_content, word):
+    """Reference behaviour: split the text and search every sentence."""
+    sentences = [s.strip() for s in re.split(r'[.!?]+', text_content) if s.strip()]
+    word_regex = re.compile(r'\b' + re.escape(word) + r'\b', re.IGNORECASE)
+    return [sentence + '.' for sentence in sentences if word_regex.search(sentence)]
+
+
+class TestSentenceTable(unittest.TestCase):
+
+    def test_spans_and_word_counts(self):
+        text = "  First one here.  Second -- with dashes!!...\n? Last"
+        table = sentence_index.SentenceTable(text)
+        self.assertEqual(list(table), ["First one here", "Second -- with dashes", "Last"])
+        self.assertEqual([text[start:end] for start, end in zip(table.starts, table.ends)], list(table))
+        self.assertEqual(list(table.word_counts), [3, 3, 1])
+        self.assertEqual(table.total_words, 7)
+
+    def test_sentence_stats_read_from_the_shared_table(self):
+        table = sentence_index.SentenceTable("one two three. four. five six")
+        self.assertEqual(analysis.count_sentences(None, sentence_table=table), 3)
+        self.assertEqual(
+            analysis.analyze_sentences("ignored when a table is given", sentence_table=table),
+            {'sentence_count': 3, 'average_words_per_sentence': 2.0, 'longest_sentence': 'one two three', 'shortest_sentence': 'four'}
+        )
+        self.assertLess(analysis.plan_analysis(['sentences']).index('sentence_table'), analysis.plan_analysis(['sentences']).index('sentences'))
+
+
+class TestSentenceIndex(unittest.TestCase):
+
+    def test_lookups_match_scanning_every_sentence(self):
+        index = sentence_index.SentenceIndex(SAMPLE_TEXT)
+        for word in ("cat", "CAT", "cats", "don't", "e-mail", "cat-flap", "cat's", "concat", "the end", "-", "'s", "missing"):
+            with self.subTest(word=word):
+                self.assertEqual(index.sentences_for_word(word), _scan_sentences_for_word(SAMPLE_TEXT, word))
+
+    def test_positions_are_case_folded_offsets(self):
+        index = sentence_index.SentenceIndex(SAMPLE_TEXT)
+        self.assertEqual(index.positions("Cat"), [(0, 4), (1, 15), (2, 17), (3, 20)])
+        self.assertEqual(index.sentence_ids("cat"), [0, 1, 2, 3])
+
+    def test_get_sentences_for_word_reuses_cached_index(self):
+        self.assertEqual(analysis.get_sentences_for_word(SAMPLE_TEXT, "feed"), ["Don't feed the CAT."])
+        self.assertIs(sentence_index.get_sentence_index(SAMPLE_TEXT), sentence_index.get_sentence_index(SAMPLE_TEXT))
+        self.assertEqual(analysis.get_sentences_for_word("", "feed"), [])
+
+    def test_index_reuses_a_given_sentence_table(self):
+        text = "A table built once. It is indexed as is."
+        table = sentence_index.SentenceTable(text)
+        with mock.patch.object(sentence_index, 'SentenceTable', side_effect=AssertionError("segmented again")):
+            self.assertEqual(analysis.get_sentences_for_word(text, "indexed", sentence_table=table), ["It is indexed as is."])
+        self.assertIs(sentence_index.get_sentence_index(text).table, table)
+        with self.assertRaises(ValueError):
+            sentence_index.get_sentence_index("Another text.", sentence_table=table)
+
+    def test_cache_evicts_least_recently_used(self):
+        first = sentence_index.get_sentence_index("First text.", cache_size=2)
+        sentence_index.get_sentence_index("Second text.", cache_size=2)
+        sentence_index.get_sentence_index("First text.", cache_size=2)
+        sentence_index.get_sentence_index("Third text.", cache_size=2)
+        self.assertIs(sentence_index.get_sentence_index("First text.", cache_size=2), first)
+        self.assertEqual(len(sentence_index._index_cache), 2)
+
+    def test_cache_is_thread_safe(self):
+        texts = [f"Text number {i}. It has words." for i in range(20)]
+        def look_up(i):
+            index = sentence_index.get_sentence_index(texts[i % len(texts)], cache_size=3)
+            sentence_index.cached_sentence_index(sentence_index.text_digest(texts[(i + 1) % len(texts)]))
+            return index.sentence_ids("words")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            self.assertEqual(set(map(tuple, executor.map(look_up, range(2000)))), {(1,)})
+        self.assertLessEqual(len(sentence_index._index_cache), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from text_analyzer import analysis, sharded
+from text_analyzer import config as cfg
+
+SAMPLE_TEXT = "\n\n".join([
+    "I love this wonderful city. The parks are green and quiet!",
+    "Traffic is terrible in the morning. Visit http://example.com for maps.",
+    "The food is great, the food is cheap. Would you stay?",
+    "Short one.",
+]) + "\n"
+ANALYSES = [name for name in cfg.ANALYSIS_SECTIONS if name not in ('pos', 'ner')] # spaCy output is per shard
+
+
+class TestShardedAnalysis(unittest.TestCase):
+
+    def test_split_shards_on_paragraphs(self):
+        shards = sharded.split_shards(SAMPLE_TEXT, 2)
+        self.assertEqual(len(shards), 2)
+        self.assertEqual(''.join(shards), SAMPLE_TEXT)
+        self.assertTrue(shards[0].endswith("maps.\n\n"))
+        self.assertEqual(sharded.split_shards(SAMPLE_TEXT, 10), sharded.split_shards(SAMPLE_TEXT, 4))
+        self.assertEqual(sharded.split_shards("no breaks here", 4), ["no breaks here"])
+
+    def test_results_match_full_analysis(self):
+        user_patterns = [{'name': 'Food', 'regex': r'fo+d'}]
+        full = analysis.analyze_text_complete(SAMPLE_TEXT, active_stop_words=cfg.STOP_WORDS, user_patterns=user_patterns,
+                                              analyses=ANALYSES, sentiment_mode='sentence')
+        for shard_count in (1, 3):
+            with self.subTest(shard_count=shard_count):
+                # A pool of its own (workers keep the config they were started with)
+                results = sharded.analyze_text_sharded(SAMPLE_TEXT, active_stop_words=cfg.STOP_WORDS, user_patterns=user_patterns,
+                                                       analyses=ANALYSES, sentiment_mode='sentence', shard_count=shard_count, max_workers=3)
+                self.assertIsNone(results.get('error'))
+                for section in cfg.ANALYSIS_SECTIONS.values():
+                    self.assertEqual(results[section], full[section], section)
+
+    def test_errors_are_reported(self):
+        self.assertEqual(sharded.analyze_text_sharded(None)['error'], 'No text provided for analysis')
+        self.assertIn('Unknown analysis', sharded.analyze_text_sharded(SAMPLE_TEXT, analyses=['bogus'])['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
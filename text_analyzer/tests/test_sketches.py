@@ -0,0 +1,79 @@
+import random
+import unittest
+from collections import Counter
+
+from text_analyzer.sketches import HyperLogLog, SpaceSavingCounter
+
+
+def _zipf_stream(length, seed=7):
+    rng = random.Random(seed)
+    return [f"w{int(rng.paretovariate(1.2))}" for _ in range(length)]
+
+
+class TestSpaceSavingCounter(unittest.TestCase):
+
+    def _assert_bounds(self, summary, true_counts):
+        for item, estimate in summary.counts.items():
+            self.assertLessEqual(true_counts[item], estimate)
+            self.assertLessEqual(estimate - summary.errors.get(item, 0), true_counts[item])
+        for item, count in true_counts.items():
+            if item not in summary:
+                self.assertLessEqual(count, summary.floor)
+        self.assertLessEqual(summary.error_report()['max_error'], summary.total / summary.capacity)
+
+    def test_exact_while_under_capacity(self):
+        summary = SpaceSavingCounter(10)
+        summary.update("abracadabra")
+        self.assertEqual(summary.counts, Counter("abracadabra"))
+        self.assertTrue(summary.error_report()['exact'])
+
+    def test_bounded_size_and_error_guarantees(self):
+        stream = _zipf_stream(50000)
+        summary = SpaceSavingCounter(50)
+        for start in range(0, len(stream), 1000):
+            summary.update(stream[start:start + 1000])
+        self.assertEqual(len(summary), 50)
+        self.assertEqual(summary.total, len(stream))
+        self._assert_bounds(summary, Counter(stream))
+        self.assertEqual([item for item, _ in summary.most_common(5)], [item for item, _ in Counter(stream).most_common(5)])
+
+    def test_merge_keeps_guarantees(self):
+        stream = _zipf_stream(40000, seed=3)
+        left, right = SpaceSavingCounter(40), SpaceSavingCounter(40)
+        for start in range(0, 20000, 500):
+            left.update(stream[start:start + 500])
+        for start in range(20000, 40000, 500):
+            right.update(stream[start:start + 500])
+        merged = left.merge(right)
+        self.assertEqual(merged.total, len(stream))
+        self._assert_bounds(merged, Counter(stream))
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SpaceSavingCounter(0)
+
+
+class TestHyperLogLog(unittest.TestCase):
+
+    def test_estimates_within_error(self):
+        for true_count in (0, 50, 5000, 200000):
+            with self.subTest(true_count=true_count):
+                sketch = HyperLogLog(precision=12)
+                sketch.update(f"word{i}" for i in range(true_count))
+                sketch.update(f"word{i}" for i in range(true_count // 2)) # Repeats do not count
+                self.assertLessEqual(abs(sketch.estimate() - true_count), max(1, 4 * sketch.relative_error * true_count))
+
+    def test_merge_and_serialization(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update(f"w{i}" for i in range(0, 30000))
+        second.update(f"w{i}" for i in range(20000, 50000))
+        union = HyperLogLog()
+        union.update(f"w{i}" for i in range(50000))
+        restored = HyperLogLog.from_bytes(first.merge(second).to_bytes())
+        self.assertEqual(restored.estimate(), union.estimate())
+        with self.assertRaises(ValueError):
+            restored.merge(HyperLogLog(precision=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import importlib
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from text_analyzer import stop_words
+from text_analyzer import config as cfg
+
+
+def mock_corpus():
+    """A stand-in for nltk.corpus.stopwords (patching the lazy loader itself would load the real corpus)."""
+    corpus = mock.MagicMock()
+    corpus_module = importlib.import_module('nltk.corpus') # The module itself, not nltk's lazy proxy
+    return corpus, mock.patch.dict(corpus_module.__dict__, {'stopwords': corpus})
+
+
+class TestStopWordRegistry(unittest.TestCase):
+
+    def setUp(self):
+        stop_words.clear_registry()
+
+    def tearDown(self):
+        stop_words.clear_registry()
+
+    def test_builtin_lists(self):
+        default, error = stop_words.get_stop_words('default')
+        self.assertEqual(error, "")
+        self.assertEqual(default.words, frozenset(cfg.STOP_WORDS))
+        self.assertIs(stop_words.get_stop_words('default')[0], default)
+        self.assertEqual(default.words.list_id, 'default')
+        self.assertEqual(pickle.loads(pickle.dumps(default.words)).list_id, 'default') # Process pools pickle stop words
+        self.assertEqual(stop_words.get_stop_words('none')[0].words, frozenset())
+        self.assertIsNone(stop_words.get_stop_words('bogus')[0])
+
+    def test_nltk_lists_load_once(self):
+        corpus, patched_corpus = mock_corpus()
+        with patched_corpus:
+            corpus.words.return_value = ['Le', 'la', 'les']
+            french, error = stop_words.get_stop_words('nltk:french')
+            again, _ = stop_words.nltk_stop_words('French')
+        self.assertEqual(error, "")
+        self.assertEqual(french.list_id, 'nltk:french')
+        self.assertEqual(french.words, frozenset({'le', 'la', 'les'}))
+        self.assertIs(again, french)
+        corpus.words.assert_called_once_with('french')
+        self.assertIsNone(stop_words.nltk_stop_words('klingon')[0])
+
+    def test_missing_nltk_data_is_not_cached(self):
+        corpus, patched_corpus = mock_corpus()
+        with patched_corpus:
+            corpus.words.side_effect = LookupError('Resource stopwords not found.')
+            missing, error = stop_words.nltk_stop_words('german')
+            self.assertIsNone(missing)
+            self.assertIn('not found', error)
+            corpus.words.side_effect = None
+            corpus.words.return_value = ['und']
+            self.assertEqual(stop_words.nltk_stop_words('german')[0].words, frozenset({'und'}))
+
+    def test_custom_files_cached_by_mtime(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "stops.txt"
+            path.write_text("Alpha\nbeta\n\n", encoding='utf-8')
+            with mock.patch('text_analyzer.file_io.load_custom_stop_words', wraps=stop_words.file_io.load_custom_stop_words) as load:
+                first, error = stop_words.custom_stop_words(path)
+                self.assertEqual(error, "")
+                self.assertEqual(first.words, frozenset({'alpha', 'beta'}))
+                self.assertIs(stop_words.get_stop_words(first.list_id)[0], first)
+                self.assertEqual(load.call_count, 1)
+
+                path.write_text("gamma\n", encoding='utf-8')
+                stat = path.stat()
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+                changed, _ = stop_words.custom_stop_words(str(path))
+                self.assertEqual(changed.words, frozenset({'gamma'}))
+                self.assertNotEqual(changed.list_id, first.list_id)
+                self.assertEqual(load.call_count, 2)
+            self.assertIsNone(stop_words.custom_stop_words(Path(directory) / "missing.txt")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
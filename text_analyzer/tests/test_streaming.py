@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+
+from text_analyzer import analysis, config as cfg, file_io, streaming
+
+SAMPLE_TEXT = (
+    "The quick brown fox jumps over the lazy dog. The dog sleeps!\n\n"
+    "A second paragraph, with a link http://example.com/page and more words... Does it end?\n"
+    "It does not end here\n\n\n"
+    "Final paragraph: the quick brown fox returns. The end"
+)
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+
+    def test_stream_matches_complete_analysis_for_any_chunk_size(self):
+        user_patterns = [{'name': 'Capitalized', 'regex': r'\b[A-Z]\w+'}]
+        expected = analysis.analyze_text_complete(SAMPLE_TEXT, active_stop_words=cfg.STOP_WORDS, user_patterns=user_patterns, analyses=cfg.STREAMABLE_ANALYSES)
+        for size in (1, 3, 7, 64, len(SAMPLE_TEXT)):
+            with self.subTest(chunk_size=size):
+                streamed = streaming.analyze_text_stream(_chunks(SAMPLE_TEXT, size), active_stop_words=cfg.STOP_WORDS, user_patterns=user_patterns)
+                self.assertIsNone(streamed.get('error'))
+                for section in analysis.resolve_analyses(cfg.STREAMABLE_ANALYSES):
+                    self.assertEqual(streamed[section], expected[section], section)
+
+    def test_split_at_token_boundaries_keeps_tokens_whole(self):
+        pieces = list(streaming.split_at_token_boundaries(_chunks(SAMPLE_TEXT, 5)))
+        self.assertEqual("".join(pieces), SAMPLE_TEXT)
+        for previous, following in zip(pieces, pieces[1:]):
+            self.assertTrue(previous[-1].isspace())
+            self.assertFalse(following[0].isspace())
+
+    def test_merged_partials_match_single_stream(self):
+        cut = SAMPLE_TEXT.index("It does") # A token boundary inside the second paragraph and sentence
+        whole = streaming.StreamingAnalysis()
+        whole.update(SAMPLE_TEXT)
+        first, second = streaming.StreamingAnalysis(), streaming.StreamingAnalysis()
+        first.update(SAMPLE_TEXT[:cut])
+        second.update(SAMPLE_TEXT[cut:])
+        self.assertEqual(first.merge(second).results(), whole.results())
+
+    def test_approximate_counts_report_error_bounds(self):
+        exact = streaming.analyze_text_stream(_chunks(SAMPLE_TEXT, 16), analyses=['word_frequencies', 'ngrams'])
+        large = streaming.analyze_text_stream(_chunks(SAMPLE_TEXT, 16), analyses=['word_frequencies', 'ngrams'], top_k_capacity=1000)
+        self.assertEqual(large['word_analysis']['word_frequencies'], exact['word_analysis']['word_frequencies'])
+        self.assertEqual(large['ngram_frequencies'], exact['ngram_frequencies'])
+        self.assertTrue(large['_approximation']['word_frequencies']['exact'])
+
+        small = streaming.analyze_text_stream(_chunks(SAMPLE_TEXT, 16), analyses=['word_frequencies', 'ngrams'], top_k_capacity=5)
+        word_report = small['_approximation']['word_frequencies']
+        self.assertEqual(word_report['tracked'], 5)
+        self.assertEqual(word_report['total'], exact['word_analysis']['statistics']['total_words'])
+        self.assertEqual(small['word_analysis']['statistics']['total_words'], word_report['total'])
+        self.assertLessEqual(len(small['ngram_frequencies']['bigrams']), 5)
+        self.assertIn('bigrams', small['_approximation']['ngram_frequencies'])
+        exact_counts = exact['word_analysis']['full_word_counts_obj']
+        for word, estimate in small['word_analysis']['word_frequencies'].items():
+            self.assertGreaterEqual(estimate, exact_counts[word])
+            self.assertLessEqual(estimate - exact_counts[word], word_report['max_error'])
+
+    def test_approximate_mode_estimates_unique_words(self):
+        text = " ".join(f"word{i % 3000}" for i in range(12000))
+        exact = streaming.analyze_text_stream(_chunks(text, 1000), analyses=['word_frequencies', 'patterns'])
+        approximate = streaming.analyze_text_stream(_chunks(text, 1000), analyses=['word_frequencies', 'patterns'], top_k_capacity=100)
+        self.assertEqual(exact['word_analysis']['statistics']['unique_words'], 3000)
+        estimate = approximate['word_analysis']['statistics']['unique_words']
+        self.assertAlmostEqual(estimate, 3000, delta=3000 * 0.05)
+        self.assertEqual(approximate['_approximation']['unique_words']['estimate'], estimate)
+        self.assertAlmostEqual(approximate['interesting_patterns']['word_variety'], exact['interesting_patterns']['word_variety'], delta=2.0)
+
+    def test_non_streamable_or_empty_input_returns_error(self):
+        self.assertIn('error', streaming.analyze_text_stream(["Some text."], analyses=['sentiment']))
+        self.assertEqual(streaming.analyze_text_stream([])['error'], 'No text provided for analysis')
+
+    def test_terminator_free_stream_keeps_bounded_open_sentence(self):
+        accumulator = streaming.SentenceAccumulator()
+        for i in range(2000):
+            accumulator.update(f"field{i}, value {i} and some more words")
+        for fragment in (accumulator.head, accumulator.tail):
+            self.assertLessEqual(len(fragment.prefix) + len(fragment.suffix), cfg.STREAMING_OPEN_SENTENCE_MAX_CHARS)
+        result = accumulator.result()
+        self.assertEqual(result['sentence_count'], 1)
+        self.assertEqual(result['average_words_per_sentence'], 2000 * 7)
+        self.assertTrue(result['longest_sentence'].startswith("field0, value 0 and"))
+        self.assertTrue(result['longest_sentence'].endswith("field1999, value 1999 and some more words"))
+
+    def test_read_file_in_chunks_keeps_multibyte_characters_whole(self):
+        text = "café naïve résumé " * 20
+        with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", delete=False, suffix=".txt") as tmp_file:
+            tmp_file.write(text)
+        try:
+            self.assertEqual("".join(file_io.read_file_in_chunks(tmp_file.name, chunk_size_bytes=3)), text)
+        finally:
+            os.remove(tmp_file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
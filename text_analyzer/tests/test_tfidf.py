@@ -0,0 +1,41 @@
+import math
+import unittest
+
+from text_analyzer import analysis
+from text_analyzer.tfidf import TfidfCorpus
+
+
+class TestTfidfCorpus(unittest.TestCase):
+
+    def test_scores_follow_smoothed_idf(self):
+        corpus = TfidfCorpus()
+        corpus.add_documents(["apple banana apple", "banana cherry"])
+        self.assertEqual(corpus.terms, ['apple', 'banana', 'cherry'])
+        self.assertEqual(list(corpus.document_frequency), [1, 2, 1])
+        scores = corpus.document_scores(0)
+        self.assertAlmostEqual(scores['apple'], (2 / 3) * (math.log(3 / 2) + 1))
+        self.assertAlmostEqual(scores['banana'], (1 / 3) * (math.log(3 / 3) + 1))
+
+    def test_adding_documents_updates_idf_incrementally(self):
+        corpus = TfidfCorpus()
+        corpus.add_document("common rare")
+        before = corpus.idf('rare')
+        corpus.add_document("common words everywhere")
+        self.assertLess(corpus.idf('common'), corpus.idf('rare'))
+        self.assertGreater(corpus.idf('rare'), before)
+        self.assertEqual(corpus.idf('unseen'), math.log(3 / 1) + 1)
+
+    def test_top_terms_ranks_distinctive_terms_first(self):
+        corpus = TfidfCorpus(active_stop_words={'the', 'on'})
+        corpus.add_documents(["The cat sat on the mat.", "The dog sat on the log.", "The cat chased the dog."])
+        top = corpus.top_terms(0, k=2)
+        self.assertEqual([term for term, _ in top], ['mat', 'cat'])
+        self.assertGreater(top[0][1], top[1][1])
+
+    def test_calculate_tfidf_scores_corpus(self):
+        results = analysis.calculate_tfidf_scores_corpus(["alpha beta", "beta gamma", ""], top_n=1)
+        self.assertEqual(results, [[('alpha', results[0][0][1])], [('gamma', results[1][0][1])], []])
+
+
+if __name__ == '__main__':
+    unittest.main()
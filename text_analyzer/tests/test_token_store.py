@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from text_analyzer import analysis, file_io
+from text_analyzer import text_processing as tp
+from text_analyzer.token_store import TokenStore, intern_tokens
+
+SAMPLE_TOKENS = "the quick fox and the lazy dog and the quick cat".split()
+SAMPLE_STOP_WORDS = {"the", "and"}
+
+
+class TestTokenStore(unittest.TestCase):
+
+    def test_intern_tokens_numbers_by_first_occurrence(self):
+        token_ids, vocabulary = intern_tokens(["b", "a", "b", "c"])
+        self.assertEqual(token_ids.tolist(), [0, 1, 0, 2])
+        self.assertEqual(vocabulary, ["b", "a", "c"])
+
+    def test_behaves_like_the_token_list(self):
+        store = TokenStore.from_tokens(SAMPLE_TOKENS)
+        self.assertEqual(store, SAMPLE_TOKENS)
+        self.assertEqual(list(store), SAMPLE_TOKENS)
+        self.assertEqual((len(store), store[1], store[-1], store[2:4]), (11, "quick", "cat", ["fox", "and"]))
+        self.assertIn("lazy", store)
+        self.assertEqual(len(store.vocabulary), 7)
+
+    def test_vectorized_operations_match_list_versions(self):
+        store = TokenStore.from_tokens(SAMPLE_TOKENS, SAMPLE_STOP_WORDS)
+        filtered, removed = store.without_stop_words()
+        expected, expected_removed = tp.remove_stop_words(SAMPLE_TOKENS, SAMPLE_STOP_WORDS)
+        self.assertEqual((filtered, removed), (expected, expected_removed))
+        self.assertEqual(list(filtered.word_counts().items()), list(Counter(expected).items()))
+        self.assertEqual(filtered.length_counts(), Counter(len(token) for token in expected))
+        self.assertEqual(analysis.analyze_word_lengths(filtered), analysis.analyze_word_lengths(expected))
+        self.assertEqual(TokenStore.from_tokens([]).length_counts(), Counter())
+
+    def test_analysis_returns_token_store(self):
+        results = analysis.analyze_text_complete("The quick fox and the lazy dog.", SAMPLE_STOP_WORDS, 5, None,
+                                                 analyses=['word_frequencies', 'word_lengths'])
+        self.assertIsInstance(results['processed_tokens'], TokenStore)
+        self.assertEqual(results['processed_tokens'], ["quick", "fox", "lazy", "dog"])
+        self.assertEqual(results['word_analysis']['removed_stop_words_count'], 3)
+
+    def test_json_export_writes_tokens_as_list(self):
+        results = {'processed_tokens': TokenStore.from_tokens(["a", "b"])}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "results.json")
+            file_io._save_results_to_json(results, path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['processed_tokens'], ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Corpus-level TF-IDF for the Text Analyzer application.
+
+`TfidfCorpus` stores a corpus as a sparse term-document matrix: every document is a
+row of (term id, count) pairs in compact arrays, over a vocabulary interned once for
+the whole corpus. Document frequencies are updated as documents are added and IDF
+is derived from them at query time, so adding a document only touches its own terms.
+"""
+
+import math
+import sys
+from array import array
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from . import config as cfg
+from . import text_processing as tp
+
+# =============================================================================
+# SPARSE TF-IDF CORPUS
+# =============================================================================
+
+class TfidfCorpus:
+    """
+    Incremental TF-IDF over a growing document collection.
+
+    Term frequency is the term's share of the document's (processed) tokens; IDF is the
+    smoothed ln((1 + N) / (1 + df)) + 1, so terms present in every document still score > 0.
+    Documents are tokenized like analyze_text_complete (advanced cleaning, optional stop words).
+    """
+
+    def __init__(self, active_stop_words: Optional[Set[str]] = None) -> None:
+        self.active_stop_words: Optional[Set[str]] = active_stop_words
+        self.term_ids: Dict[str, int] = {}       # Interned vocabulary: term -> column id
+        self.terms: List[str] = []               # Column id -> term
+        self.document_frequency: array = array('I') # Column id -> number of documents containing the term
+        self._rows: List[Tuple[array, array]] = [] # Per document: (term ids, counts)
+        self._lengths: List[int] = []            # Per document: number of tokens
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add_document(self, text: str) -> int:
+        """Tokenizes and adds `text`; returns its document index."""
+        tokens: List[str] = tp.tokenize_text(tp.clean_text_for_word_tokenization(text, advanced=True))
+        if self.active_stop_words:
+            tokens, _ = tp.remove_stop_words(tokens, self.active_stop_words)
+        return self.add_tokens(tokens)
+
+    def add_tokens(self, tokens: List[str]) -> int:
+        """Adds an already processed token list as a document; returns its document index."""
+        term_ids: array = array('I')
+        counts: array = array('I')
+        for term, count in Counter(tokens).items():
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = len(self.terms)
+                term = sys.intern(term)
+                self.term_ids[term] = term_id
+                self.terms.append(term)
+                self.document_frequency.append(0)
+            self.document_frequency[term_id] += 1
+            term_ids.append(term_id)
+            counts.append(count)
+        self._rows.append((term_ids, counts))
+        self._lengths.append(len(tokens))
+        return len(self._rows) - 1
+
+    def add_documents(self, texts: Iterable[str]) -> List[int]:
+        return [self.add_document(text) for text in texts]
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency of `term` for the corpus as it is now."""
+        term_id = self.term_ids.get(term)
+        document_frequency: int = self.document_frequency[term_id] if term_id is not None else 0
+        return math.log((1 + len(self._rows)) / (1 + document_frequency)) + 1
+
+    def document_scores(self, doc_index: int) -> Dict[str, float]:
+        """TF-IDF score of every term in document `doc_index`."""
+        term_ids, counts = self._rows[doc_index]
+        length: int = self._lengths[doc_index]
+        corpus_size: int = len(self._rows)
+        return {
+            self.terms[term_id]: (count / length) * (math.log((1 + corpus_size) / (1 + self.document_frequency[term_id])) + 1)
+            for term_id, count in zip(term_ids, counts)
+        }
+
+    def top_terms(self, doc_index: int, k: int = cfg.DEFAULT_TFIDF_TOP_TERMS) -> List[Tuple[str, float]]:
+        """The `k` highest scoring terms of document `doc_index` (only that document's terms are scored)."""
+        return [(term, round(score, 6)) for term, score in nlargest(k, self.document_scores(doc_index).items(), key=itemgetter(1))]
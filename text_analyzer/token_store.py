@@ -0,0 +1,106 @@
+"""
+Compact token storage for the Text Analyzer application.
+
+`TokenStore` keeps a token sequence as an interned vocabulary (each distinct token stored
+once, numbered by first occurrence) plus a NumPy array of 32-bit token IDs, with the
+length and stop-word flag of every vocabulary entry precomputed. Stop-word removal, word
+counts and word-length histograms are then array operations over the IDs, and a million
+tokens take about 4 MB instead of a list of a million str objects.
+
+A TokenStore is a read-only sequence of str: it can be iterated, indexed, sliced (giving a
+list) and compared with a list of tokens, so it stands in for the previous list results.
+"""
+
+from collections import Counter
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+# =============================================================================
+# INTERNING
+# =============================================================================
+
+def intern_tokens(tokens: Iterable[str]) -> Tuple[np.ndarray, List[str]]:
+    """Dense uint32 IDs of `tokens` (numbered by first occurrence) and the vocabulary they index."""
+    vocabulary: dict = {}
+    token_ids = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in tokens), dtype=np.uint32)
+    return token_ids, list(vocabulary)
+
+# =============================================================================
+# TOKEN STORE
+# =============================================================================
+
+class TokenStore(Sequence):
+    """Tokens as vocabulary + ID array, with per-type lengths and a stop-word mask."""
+
+    def __init__(self, vocabulary: List[str], token_ids: np.ndarray, type_lengths: np.ndarray, stop_mask: np.ndarray) -> None:
+        self.vocabulary: List[str] = vocabulary
+        self.token_ids: np.ndarray = token_ids       # uint32 index into vocabulary, one per token
+        self.type_lengths: np.ndarray = type_lengths # Length of each vocabulary entry
+        self.stop_mask: np.ndarray = stop_mask       # Whether each vocabulary entry is a stop word
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str], stop_words: Optional[Set[str]] = None) -> 'TokenStore':
+        token_ids, vocabulary = intern_tokens(tokens)
+        type_lengths = np.fromiter((len(token) for token in vocabulary), dtype=np.uint32, count=len(vocabulary))
+        stop_mask = np.fromiter((token in stop_words for token in vocabulary), dtype=bool, count=len(vocabulary)) if stop_words else np.zeros(len(vocabulary), dtype=bool)
+        return cls(vocabulary, token_ids, type_lengths, stop_mask)
+
+    def _with_ids(self, token_ids: np.ndarray) -> 'TokenStore':
+        """A store of other tokens over the same vocabulary."""
+        return TokenStore(self.vocabulary, token_ids, self.type_lengths, self.stop_mask)
+
+    # Sequence protocol -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self.vocabulary[token_id] for token_id in self.token_ids[index].tolist()]
+        return self.vocabulary[self.token_ids[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        vocabulary = self.vocabulary
+        return (vocabulary[token_id] for token_id in self.token_ids.tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TokenStore):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None # Mutable-sequence semantics, like the lists it replaces
+
+    def __repr__(self) -> str:
+        return f"TokenStore({len(self)} tokens, {len(self.vocabulary)} types)"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in the ID and per-type arrays (the vocabulary strings not included)."""
+        return self.token_ids.nbytes + self.type_lengths.nbytes + self.stop_mask.nbytes
+
+    # Vectorized operations ---------------------------------------------------
+
+    def without_stop_words(self) -> Tuple['TokenStore', int]:
+        """The tokens that are not stop words, and how many were removed (like tp.remove_stop_words)."""
+        keep: np.ndarray = ~self.stop_mask[self.token_ids]
+        kept_ids: np.ndarray = self.token_ids[keep]
+        return self._with_ids(kept_ids), len(self.token_ids) - len(kept_ids)
+
+    def word_counts(self) -> Counter:
+        """Counter of the tokens, in first-occurrence order like Counter(tokens)."""
+        counts: np.ndarray = np.bincount(self.token_ids, minlength=len(self.vocabulary))
+        # IDs are numbered by first occurrence, and filtering keeps every occurrence of a kept type
+        return Counter({self.vocabulary[token_id]: int(counts[token_id]) for token_id in np.flatnonzero(counts).tolist()})
+
+    def length_counts(self) -> Counter:
+        """Counter of token lengths, like Counter(len(token) for token in tokens)."""
+        if not len(self.token_ids):
+            return Counter()
+        token_lengths: np.ndarray = self.type_lengths[self.token_ids]
+        lengths, first_positions, counts = np.unique(token_lengths, return_index=True, return_counts=True)
+        order: np.ndarray = np.argsort(first_positions)
+        return Counter({int(lengths[i]): int(counts[i]) for i in order})
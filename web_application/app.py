@@ -2,11 +2,26 @@ from flask import Flask, render_template, request, jsonify # Added jsonify
 import json 
 import re # Import re module
 from text_analyzer import analysis
+from text_analyzer import incremental
+from text_analyzer import result_cache
+from text_analyzer import stop_words
 from text_analyzer import config as ta_config
+from text_analyzer.display import format_diagnostics_lines
 from collections import Counter
+from typing import AbstractSet, Optional
 
 app = Flask(__name__)
 
+@app.context_processor
+def inject_analysis_names():
+    # Names offered by the "Analyses to run" checkboxes in index.html
+    return {'analysis_names': list(ta_config.ANALYSIS_SECTIONS)}
+
+@app.context_processor
+def inject_stop_word_languages():
+    # NLTK languages offered next to the default list by the "Stop word list" select in index.html
+    return {'stop_word_languages': stop_words.available_languages()}
+
 # Function to format results (adapted from text_analyzer.gui.TextAnalyzerGUI._format_results)
 def _format_web_results(results: dict, top_n: int, removed_stopwords_flag: bool, removed_stopwords_count_from_analysis: int) -> str:
     output = []
@@ -223,6 +238,11 @@ def _format_web_results(results: dict, top_n: int, removed_stopwords_flag: bool,
                     example_str = f" (e.g., {', '.join(display_examples)})"
                 output.append(f"    - {entity_type}: {count} mentions{example_str}")
 
+    diagnostics_data = results.get('_diagnostics')
+    if diagnostics_data:
+        output.append("\n--- Pipeline Stage Diagnostics ---")
+        output.extend(format_diagnostics_lines(diagnostics_data))
+
     return "\n".join(output)
 
 @app.route('/')
@@ -270,10 +290,20 @@ def analyze_route(): # Renamed from 'analyze' to avoid conflict with the module
         return render_template('index.html', results=None, error_message=error_message_str)
 
     remove_stopwords_flag = request.form.get('remove_stopwords') == 'true'
+    selected_analyses = request.form.getlist('analyses') or None # None (nothing ticked) runs every analysis
+    show_diagnostics_flag = request.form.get('show_diagnostics') == 'true'
+    trace_memory_flag = request.form.get('trace_memory') == 'true'
     
-    active_stop_words_set: Optional[Set[str]] = None
+    active_stop_words_set: Optional[AbstractSet[str]] = None
     if remove_stopwords_flag:
-        active_stop_words_set = ta_config.STOP_WORDS
+        # Registry lists are loaded once per process, not per request; custom files are not offered here
+        stop_word_list_id = request.form.get('stop_word_list') or stop_words.DEFAULT_ID
+        if stop_word_list_id.startswith(stop_words.CUSTOM_PREFIX):
+            return render_template('index.html', results=None, error_message="Custom stop word files are not available in the web app.")
+        stop_word_list, stop_word_error = stop_words.get_stop_words(stop_word_list_id)
+        if stop_word_list is None:
+            return render_template('index.html', results=None, error_message=stop_word_error)
+        active_stop_words_set = stop_word_list.words
 
     # Process user-defined patterns
     user_defined_patterns = []
@@ -292,21 +322,41 @@ def analyze_route(): # Renamed from 'analyze' to avoid conflict with the module
                 'index.html',
                 results=None,
                 error_message=error_message_str,
-                original_text_content=text_content, # text_content from earlier in the route
                 word_freq_labels=json.dumps([]),    # Default empty data for charts
                 word_freq_data=json.dumps([]),
                 sentiment_chart_labels=json.dumps([]),
                 sentiment_chart_data=json.dumps([]),
+                sentiment_timeline_labels=json.dumps([]),
+                sentiment_timeline_data=json.dumps([]),
                 word_len_labels=json.dumps([]),
                 word_len_data=json.dumps([])
             )
 
-    analysis_results_dict = analysis.analyze_text_complete(
-        text=text_content,
-        active_stop_words=active_stop_words_set,
-        num_common_words_to_display=top_n,
-        user_patterns=user_defined_patterns
-    )
+    if show_diagnostics_flag or trace_memory_flag:
+        analysis_results_dict = analysis.analyze_text_complete(
+            text=text_content,
+            active_stop_words=active_stop_words_set,
+            num_common_words_to_display=top_n,
+            user_patterns=user_defined_patterns,
+            analyses=selected_analyses,
+            diagnostics=show_diagnostics_flag,
+            trace_memory=trace_memory_flag,
+            sentiment_mode='sentence', # Sentence-level scores feed the sentiment timeline chart
+            compact=True, # The page needs neither the token list nor the full word counts (not kept after the run)
+            cache=result_cache.get_default_cache() # Not used for the timed run itself, but keeps the text for /get_sentences
+        )
+    else:
+        # Re-submitting an edited text only re-analyzes the paragraphs that changed
+        analysis_results_dict = incremental.analyze_text_incremental(
+            text=text_content,
+            active_stop_words=active_stop_words_set,
+            num_common_words_to_display=top_n,
+            user_patterns=user_defined_patterns,
+            analyses=selected_analyses,
+            sentiment_mode='sentence',
+            cache=result_cache.get_default_cache(), # Resubmitting an unchanged text is a lookup
+            compact=True
+        )
 
     if analysis_results_dict.get('error'):
         # Pass the error from analysis to the template
@@ -334,6 +384,11 @@ def analyze_route(): # Renamed from 'analyze' to avoid conflict with the module
     sentiment_labels = ['Positive', 'Neutral', 'Negative']
     sentiment_data = [sentiment_scores.get('pos', 0.0), sentiment_scores.get('neu', 0.0), sentiment_scores.get('neg', 0.0)]
 
+    # Extract sentiment timeline (compound score by position in the text) for line chart
+    sentiment_timeline = sentiment_scores.get('timeline', {})
+    timeline_labels = [f"{position:g}%" for position in sentiment_timeline.get('positions', [])]
+    timeline_data = sentiment_timeline.get('compound', [])
+
     # Extract word length distribution for bar chart
     word_length_counts = analysis_results_dict.get('word_length_counts_obj', Counter())
     if word_length_counts:
@@ -352,9 +407,11 @@ def analyze_route(): # Renamed from 'analyze' to avoid conflict with the module
         word_freq_data=json.dumps(data),
         sentiment_chart_labels=json.dumps(sentiment_labels),
         sentiment_chart_data=json.dumps(sentiment_data),
+        sentiment_timeline_labels=json.dumps(timeline_labels),
+        sentiment_timeline_data=json.dumps(timeline_data),
         word_len_labels=json.dumps(word_length_labels),
         word_len_data=json.dumps(word_length_data),
-        original_text_content=text_content # Pass original text
+        text_key=analysis_results_dict.text_key # Identifies the analyzed text (kept in the result cache) for /get_sentences
     )
 
 @app.route('/get_sentences', methods=['POST'])
@@ -363,13 +420,15 @@ def get_sentences_route():
     if not data:
         return jsonify({'error': 'Invalid JSON payload'}), 400
 
-    text_content = data.get('text_content')
+    text_key = data.get('text_key')
     word = data.get('word')
 
-    if not text_content or not word:
-        return jsonify({'error': 'Missing text_content or word'}), 400
+    if not text_key or not word:
+        return jsonify({'error': 'Missing text_key or word'}), 400
 
-    found_sentences = analysis.get_sentences_for_word(text_content, word)
+    found_sentences = analysis.get_sentences_for_text_key(text_key, word, cache=result_cache.get_default_cache())
+    if found_sentences is None:
+        return jsonify({'error': 'The analyzed text is no longer available. Please re-analyze it.'}), 404
     return jsonify({'sentences': found_sentences})
 
 if __name__ == '__main__':
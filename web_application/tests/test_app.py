@@ -1,5 +1,6 @@
 import unittest
 import io
+import re
 import sys
 import os
 
@@ -9,6 +10,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 from web_application.app import app # Import the Flask app instance
 from text_analyzer import config as ta_config # For default values
+from text_analyzer import sentence_index
 
 class WebAppTests(unittest.TestCase):
 
@@ -117,6 +119,58 @@ class WebAppTests(unittest.TestCase):
         # Further check could be to see if 'Top X' in results matches default_top_words_display
         # e.g. self.assertIn(f"--- Word Frequencies (Top {ta_config.DEFAULT_TOP_WORDS_DISPLAY}) ---".encode(), response.data)
 
+    def test_analyze_route_selected_analyses(self):
+        payload = {
+            'text_input': 'Apples and pears. Apples again.',
+            'analyses': ['word_frequencies', 'general_stats']
+        }
+        response = self.client.post('/analyze', data=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(b'class="error_message"', response.data)
+        self.assertIn(b'apples: 2', response.data)
+        self.assertIn(b'name="analyses" value="readability"', self.client.get('/').data)
+
+    def test_analyze_route_show_diagnostics(self):
+        payload = {
+            'text_input': 'Timing this short text. It is quick.',
+            'analyses': ['word_frequencies'],
+            'show_diagnostics': 'true'
+        }
+        response = self.client.post('/analyze', data=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"--- Pipeline Stage Diagnostics ---", response.data)
+        self.assertIn(b"Total pipeline time:", response.data)
+
+    def test_analyze_route_sentiment_timeline(self):
+        payload = {
+            'text_input': 'I love this. The middle is dull. The ending is terrible!',
+            'analyses': ['sentiment']
+        }
+        response = self.client.post('/analyze', data=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'id="sentimentTimelineChart"', response.data)
+        self.assertIn(b'const sentimentTimelineLabels = ["16.7%", "50%", "83.3%"]', response.data)
+
+    def test_sentence_lookup_by_text_key(self):
+        text = 'Apples are red. Bananas are yellow. Red apples are sweet.'
+        sentence_index._index_cache.clear()
+        response = self.client.post('/analyze', data={'text_input': text, 'analyses': ['word_frequencies']})
+        self.assertEqual(response.status_code, 200)
+        text_key = re.search(rb'let textKeyForSentenceSearch = "([0-9a-f]+)"', response.data).group(1).decode()
+        self.assertNotIn(b'Bananas are yellow.', response.data) # Only the key is sent to the page
+        self.assertIsNone(sentence_index.cached_sentence_index(bytes.fromhex(text_key))) # Indexed on the first lookup only
+
+        lookup = self.client.post('/get_sentences', json={'text_key': text_key, 'word': 'apples'})
+        self.assertEqual(lookup.get_json(), {'sentences': ['Apples are red.', 'Red apples are sweet.']})
+        self.assertEqual(self.client.post('/get_sentences', json={'text_content': text, 'word': 'apples'}).status_code, 400)
+
+        sentence_index._index_cache.clear() # e.g. evicted, or the request reached another worker
+        lookup = self.client.post('/get_sentences', json={'text_key': text_key, 'word': 'bananas'})
+        self.assertEqual(lookup.get_json(), {'sentences': ['Bananas are yellow.']}) # Indexed again from the result cache
+
+        missing = self.client.post('/get_sentences', json={'text_key': '00' * 16, 'word': 'apples'})
+        self.assertEqual(missing.status_code, 404)
+        self.assertIn('re-analyze', missing.get_json()['error'])
 
 if __name__ == '__main__':
     unittest.main()